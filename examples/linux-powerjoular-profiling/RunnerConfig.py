@@ -5,18 +5,23 @@ from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.Models.OperationType import OperationType
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from Plugins.Profilers import PowerJoular
+from Plugins.Profilers.PowerJoular import DataColumns as PJDataCols
+from ExperimentOrchestrator.Experiment.Run.Readiness import ProcessProbe
 
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from os.path import dirname, realpath
 
-import os
-import signal
-import pandas as pd
 import time
 import subprocess
 import shlex
 
+@PowerJoular.powerjoular(
+    target='target',
+    extra_args=['-l'],
+    data_columns=[PJDataCols.AVG_CPU_UTILIZATION, PJDataCols.ENERGY]
+)
 class RunnerConfig:
     ROOT_DIR = Path(dirname(realpath(__file__)))
 
@@ -60,8 +65,7 @@ class RunnerConfig:
         representing each run performed"""
         cpu_limit_factor = FactorModel("cpu_limit", [25, 50, 100])
         self.run_table_model = RunTableModel(
-            factors = [cpu_limit_factor],
-            data_columns=['avg_cpu', 'total_energy']
+            factors = [cpu_limit_factor]
         )
         return self.run_table_model
 
@@ -89,15 +93,16 @@ class RunnerConfig:
 
         # Configure the environment based on the current variation
         subprocess.check_call(shlex.split(f'cpulimit -b -p {self.target.pid} --limit {cpu_limit}'))
-        
 
-    def start_measurement(self, context: RunnerContext) -> None:
-        """Perform any activity required for starting measurements."""
+        # allow the process to run a little before measuring
+        context.readiness.wait('target', ProcessProbe(pid=self.target.pid, min_cpu_time_in_s=0.1),
+                               interval_in_s=0.05, max_interval_in_s=0.5, deadline_in_s=10)
 
-        profiler_cmd = f'powerjoular -l -p {self.target.pid} -f {context.run_dir / "powerjoular.csv"}'
 
-        time.sleep(1) # allow the process to run a little before measuring
-        self.profiler = subprocess.Popen(shlex.split(profiler_cmd))
+    def start_measurement(self, context: RunnerContext) -> None:
+        """Perform any activity required for starting measurements.
+        PowerJoular is started by the plugin, for the process self.target."""
+        pass
 
     def interact(self, context: RunnerContext) -> None:
         """Perform any interaction with the running target system here, or block here until the target finishes."""
@@ -108,10 +113,9 @@ class RunnerConfig:
         time.sleep(20)
 
     def stop_measurement(self, context: RunnerContext) -> None:
-        """Perform any activity here required for stopping measurements."""
-
-        os.kill(self.profiler.pid, signal.SIGINT) # graceful shutdown of powerjoular
-        self.profiler.wait()
+        """Perform any activity here required for stopping measurements.
+        PowerJoular is stopped by the plugin, and only its samples within the measurement are counted."""
+        pass
 
     def stop_run(self, context: RunnerContext) -> None:
         """Perform any activity here required for stopping the run.
@@ -125,14 +129,9 @@ class RunnerConfig:
         You can also store the raw measurement data under `context.run_dir`
         Returns a dictionary with keys `self.run_table_model.data_columns` and their values populated"""
 
-        # powerjoular.csv - Power consumption of the whole system
-        # powerjoular.csv-PID.csv - Power consumption of that specific process
-        df = pd.read_csv(context.run_dir / f"powerjoular.csv-{self.target.pid}.csv")
-        run_data = {
-            'avg_cpu': round(df['CPU Utilization'].sum(), 3),
-            'total_energy': round(df['CPU Power'].sum(), 3),
-        }
-        return run_data
+        # The powerjoular__avg_cpu_utilization and powerjoular__energy columns are populated by the plugin, from the
+        # samples it read from powerjoular.csv-PID.csv (the power consumption of the target process) during the run
+        return None
 
     def after_experiment(self) -> None:
         """Perform any activity required after stopping the experiment here
@@ -5,17 +5,32 @@ from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.Models.OperationType import OperationType
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from Plugins.Profilers import SubprocessProfiler
+from ExperimentOrchestrator.Experiment.Run.Readiness import ProcessProbe
 
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 from os.path import dirname, realpath
 
-import pandas as pd
+import numpy as np
+import os
 import time
 import subprocess
 import shlex
 
 
+# man 1 ps
+# %cpu:
+#   cpu utilization of the process in "##.#" format.  Currently, it is the CPU time used
+#   divided by the time the process has been running (cputime/realtime ratio), expressed
+#   as a percentage.  It will not add up to 100% unless you are lucky.  (alias pcpu).
+@SubprocessProfiler.subprocess_profiler(
+    name='ps',
+    command=lambda self, context: f'while true; do ps -p {self.target.pid} --noheader -o %cpu; sleep 1; done',
+    parser=lambda line: (float(line),),
+    columns=[('cpu_usage', '<f4')],
+    aggregate=lambda samples: {'avg_cpu': round(float(np.mean(samples['cpu_usage'])), 3)}
+)
 class RunnerConfig:
     ROOT_DIR = Path(dirname(realpath(__file__)))
 
@@ -35,6 +50,10 @@ class RunnerConfig:
     This can be essential to accommodate for cooldown periods on some systems."""
     time_between_runs_in_ms:    int             = 1000
 
+    """The target is pinned to cpu 0 (when `pin_core`), Experiment Runner and the ps profiler run on the other cpus.
+    On a single cpu, there is nothing to place."""
+    measured_cpus:              Optional[List[int]] = [0] if len(os.sched_getaffinity(0)) > 1 else None
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
@@ -92,28 +111,23 @@ class RunnerConfig:
         )
 
         # Configure the environment based on the current variation
-        if pin_core:
-            subprocess.check_call(shlex.split(f'taskset -cp 0  {self.target.pid}'))
+        if context.cpu_placement is None:
+            pass  # a single cpu
+        elif pin_core:
+            context.cpu_placement.pin_target(self.target.pid)
+        else:
+            # Otherwise it would inherit the affinity of Experiment Runner, i.e. all but the measured cpu
+            context.cpu_placement.unpin_target(self.target.pid)
         subprocess.check_call(shlex.split(f'cpulimit -b -p {self.target.pid} --limit {cpu_limit}'))
-        
+
+        # allow the process to run a little before measuring
+        context.readiness.wait('target', ProcessProbe(pid=self.target.pid, min_cpu_time_in_s=0.1),
+                               interval_in_s=0.05, max_interval_in_s=0.5, deadline_in_s=10)
 
     def start_measurement(self, context: RunnerContext) -> None:
-        """Perform any activity required for starting measurements."""
-
-        # man 1 ps
-        # %cpu:
-        #   cpu utilization of the process in "##.#" format.  Currently, it is the CPU time used
-        #   divided by the time the process has been running (cputime/realtime ratio), expressed
-        #   as a percentage.  It will not add up to 100% unless you are lucky.  (alias pcpu).
-        profiler_cmd = f'ps -p {self.target.pid} --noheader -o %cpu'
-        wrapper_script = f'''
-        while true; do {profiler_cmd}; sleep 1; done
-        '''
-
-        time.sleep(1) # allow the process to run a little before measuring
-        self.profiler = subprocess.Popen(['sh', '-c', wrapper_script],
-            stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
+        """Perform any activity required for starting measurements.
+        The ps profiler is started by the plugin."""
+        pass
 
     def interact(self, context: RunnerContext) -> None:
         """Perform any interaction with the running target system here, or block here until the target finishes."""
@@ -124,10 +138,9 @@ class RunnerConfig:
         time.sleep(20)
 
     def stop_measurement(self, context: RunnerContext) -> None:
-        """Perform any activity here required for stopping measurements."""
-
-        self.profiler.kill()
-        self.profiler.wait()
+        """Perform any activity here required for stopping measurements.
+        The ps profiler is stopped by the plugin."""
+        pass
 
     def stop_run(self, context: RunnerContext) -> None:
         """Perform any activity here required for stopping the run.
@@ -141,17 +154,8 @@ class RunnerConfig:
         You can also store the raw measurement data under `context.run_dir`
         Returns a dictionary with keys `self.run_table_model.data_columns` and their values populated"""
 
-        df = pd.DataFrame(columns=['cpu_usage'])
-        for i, l in enumerate(self.profiler.stdout.readlines()):
-            cpu_usage=float(l.decode('ascii').strip())
-            df.loc[i] = [cpu_usage]
-        
-        df.to_csv(context.run_dir / 'raw_data.csv', index=False)
-
-        run_data = {
-            'avg_cpu': round(df['cpu_usage'].mean(), 3)
-        }
-        return run_data
+        # avg_cpu is populated by the plugin, from the samples of ps stored in ps_samples.bin
+        return None
 
     def after_experiment(self) -> None:
         """Perform any activity required after stopping the experiment here
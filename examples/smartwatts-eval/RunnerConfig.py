@@ -11,7 +11,8 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 from os.path import dirname, realpath
 
-from ConnectionHandler import ConnectionHandler
+from ConnectionHandler import ConnectionHandler, ConcurrentResults
+from ExperimentOrchestrator.Experiment.Run.Readiness import OutputProbe, Readiness, ReadinessTimeoutError
 import datetime
 import paramiko
 import enum
@@ -45,6 +46,10 @@ class RunnerConfig:
 
     host_name = "GL6" 
 
+    """SmartWatts runs on GL6: its clock offset is estimated at the start and end of each run, such that its samples
+    can be aligned with the local WattsUp samples (`context.timeline.add_stream(..., host="GL6")`)."""
+    remote_clock_hosts:         List[str]       = ["GL6"]
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
@@ -62,6 +67,7 @@ class RunnerConfig:
             (RunnerEvents.AFTER_EXPERIMENT , self.after_experiment )
         ])
         self.run_table_model = None  # Initialized later
+        self.profiler_run_data = dict()
 
         output.console_log("Custom config loaded")
 
@@ -75,7 +81,8 @@ class RunnerConfig:
                 FactorModel("run_number", runs_list),
                 FactorModel("workload", ['HIGH', 'MEDIUM', 'LOW']),
             ],
-            data_columns=[]
+            data_columns=ConcurrentResults.data_columns('profilers_start') + ConcurrentResults.data_columns('profilers_stop')
+                         + Readiness.data_columns(['tts'])
         )
         
         return self.run_table_model
@@ -113,22 +120,18 @@ class RunnerConfig:
             self.interrupt_run(context, "Encountered an error while starting system")
 
         output.console_log("Waiting for the benchmark system to start up...")
-        
-        output.console_log("Sleep for 3 minutes...")
-        time.sleep(3 * 60) 
 
-        containers_count = conn_handler.get_containers_count()
-        if containers_count < 68:
-            output.console_log("Sleep for 3 more minutes...")
-            time.sleep(3*60)
+        # Ready once all 68 containers run (the output of `docker ps` has a header line)
+        containers_probe = OutputProbe(f"echo {password} | sudo -S docker ps | wc -l", 68, host_name=self.host_name)
+        try:
+            context.readiness.wait('tts', containers_probe, interval_in_s=5, max_interval_in_s=30, deadline_in_s=6 * 60)
+        except ReadinessTimeoutError:
             containers_count = conn_handler.get_containers_count()
-
-        if containers_count < 68:
             error_msg = f"Not enough containers running: {containers_count}/68"
             with open('logfile.log', 'a') as file:
                 # Write the error message to the file
                 file.write(f"[{context.run_variation['run_number']}] [{context.run_variation['workload']}] FAILED at {datetime.datetime.now()}\n")
-                conn_handler.execute_remote_command(f"echo {password} | sudo reboot")
+                conn_handler.execute_remote_command(f"echo {password} | sudo reboot", "Reboot")
                 time.sleep(6*60)
             self.interrupt_run(context, error_msg)
 
@@ -140,26 +143,24 @@ class RunnerConfig:
     """
     This method starts the logging of both SmartWatts and WattsupPro profilers' measurements.
     SmartWatts is running on GL6 and WattsupPro on both GL2 and GL3's ports.
+    All three are started concurrently, and their skew is recorded in the run table.
     """
     def start_measurement(self, context: RunnerContext) -> None:
         output.console_log("Config.start_measurement() called!")
         run_number = context.run_variation['run_number']
         file_name = f"{run_number}-{context.run_variation['workload']}"
-        conn_handler = ConnectionHandler(self.host_name)
 
-        _, _, password = conn_handler.get_credentials()
-
-        output.console_log("Start Wattsup logging through GL2.. ")
-
-        os.system(f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/start_wattsup.sh GL2 {file_name} {run_number}")
-        
-        output.console_log("Start Wattsup logging through GL3.. ")
-        os.system(f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/start_wattsup.sh GL3 {file_name} {run_number}")
+        _, _, password = ConnectionHandler(self.host_name).get_credentials()
 
-        # start SmartWatts profiler on GL6
-        smartwatts_command = f"~/smartwatts-evaluation/smartwatts/start_smartwatts.sh {file_name} {run_number}"
-        if(conn_handler.execute_remote_command(smartwatts_command, "Start SmartWatts") == 0):
-            self.interrupt_run(context, "Encountered an error while starting system")
+        output.console_log("Start Wattsup logging through GL2 and GL3, and SmartWatts on GL6.. ")
+        results = ConnectionHandler.run_concurrently([
+            (ConnectionHandler.LOCAL_HOST, f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/start_wattsup.sh GL2 {file_name} {run_number}"),
+            (ConnectionHandler.LOCAL_HOST, f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/start_wattsup.sh GL3 {file_name} {run_number}"),
+            (self.host_name, f"~/smartwatts-evaluation/smartwatts/start_smartwatts.sh {file_name} {run_number}"),
+        ])
+        self.profiler_run_data.update(results.get_run_data('profilers_start'))
+        if not results.ok:
+            self.interrupt_run(context, "Encountered an error while starting the profilers")
 
 
 
@@ -178,20 +179,19 @@ class RunnerConfig:
     def stop_measurement(self, context: RunnerContext) -> None:
         """Perform any activity here required for stopping measurements."""
         output.console_log("Config.stop_measurement called!")
-        conn_handler = ConnectionHandler(self.host_name)
-        _, _, password = conn_handler.get_credentials()
-
-        # stop WattsUp profiler on GL2
-        output.console_log("Stop Wattsup logging through GL2.. ")
-        os.system(f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/stop_wattsup.sh GL2")
-        # stop WattsUp profiler on GL3
-        output.console_log("Stop Wattsup logging through GL3.. ")
-        os.system(f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/stop_wattsup.sh GL3")
-
+        _, _, password = ConnectionHandler(self.host_name).get_credentials()
         file_name = f"{context.run_variation['run_number']}-{context.run_variation['workload']}"
 
-        stop_smartwatts = f"~/smartwatts-evaluation/smartwatts/stop_smartwatts.sh {file_name} {context.run_variation['run_number']}"
-        conn_handler.execute_remote_command(stop_smartwatts , "Stop Smartwatts ")
+        # stop the WattsUp profilers on GL2 and GL3, and SmartWatts on GL6 at the same time
+        output.console_log("Stop Wattsup logging through GL2 and GL3, and SmartWatts on GL6.. ")
+        results = ConnectionHandler.run_concurrently([
+            (ConnectionHandler.LOCAL_HOST, f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/stop_wattsup.sh GL2"),
+            (ConnectionHandler.LOCAL_HOST, f"echo {password} | sudo -S /home/gabbie/smartwatts-evaluation/wattsup/stop_wattsup.sh GL3"),
+            (self.host_name, f"~/smartwatts-evaluation/smartwatts/stop_smartwatts.sh {file_name} {context.run_variation['run_number']}"),
+        ])
+        self.profiler_run_data.update(results.get_run_data('profilers_stop'))
+        for result in results.failed:
+            output.console_log_FAIL(f"Could not stop a profiler on {result.host_name}: {result.error or result.stderr}")
 
 
     def stop_run(self, context: RunnerContext) -> None:
@@ -225,7 +225,7 @@ class RunnerConfig:
         Returns a dictionary with keys `self.run_table_model.data_columns` and their values populated"""
         
         output.console_log("Config.populate_run_data() called!")
-        return None
+        return self.profiler_run_data
 
     def after_experiment(self) -> None:
         """Perform any activity required after stopping the experiment here
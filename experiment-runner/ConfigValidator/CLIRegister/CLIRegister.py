@@ -1,11 +1,17 @@
 import os
 import uuid
 import inspect
+import dill
 from typing import List
 from shutil import copyfile
 from tabulate import tabulate
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
+from ConfigValidator.CustomErrors.ConfigErrors import ConfigInvalidClassNameError
+from ExperimentOrchestrator.Experiment.ReprocessController import ReprocessController
+from ExperimentOrchestrator.Misc.ConfigLoading import load_config_file_as_module, calc_ast_md5sum
 from ExperimentOrchestrator.Misc.BashHeaders import BashHeaders
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
@@ -77,6 +83,50 @@ class Prepare:
     def execute(args=None) -> None:
         pass
 
+class Reprocess:
+    @staticmethod
+    def description_params() -> str:
+        return "<path_to_config.py> [number_of_processes] [--update-md5sum]"
+
+    @staticmethod
+    def description_short() -> str:
+        return "Recomputes the data columns of all completed runs from their stored raw data"
+
+    @staticmethod
+    def description_long() -> str:
+        output.console_log_bold("Reprocess loads the config and invokes only its populate_run_data hook for every DONE run, " +
+                                "in parallel over a process pool (default: one process per CPU).\n" +
+                                "The hook should read the raw data stored in `context.run_dir`, any state kept in the config " +
+                                "during the original run (e.g. `self.target`) is not available.\n" +
+                                "The data columns of the run table are rewritten at once when all runs are reprocessed.\n" +
+                                "If the config changed since the runs were performed, the stored md5sum is kept, unless " +
+                                "--update-md5sum is given.")
+
+    @staticmethod
+    def execute(args=None) -> None:
+        update_md5sum = args is not None and '--update-md5sum' in args
+        if update_md5sum:
+            args = [arg for arg in args if arg != '--update-md5sum']
+        if args is None or len(args) not in [3, 4] or args[2][-3:] != '.py':
+            raise CommandNotRecognisedError
+
+        processes = None
+        if len(args) == 4:
+            try:
+                processes = int(args[3])
+            except ValueError:
+                raise CommandNotRecognisedError
+
+        config_file = load_config_file_as_module(args[2])
+        if not hasattr(config_file, 'RunnerConfig'):
+            raise ConfigInvalidClassNameError
+
+        config = config_file.RunnerConfig()
+        metadata = Metadata(calc_ast_md5sum(dill.source.getsource(config_file), args[2]))
+
+        ConfigValidator.validate_config(config)
+        ReprocessController(config, metadata, processes, update_md5sum).do_reprocess()
+
 class Help:
     @staticmethod
     def description_params() -> str:
@@ -106,6 +156,7 @@ class CLIRegister:
     register = {
         "config-create":    ConfigCreate,
         "prepare":          Prepare,
+        "reprocess":        Reprocess,
         "help":             Help
     }
 
@@ -0,0 +1,43 @@
+from typing import Dict, List
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class BaselineModel:
+    RUN_ID_PREFIX = 'baseline_'
+    CORRECTED_SUFFIX = '__baseline_corrected'
+
+    def __init__(self, data_columns: List[str], every: int = 10, window: int = 3):
+        """Interleaves baseline ("null") runs into the experiment: a baseline run before the first run, and after every
+        `every` runs. Baseline runs invoke the same hooks, which should skip the target workload (see
+        `RunnerContext.is_baseline`), such that they measure the idle system and the profilers' own cost.
+        For each of the `data_columns` (which may be added by plugins), a `<column>__baseline_corrected` data column
+        is added, i.e. the measured value minus the mean of the `window` most recent baseline runs."""
+        if not data_columns:
+            raise BaseError("The data columns to correct for the baseline must be specified!")
+        if every < 1 or window < 1:
+            raise BaseError(f"Invalid baseline: every ({every}) and window ({window}) must be at least 1!")
+
+        self.__data_columns = data_columns
+        self.__every = every
+        self.__window = window
+
+    @property
+    def data_columns(self) -> List[str]:
+        return self.__data_columns
+
+    @property
+    def corrected_data_columns(self) -> List[str]:
+        return [f'{data_column}{BaselineModel.CORRECTED_SUFFIX}' for data_column in self.__data_columns]
+
+    @property
+    def every(self) -> int:
+        return self.__every
+
+    @property
+    def window(self) -> int:
+        return self.__window
+
+    @staticmethod
+    def is_baseline_run(variation: Dict) -> bool:
+        return str(variation.get('__run_id', '')).startswith(BaselineModel.RUN_ID_PREFIX)
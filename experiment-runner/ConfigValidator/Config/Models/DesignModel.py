@@ -0,0 +1,213 @@
+import math
+import random
+import itertools
+from abc import ABC, abstractmethod
+from functools import reduce
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+
+
+class DesignModel(ABC):
+    """Selects the combinations of treatment levels (a subset of the full factorial) that make up the run table."""
+
+    @abstractmethod
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        pass
+
+    def describe(self) -> Dict:
+        """A description of the chosen design and its properties, recorded in the experiment's metadata."""
+        return {'design': self.__class__.__name__}
+
+
+class FullFactorialDesign(DesignModel):
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        return list(itertools.product(*[factor.treatments for factor in factors]))
+
+
+def _assert_two_level_factors(design: str, factors: List[FactorModel]):
+    for factor in factors:
+        if len(factor.treatments) != 2:
+            raise BaseError(f"{design} requires two-level factors, but factor {factor.factor_name} "
+                            f"has {len(factor.treatments)} treatment levels!")
+
+
+def _hadamard_columns(runs: int, columns: int) -> List[List[int]]:
+    """The two-level (+1/-1) columns of a Plackett-Burman design with `runs` runs, which is an orthogonal array of
+    strength 2. Powers of two use the Sylvester construction, the others the cyclic generators of Plackett & Burman (1946)."""
+    cyclic_generators = {
+        12: '++-+++---+-',
+        20: '++--++++-+-+----++-',
+        24: '+++++-+-++--++--+-+----',
+    }
+
+    if runs in cyclic_generators:
+        generator = [1 if c == '+' else -1 for c in cyclic_generators[runs]]
+        rows = [generator[-shift:] + generator[:-shift] for shift in range(runs - 1)]
+        rows.append([-1] * (runs - 1))
+    else:
+        hadamard = [[1]]
+        while len(hadamard) < runs:
+            hadamard = [row + row for row in hadamard] + [row + [-x for x in row] for row in hadamard]
+        rows = [row[1:] for row in hadamard]  # the first column is constant
+
+    return [[row[col] for row in rows] for col in range(columns)]
+
+
+class FractionalFactorialDesign(DesignModel):
+    def __init__(self, generators: Dict[str, List[str]]):
+        """A regular 2^(k-p) fractional factorial design for two-level factors.
+        Each of the p `generators` maps a generated factor (by name) to the base factors whose interaction it is aliased with,
+        e.g. `{'f5': ['f1', 'f2', 'f3', 'f4']}` for the generator f5 = f1*f2*f3*f4 (a resolution V 2^(5-1) design).
+        The first treatment level of a factor is coded as -1, the second as +1."""
+        if not generators:
+            raise BaseError(f"{self.__class__.__name__} requires at least one generator (without any, use the "
+                            f"FullFactorialDesign)!")
+        self.__generators = generators
+        self.__defining_relation: List[FrozenSet[str]] = []
+        self.__aliases: Dict[str, List[str]] = dict()
+
+    @property
+    def resolution(self) -> Optional[int]:
+        """The length of the shortest word of the defining relation, None before the design is generated."""
+        return min((len(word) for word in self.__defining_relation), default=None)
+
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        _assert_two_level_factors(self.__class__.__name__, factors)
+
+        factor_names = [factor.factor_name for factor in factors]
+        base_factors = [name for name in factor_names if name not in self.__generators]
+        for generated, bases in self.__generators.items():
+            if generated not in factor_names or not set(bases).issubset(base_factors) or len(bases) < 2:
+                raise BaseError(f"Invalid generator {generated} = {'*'.join(bases)}: the generated factor must be a factor, "
+                                f"aliased with the interaction of at least two (non-generated) base factors!")
+
+        # The defining relation: all products of the generator words I = generated * bases
+        words = [frozenset([generated] + list(bases)) for generated, bases in self.__generators.items()]
+        self.__defining_relation = [reduce(lambda a, b: a ^ b, subset, frozenset())
+                                    for r in range(1, len(words) + 1) for subset in itertools.combinations(words, r)]
+
+        # Record the aliases of the main effects and two-factor interactions with effects up to order three
+        effects = [frozenset([name]) for name in factor_names] + \
+                  [frozenset(pair) for pair in itertools.combinations(factor_names, 2)]
+        self.__aliases = dict()
+        for effect in effects:
+            aliases = sorted(['*'.join(sorted(effect ^ word, key=factor_names.index)) for word in self.__defining_relation
+                              if len(effect ^ word) <= 3], key=lambda alias: (alias.count('*'), alias))
+            if aliases:
+                self.__aliases['*'.join(sorted(effect, key=factor_names.index))] = aliases
+
+        combinations = []
+        for base_signs in itertools.product([-1, 1], repeat=len(base_factors)):
+            signs = dict(zip(base_factors, base_signs))
+            for generated, bases in self.__generators.items():
+                signs[generated] = math.prod(signs[base] for base in bases)
+            combinations.append(tuple(factor.treatments[0 if signs[factor.factor_name] < 0 else 1] for factor in factors))
+        return combinations
+
+    def describe(self) -> Dict:
+        return {
+            **super().describe(),
+            'generators': {generated: '*'.join(bases) for generated, bases in self.__generators.items()},
+            'defining_relation': sorted(['*'.join(sorted(word)) for word in self.__defining_relation], key=len),
+            'resolution': self.resolution,
+            'aliases': self.__aliases
+        }
+
+
+class PlackettBurmanDesign(DesignModel):
+    SUPPORTED_RUNS = [4, 8, 12, 16, 20, 24, 32, 64]
+
+    def __init__(self):
+        """A Plackett-Burman screening design for up to 63 two-level factors, using the smallest supported number of runs
+        (a multiple of four) larger than the number of factors. Main effects are not aliased with each other, but
+        partially aliased with two-factor interactions (resolution III)."""
+        self.__runs = None
+
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        _assert_two_level_factors(self.__class__.__name__, factors)
+
+        self.__runs = next((runs for runs in PlackettBurmanDesign.SUPPORTED_RUNS if runs > len(factors)), None)
+        if self.__runs is None:
+            raise BaseError(f"{self.__class__.__name__} supports at most {PlackettBurmanDesign.SUPPORTED_RUNS[-1] - 1} factors!")
+
+        columns = _hadamard_columns(self.__runs, len(factors))
+        # With a single factor, the rows repeat its treatment levels (use repetitions instead)
+        combinations = list(dict.fromkeys(tuple(factor.treatments[0 if column[row] < 0 else 1]
+                                                for factor, column in zip(factors, columns))
+                                          for row in range(self.__runs)))
+        self.__runs = len(combinations)
+        return combinations
+
+    def describe(self) -> Dict:
+        return {**super().describe(), 'runs': self.__runs, 'resolution': 3,
+                'aliases': 'main effects are partially aliased with two-factor interactions'}
+
+
+class OrthogonalArrayDesign(DesignModel):
+    def __init__(self):
+        """A strength 2 orthogonal array: every pair of factors is observed in all combinations of their treatment
+        levels equally often. All factors must have the same number of treatment levels s. For s = 2 the Plackett-Burman
+        arrays are used, for prime s the Bose construction OA(s^2, s+1, s, 2) (i.e. at most s+1 factors)."""
+        self.__array = None
+
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        levels = set(len(factor.treatments) for factor in factors)
+        if len(levels) != 1:
+            raise BaseError(f"{self.__class__.__name__} requires all factors to have the same number of treatment levels!")
+        s = levels.pop()
+
+        if s == 2:
+            combinations = PlackettBurmanDesign().generate_treatment_combinations(factors)
+            self.__array = f"OA({len(combinations)}, {len(factors)}, 2, 2)"
+            return combinations
+
+        if s < 2 or any(s % d == 0 for d in range(2, int(math.sqrt(s)) + 1)):
+            raise BaseError(f"{self.__class__.__name__} supports only a prime number of treatment levels (found {s})!")
+        if len(factors) > s + 1:
+            raise BaseError(f"{self.__class__.__name__} supports at most {s + 1} factors with {s} treatment levels!")
+
+        # Bose construction: the columns i, j, i+j, i+2j, ..., i+(s-1)j (mod s) over all (i, j)
+        combinations = []
+        for i, j in itertools.product(range(s), repeat=2):
+            row = [i] + [(i * m + j) % s for m in range(s)]
+            combinations.append(tuple(factor.treatments[row[col]] for col, factor in enumerate(factors)))
+        # With a single factor, the rows repeat its treatment levels (use repetitions instead)
+        combinations = list(dict.fromkeys(combinations))
+        self.__array = f"OA({len(combinations)}, {len(factors)}, {s}, 2)"
+        return combinations
+
+    def describe(self) -> Dict:
+        return {**super().describe(), 'array': self.__array, 'strength': 2}
+
+
+class LatinHypercubeDesign(DesignModel):
+    def __init__(self, samples: int, seed: int = 0):
+        """A Latin hypercube sample of `samples` combinations for numeric factors: the (sorted) treatment levels of each
+        factor are split into `samples` equally sized strata, and each stratum is sampled exactly once.
+        The `seed` makes the sample reproducible, which is required to resume an experiment."""
+        if samples < 1:
+            raise BaseError(f"{self.__class__.__name__} requires at least one sample!")
+        self.__samples = samples
+        self.__seed = seed
+
+    def generate_treatment_combinations(self, factors: List[FactorModel]) -> List[Tuple]:
+        for factor in factors:
+            if not all(isinstance(t, (int, float)) and not isinstance(t, bool) for t in factor.treatments):
+                raise BaseError(f"{self.__class__.__name__} requires numeric factors, but factor {factor.factor_name} "
+                                f"has non-numeric treatment levels!")
+
+        rng = random.Random(self.__seed)
+        columns = []
+        for factor in factors:
+            levels = sorted(factor.treatments)
+            strata = list(range(self.__samples))
+            rng.shuffle(strata)
+            columns.append([levels[int((stratum + rng.random()) * len(levels) / self.__samples)] for stratum in strata])
+
+        # With fewer levels than samples, a combination can be sampled more than once (use repetitions instead)
+        return list(dict.fromkeys(zip(*columns)))
+
+    def describe(self) -> Dict:
+        return {**super().describe(), 'samples': self.__samples, 'seed': self.__seed}
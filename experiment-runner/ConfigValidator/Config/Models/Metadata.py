@@ -1,9 +1,15 @@
+from typing import Dict
 
 
 class Metadata:
+    # absent in the metadata of experiments created by older versions
+    _design: Dict = None
+    _ordering: Dict = None
 
-    def __init__(self, md5sum: bytes):
+    def __init__(self, md5sum: bytes, design: Dict = None, ordering: Dict = None):
         self._md5sum = md5sum
+        self._design = design
+        self._ordering = ordering
 
     @property
     def md5sum(self):
@@ -12,3 +18,19 @@ class Metadata:
     @md5sum.setter
     def md5sum(self, md5sum: bytes):
         self._md5sum = md5sum
+
+    @property
+    def design(self):
+        return self._design
+
+    @design.setter
+    def design(self, design: Dict):
+        self._design = design
+
+    @property
+    def ordering(self):
+        return self._ordering
+
+    @ordering.setter
+    def ordering(self, ordering: Dict):
+        self._ordering = ordering
@@ -0,0 +1,78 @@
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+
+class OrderingModel(ABC):
+    """Decides the order in which the runs of the run table are performed."""
+
+    @abstractmethod
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        """Orders the runs, given as the repetitions (in order) of each combination of treatment levels (in design order)."""
+        pass
+
+    def describe(self) -> Dict:
+        """A description of the chosen ordering, recorded in the experiment's metadata."""
+        return {'ordering': self.__class__.__name__}
+
+
+class SeededOrderingModel(OrderingModel, ABC):
+    def __init__(self, seed: Optional[int] = None):
+        """A random ordering. Without a `seed`, a seed is drawn (and recorded), such that the order can be reproduced."""
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+
+    def describe(self) -> Dict:
+        return {**super().describe(), 'seed': self.seed}
+
+
+def _repetition_blocks(treatments: List[List[Dict]]) -> List[List[Dict]]:
+    # Block i holds the i-th repetition of each combination of treatment levels
+    return [[repetitions[i] for repetitions in treatments if i < len(repetitions)]
+            for i in range(max((len(repetitions) for repetitions in treatments), default=0))]
+
+
+class GroupedOrder(OrderingModel):
+    """All repetitions of a combination of treatment levels consecutively, in design order."""
+
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        return [run for repetitions in treatments for run in repetitions]
+
+
+class RandomOrder(SeededOrderingModel):
+    """A complete randomization of all runs. A prefix of the order can miss some combinations of treatment levels."""
+
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        runs = [run for repetitions in treatments for run in repetitions]
+        random.Random(self.seed).shuffle(runs)
+        return runs
+
+
+class RoundRobinOrder(OrderingModel):
+    """One repetition of every combination of treatment levels (in design order) per round.
+    Any prefix of the order is balanced: the number of repetitions of the combinations differs by at most one."""
+
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        return [run for block in _repetition_blocks(treatments) for run in block]
+
+
+class BlockedRandomOrder(SeededOrderingModel):
+    """Blocked randomization: one repetition of every combination of treatment levels per block, in a random order
+    within each block. Any prefix of the order is balanced, while the order within the blocks does not confound
+    the treatment levels with drift over time."""
+
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        rng = random.Random(self.seed)
+        runs = []
+        for block in _repetition_blocks(treatments):
+            rng.shuffle(block)
+            runs.extend(block)
+        return runs
+
+
+class OneRepetitionFirstOrder(OrderingModel):
+    """One repetition of every combination of treatment levels first, such that the whole design is covered early on,
+    followed by the remaining repetitions grouped per combination."""
+
+    def order(self, treatments: List[List[Dict]]) -> List[Dict]:
+        return [repetitions[0] for repetitions in treatments if repetitions] + \
+               [run for repetitions in treatments for run in repetitions[1:]]
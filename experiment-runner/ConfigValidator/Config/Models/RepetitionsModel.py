@@ -0,0 +1,59 @@
+from typing import List
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class RepetitionsModel:
+    def __init__(self,
+                 min_repetitions: int,
+                 max_repetitions: int = None,
+                 stopping_data_columns: List[str] = None,
+                 confidence_level: float = 0.95,
+                 max_relative_ci_width: float = 0.05
+                 ):
+        """Each variation (combination of treatment levels) is repeated between `min_repetitions` and `max_repetitions` times.
+        After `min_repetitions`, a variation is no longer repeated once the confidence interval (at `confidence_level`)
+        of the mean of each of the `stopping_data_columns` is narrower than `max_relative_ci_width` times that mean."""
+        if max_repetitions is None:
+            max_repetitions = min_repetitions
+        if stopping_data_columns is None:
+            stopping_data_columns = []
+
+        if min_repetitions < 1 or max_repetitions < min_repetitions:
+            raise BaseError(f"Invalid repetitions: 1 <= min_repetitions ({min_repetitions}) "
+                            f"<= max_repetitions ({max_repetitions}) must hold!")
+
+        if max_repetitions > min_repetitions and not stopping_data_columns:
+            raise BaseError("Stopping data columns must be specified when the number of repetitions is adaptive!")
+
+        if not 0 < confidence_level < 1 or max_relative_ci_width <= 0:
+            raise BaseError("The confidence level must be in (0, 1), and the maximum relative CI width positive!")
+
+        self.__min_repetitions = min_repetitions
+        self.__max_repetitions = max_repetitions
+        self.__stopping_data_columns = stopping_data_columns
+        self.__confidence_level = confidence_level
+        self.__max_relative_ci_width = max_relative_ci_width
+
+    @property
+    def min_repetitions(self) -> int:
+        return self.__min_repetitions
+
+    @property
+    def max_repetitions(self) -> int:
+        return self.__max_repetitions
+
+    @property
+    def stopping_data_columns(self) -> List[str]:
+        return self.__stopping_data_columns
+
+    @property
+    def confidence_level(self) -> float:
+        return self.__confidence_level
+
+    @property
+    def max_relative_ci_width(self) -> float:
+        return self.__max_relative_ci_width
+
+    def is_adaptive(self) -> bool:
+        return self.__max_repetitions > self.__min_repetitions
@@ -1,11 +1,15 @@
+import hashlib
 import itertools
-import random
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Union
 
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RepetitionsModel import RepetitionsModel
+from ConfigValidator.Config.Models.DesignModel import DesignModel, FullFactorialDesign
+from ConfigValidator.Config.Models.OrderingModel import OrderingModel, GroupedOrder, RandomOrder
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
 
 
 class RunTableModel:
@@ -13,12 +17,22 @@ class RunTableModel:
                  factors: List[FactorModel],
                  exclude_variations: List[Dict[FactorModel, List[SupportsStr]]] = None,
                  data_columns: List[str] = None,
-                 shuffle: bool = False
+                 shuffle: bool = False,
+                 repetitions: Union[int, RepetitionsModel] = 1,
+                 design: DesignModel = None,
+                 ordering: OrderingModel = None,
+                 baseline: BaselineModel = None
                  ):
         if exclude_variations is None:
             exclude_variations = {}
         if data_columns is None:
             data_columns = []
+        if design is None:
+            design = FullFactorialDesign()
+        if shuffle and ordering is not None:
+            raise BaseError("Either shuffle the run table, or specify its ordering!")
+        if ordering is None:
+            ordering = RandomOrder() if shuffle else GroupedOrder()
 
         if len(set([factor.factor_name for factor in factors])) != len(factors):
             raise BaseError("Duplicate factor name detected!")
@@ -26,10 +40,18 @@ class RunTableModel:
         if len(set(data_columns)) != len(data_columns):
             raise BaseError("Duplicate data column detected!")
 
+        if isinstance(repetitions, int):
+            repetitions = RepetitionsModel(repetitions)
+        if not set(repetitions.stopping_data_columns).issubset(data_columns):
+            raise BaseError("The stopping data columns of the repetitions must be data columns!")
+
         self.__factors = factors
         self.__exclude_variations = exclude_variations
         self.__data_columns = data_columns
-        self.__shuffle = shuffle
+        self.__repetitions = repetitions
+        self.__design = design
+        self.__ordering = ordering
+        self.__baseline = baseline
 
     def get_factors(self) -> List[FactorModel]:
         return self.__factors
@@ -37,6 +59,27 @@ class RunTableModel:
     def get_data_columns(self) -> List[str]:
         return self.__data_columns
 
+    def get_repetitions(self) -> RepetitionsModel:
+        return self.__repetitions
+
+    def get_design(self) -> DesignModel:
+        return self.__design
+
+    def get_ordering(self) -> OrderingModel:
+        return self.__ordering
+
+    def get_baseline(self) -> BaselineModel:
+        return self.__baseline
+
+    def calc_run_id(self, treatment_levels: Tuple, repetition: int) -> str:
+        """Derive the run id from the treatment levels (and not from the position in the run table),
+        such that the id of a variation remains the same when the factors gain or lose treatment levels,
+        or when the number of repetitions changes."""
+        digest = hashlib.md5()
+        for factor, treatment_level in zip(self.__factors, treatment_levels):
+            digest.update(f'{factor.factor_name}={treatment_level}\0'.encode())
+        return f'run_{digest.hexdigest()[:12]}_{repetition}'
+
     def generate_experiment_run_table(self) -> List[Dict]:
         def __filter_list(full_list: List[Tuple]):
             if len(self.__exclude_variations) == 0:
@@ -63,8 +106,14 @@ class RunTableModel:
                 del full_list[idx]
             return full_list
 
-        list_of_lists = [factor.treatments for factor in self.__factors]
-        combinations_list = list(itertools.product(*list_of_lists))
+        if self.__baseline:
+            # Resolved here, since plugins can add data columns after the run table model is created
+            if not set(self.__baseline.data_columns).issubset(self.__data_columns):
+                raise BaseError("The data columns to correct for the baseline must be data columns!")
+            self.__data_columns.extend([data_column for data_column in self.__baseline.corrected_data_columns
+                                        if data_column not in self.__data_columns])
+
+        combinations_list = self.__design.generate_treatment_combinations(self.__factors)
         filtered_list = __filter_list(combinations_list)
 
         column_names = ['__run_id', '__done']  # Needed for experiment-runner functionality
@@ -75,17 +124,36 @@ class RunTableModel:
             for data_column in self.__data_columns:
                 column_names.append(data_column)
 
-        experiment_run_table = []
-        for i, combo in enumerate(filtered_list):
-            row_list = list(combo)
-            row_list.insert(0, f'run_{i}')  # __run_id
-            row_list.insert(1, RunProgress.TODO)  # __done
-
-            if self.__data_columns:
-                for _ in self.__data_columns:
-                    row_list.append(" ")
-            experiment_run_table.append(dict(zip(column_names, row_list)))
-
-        if self.__shuffle:
-            random.shuffle(experiment_run_table)
+        treatments = []
+        for combo in filtered_list:
+            repetitions = []
+            for repetition in range(self.__repetitions.max_repetitions):
+                row_list = list(combo)
+                row_list.insert(0, self.calc_run_id(combo, repetition))  # __run_id
+                row_list.insert(1, RunProgress.TODO)  # __done
+
+                if self.__data_columns:
+                    for _ in self.__data_columns:
+                        row_list.append(" ")
+                repetitions.append(dict(zip(column_names, row_list)))
+            treatments.append(repetitions)
+
+        experiment_run_table = self.__ordering.order(treatments)
+        if self.__baseline:
+            experiment_run_table = self.__interleave_baseline_runs(experiment_run_table, column_names)
+        if len(set([variation['__run_id'] for variation in experiment_run_table])) != len(experiment_run_table):
+            raise BaseError("Duplicate run id detected! Treatment levels must be distinguishable by their str() representation.")
         return experiment_run_table
+
+    def __interleave_baseline_runs(self, experiment_run_table: List[Dict], column_names: List[str]) -> List[Dict]:
+        """A baseline run before the first run, and after every `every` runs. Baseline runs have no treatment levels."""
+        interleaved = []
+        for idx, variation in enumerate(experiment_run_table):
+            if idx % self.__baseline.every == 0:
+                baseline_run = {column_name: " " for column_name in column_names}
+                baseline_run.update({factor.factor_name: '' for factor in self.__factors})
+                baseline_run['__run_id'] = f'{BaselineModel.RUN_ID_PREFIX}{idx // self.__baseline.every}'
+                baseline_run['__done'] = RunProgress.TODO
+                interleaved.append(baseline_run)
+            interleaved.append(variation)
+        return interleaved
@@ -1,9 +1,21 @@
 from pathlib import Path
 
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+
 
 class RunnerContext:
 
-    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path):
+    def __init__(self, run_variation: dict, run_nr: int, run_dir: Path, cpu_placement=None, timeline=None, artifacts=None,
+                 readiness=None):
         self.run_variation = run_variation
         self.run_nr = run_nr
         self.run_dir = run_dir
+        self.cpu_placement = cpu_placement  # set if `RunnerConfig.measured_cpus` is configured
+        self.timeline = timeline            # the MeasurementTimeline of the run, its window is known from STOP_MEASUREMENT
+        self.artifacts = artifacts          # the ArtifactTransfer that retrieves remote files after the run (not when reprocessing)
+        self.readiness = readiness          # waits for the system under test to be ready (not when reprocessing)
+
+    @property
+    def is_baseline(self) -> bool:
+        """A baseline run (see `BaselineModel`) invokes the same hooks, which should not start the target workload."""
+        return BaselineModel.is_baseline_run(self.run_variation)
@@ -4,6 +4,7 @@ from ConfigValidator.Config.Models.RunTableModel import RunTableModel
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
 from ExtendedTyping.Typing import SupportsStr
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
@@ -31,6 +32,49 @@ class RunnerConfig:
     This can be essential to accommodate for cooldown periods on some systems."""
     time_between_runs_in_ms:    int             = 1000
 
+    """(Optional) The maximum duration of a run. A run that exceeds it is killed, and remains TODO.
+    There is no timeout if set to `None`."""
+    run_timeout_in_ms:          Optional[int]   = None
+
+    """(Optional) Before each run, wait until the system-wide CPU utilization is at most this percentage, e.g. to let
+    stray processes from outside the experiment finish. (Processes left behind by a run are always killed.)
+    Disabled if set to `None`."""
+    idle_cpu_threshold_percent: Optional[float] = None
+
+    """The maximum time to wait for the system to become idle, after which the run starts anyway."""
+    idle_timeout_in_ms:         int             = 60000
+
+    """(Optional) Path of a result cache that can be shared between experiments. Variations that have already been
+    measured with the same config code, treatment levels and host are then reused instead of being re-measured.
+    The cache is disabled if set to `None`."""
+    result_cache_path:          Optional[Path]  = None
+
+    """The maximum size of the result cache. Least recently used entries are evicted first."""
+    result_cache_max_size_in_mb: int            = 1024
+
+    """(Optional) Decides which variation is run next, e.g. `BayesianOptimization` or `SuccessiveHalving` to search for
+    the best variation in a fraction of the runs. Variations that are not chosen are marked as SKIPPED.
+    All variations are run in the order of the run table if set to `None`."""
+    scheduler:                  Optional[Scheduler] = None
+
+    """(Optional) The wall-clock time available for the experiment. Based on the observed run durations and
+    `time_between_runs_in_ms`, the repetitions are run in rounds (one repetition of each treatment), and a round is
+    only started if it is expected to complete within the budget. The remaining runs are marked as SKIPPED.
+    There is no time budget if set to `None`."""
+    time_budget_in_ms:          Optional[int]   = None
+
+    """(Optional) The cpus the target runs on. Experiment Runner itself, and thereby the hooks and profilers it starts,
+    run on the `housekeeping_cpus` (by default all other cpus). Pin the target in `start_run` with
+    `context.cpu_placement.pin_target(pid)`. The placement is verified during each run and recorded in the run table.
+    Disabled if set to `None`."""
+    measured_cpus:              Optional[List[int]] = None
+    housekeeping_cpus:          Optional[List[int]] = None
+
+    """(Optional) The hosts (names as used by `ConnectionHandler`) of remote profilers. Their clock offset and drift
+    are estimated at the start and the end of each run, recorded in the run table, and applied when their samples are
+    aligned with `context.timeline.add_stream(..., host=...)`. Disabled if set to `None`."""
+    remote_clock_hosts:         Optional[List[str]] = None
+
     # Dynamic configurations can be one-time satisfied here before the program takes the config as-is
     # e.g. Setting some variable based on some criteria
     def __init__(self):
@@ -5,12 +5,27 @@ from ExperimentOrchestrator.Misc.DictConversion import class_to_dict
 from ExperimentOrchestrator.Misc.PathValidation import is_path_exists_or_creatable_portable
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.OperationType import OperationType
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
 from ConfigValidator.CustomErrors.ConfigErrors import (ConfigInvalidError, ConfigAttributeInvalidError)
 
 class ConfigValidator:
     config_values_or_exception_dict: dict = {}
     error_found:                     bool = False
 
+    # Attributes introduced after the first config template. Configs that do not define them take the template's default.
+    optional_attributes:             list = [
+        'result_cache_path',
+        'result_cache_max_size_in_mb',
+        'scheduler',
+        'time_budget_in_ms',
+        'run_timeout_in_ms',
+        'idle_cpu_threshold_percent',
+        'idle_timeout_in_ms',
+        'measured_cpus',
+        'housekeeping_cpus',
+        'remote_clock_hosts'
+    ]
+
     @staticmethod
     def __check_expression(name, value, expected, expression):
         if expression(value, expected):
@@ -19,14 +34,23 @@ class ConfigValidator:
                                                     f"\n\n{ConfigAttributeInvalidError(name, value, expected)}"
             ConfigValidator.error_found = True
 
+    @staticmethod
+    def __set_optional_defaults(config: RunnerConfig):
+        for name in ConfigValidator.optional_attributes:
+            if not hasattr(config, name):
+                setattr(config, name, getattr(RunnerConfig, name))
+
     @staticmethod
     def validate_config(config: RunnerConfig):
+        ConfigValidator.__set_optional_defaults(config)
 
         # Runtime set experiment_path
         config.experiment_path = Path(str(config.results_output_path) + f"/{config.name}")
         if '~' in str(config.experiment_path):
             config.experiment_path = config.experiment_path.expanduser()
-        
+        if config.result_cache_path is not None and '~' in str(config.result_cache_path):
+            config.result_cache_path = config.result_cache_path.expanduser()
+
         # Convert class to dictionary with utility method
         ConfigValidator.config_values_or_exception_dict = class_to_dict(config)
 
@@ -52,6 +76,67 @@ class ConfigValidator:
                             (lambda a, b: is_path_exists_or_creatable_portable(a))
                         )
 
+        # Result cache
+        ConfigValidator.__check_expression("result_cache_path",
+                            config.result_cache_path,
+                            "None or a Path",
+                            (lambda a, b: a is not None and not isinstance(a, Path))
+                        )
+        ConfigValidator.__check_expression('result_cache_max_size_in_mb', config.result_cache_max_size_in_mb, int,
+                                (lambda a, b: not isinstance(a, b) or a <= 0)
+                            )
+
+        # Scheduler
+        ConfigValidator.__check_expression("scheduler",
+                            config.scheduler,
+                            "None or a Scheduler",
+                            (lambda a, b: a is not None and not isinstance(a, Scheduler))
+                        )
+
+        # Time budget
+        ConfigValidator.__check_expression("time_budget_in_ms",
+                            config.time_budget_in_ms,
+                            "None or a positive int",
+                            (lambda a, b: a is not None and (not isinstance(a, int) or a <= 0))
+                        )
+
+        # Process reaping
+        ConfigValidator.__check_expression("run_timeout_in_ms",
+                            config.run_timeout_in_ms,
+                            "None or a positive int",
+                            (lambda a, b: a is not None and (not isinstance(a, int) or a <= 0))
+                        )
+        ConfigValidator.__check_expression("idle_cpu_threshold_percent",
+                            config.idle_cpu_threshold_percent,
+                            "None or a percentage",
+                            (lambda a, b: a is not None and (not isinstance(a, (int, float)) or not 0 <= a <= 100))
+                        )
+        ConfigValidator.__check_expression('idle_timeout_in_ms', config.idle_timeout_in_ms, int,
+                                (lambda a, b: not isinstance(a, b) or a < 0)
+                            )
+
+        # CPU placement
+        for name in ['measured_cpus', 'housekeeping_cpus']:
+            ConfigValidator.__check_expression(name,
+                                getattr(config, name),
+                                "None or a list of cpu numbers",
+                                (lambda a, b: a is not None and (not isinstance(a, (list, set, tuple)) or
+                                                                 not all(isinstance(cpu, int) for cpu in a)))
+                            )
+        ConfigValidator.__check_expression("housekeeping_cpus",
+                            config.housekeeping_cpus,
+                            "only together with measured_cpus",
+                            (lambda a, b: a is not None and config.measured_cpus is None)
+                        )
+
+        # Clock synchronisation
+        ConfigValidator.__check_expression("remote_clock_hosts",
+                            config.remote_clock_hosts,
+                            "None or a list of host names",
+                            (lambda a, b: a is not None and (not isinstance(a, (list, tuple)) or
+                                                             not all(isinstance(host, str) for host in a)))
+                        )
+
         # Display config in user-friendly manner, including potential errors found
         print(
             tabulate(
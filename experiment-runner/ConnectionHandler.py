@@ -1,34 +1,362 @@
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Run.ClockSync import CommandClock
 
 import os
-import paramiko
+import time
+import socket
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class CommandResult:
+    def __init__(self, host_name: str, command: str, exit_status: Optional[int], stdout: str, stderr: str,
+                 start_time: float = None, end_time: float = None, error: str = None):
+        self.host_name = host_name
+        self.command = command
+        self.exit_status = exit_status  # None if the command could not be run, see `error`
+        self.stdout = stdout
+        self.stderr = stderr
+        self.start_time = start_time    # time.monotonic() when the command was issued
+        self.end_time = end_time        # time.monotonic() when it completed
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_status == 0
+
+
+class ConcurrentResults:
+    """The results of `ConnectionHandler.run_concurrently`, in the order of the commands."""
+
+    def __init__(self, results: List[CommandResult]):
+        self.results = results
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __getitem__(self, index) -> CommandResult:
+        return self.results[index]
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
+
+    @property
+    def failed(self) -> List[CommandResult]:
+        return [result for result in self.results if not result.ok]
+
+    @property
+    def skew(self) -> Optional[float]:
+        """The time (s) between issuing the first and the last command, None if any command could not be issued."""
+        start_times = [result.start_time for result in self.results]
+        if not start_times or None in start_times:
+            return None
+        return max(start_times) - min(start_times)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """The time (s) from issuing the first command until all commands completed."""
+        if not self.results or any(result.start_time is None or result.end_time is None for result in self.results):
+            return None
+        return max(result.end_time for result in self.results) - min(result.start_time for result in self.results)
+
+    @staticmethod
+    def data_columns(name: str) -> List[str]:
+        return [f'{name}__skew_ms', f'{name}__duration_ms']
+
+    def get_run_data(self, name: str) -> Dict[str, Optional[float]]:
+        """The skew and duration as run table data, in the `data_columns(name)`."""
+        skew, duration = self.skew, self.duration
+        return {f'{name}__skew_ms': round(skew * 1e3, 3) if skew is not None else None,
+                f'{name}__duration_ms': round(duration * 1e3, 3) if duration is not None else None}
+
+
+class ConnectionLostError(BaseError):
+    """The connection to a host was lost before a command could be started on it."""
+
+
+class SSHBackend:
+    """A single SSH connection to a host, over which each command runs in its own channel."""
+
+    def __init__(self, host_name: str, host: str, username: str, password: str, keepalive_interval_in_s: int = 30,
+                 compress: bool = False):
+        import paramiko
+
+        self.host_name = host_name
+        self.client = paramiko.SSHClient()
+        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self.client.connect(host, username=username, password=password, compress=compress)
+        # Keepalives prevent idle connections (e.g. during a long interaction) from being dropped by firewalls
+        self.client.get_transport().set_keepalive(keepalive_interval_in_s)
+        output.console_log(f"Connection successful to {host_name}")
+
+    def is_alive(self) -> bool:
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def __open_channel(self):
+        import paramiko
+        try:
+            return self.client.get_transport().open_session()
+        except (paramiko.SSHException, EOFError, OSError, AttributeError) as e:
+            raise ConnectionLostError(f"The connection to {self.host_name} was lost: {e}")
+
+    def run(self, command: str, timeout_in_s: float = None, barrier: threading.Barrier = None) -> CommandResult:
+        channel = self.__open_channel()
+        channel.settimeout(timeout_in_s)
+        try:
+            if barrier is not None:
+                barrier.wait()
+            start_time = time.monotonic()
+            channel.exec_command(command)
+            stdout, stderr = channel.makefile('rb'), channel.makefile_stderr('rb')
+            # stderr is drained concurrently, such that a command with lots of output on both never blocks
+            stderr_data = []
+            stderr_reader = threading.Thread(target=lambda: stderr_data.append(stderr.read()), daemon=True)
+            stderr_reader.start()
+            stdout_data = stdout.read()
+            stderr_reader.join()
+            exit_status = channel.recv_exit_status()
+            end_time = time.monotonic()
+        except socket.timeout:
+            raise BaseError(f"'{command}' did not complete on {self.host_name} within {timeout_in_s}s")
+        finally:
+            channel.close()
+        return CommandResult(self.host_name, command, exit_status, stdout_data.decode(errors='replace'),
+                             b''.join(stderr_data).decode(errors='replace'), start_time, end_time)
+
+    def open_clock(self) -> CommandClock:
+        channel = self.__open_channel()
+        channel.exec_command(CommandClock.COMMAND)
+
+        def close():
+            channel.shutdown_write()
+            channel.close()
+        return CommandClock(channel.makefile_stdin('wb'), channel.makefile('rb'), close)
+
+    def open_sftp(self):
+        import paramiko
+        try:
+            return self.client.open_sftp()
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            raise ConnectionLostError(f"The connection to {self.host_name} was lost: {e}")
+
+    def close(self):
+        self.client.close()
+
+
+class LocalSFTP:
+    """A local stand-in for the paramiko.SFTPClient of a host. As over SFTP, relative paths are relative to the home
+    directory."""
+
+    def __init__(self):
+        self.home = os.path.expanduser('~')
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(os.path.join(self.home, path))
+
+    def open(self, path: str, mode: str = 'r'):
+        return open(os.path.join(self.home, path), mode)
+
+    def close(self):
+        pass
+
+
+class LocalBackend:
+    """Runs the commands of a host locally (e.g. to test or dry-run a config without the remote hosts)."""
+
+    def __init__(self, host_name: str):
+        self.host_name = host_name
+
+    def is_alive(self) -> bool:
+        return True
+
+    def run(self, command: str, timeout_in_s: float = None, barrier: threading.Barrier = None) -> CommandResult:
+        if barrier is not None:
+            barrier.wait()
+        start_time = time.monotonic()
+        try:
+            completed = subprocess.run(command, shell=True, capture_output=True, timeout=timeout_in_s)
+        except subprocess.TimeoutExpired:
+            raise BaseError(f"'{command}' did not complete on {self.host_name} within {timeout_in_s}s")
+        return CommandResult(self.host_name, command, completed.returncode,
+                             completed.stdout.decode(errors='replace'), completed.stderr.decode(errors='replace'),
+                             start_time, time.monotonic())
+
+    def open_clock(self) -> CommandClock:
+        process = subprocess.Popen(CommandClock.COMMAND, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+        def close():
+            process.stdin.close()
+            process.wait()
+            process.stdout.close()
+        return CommandClock(process.stdin, process.stdout, close)
+
+    def open_sftp(self) -> LocalSFTP:
+        return LocalSFTP()
+
+    def close(self):
+        pass
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    ConnectionPool                     |
+###     |       - Keep a single connection per host, which is   |
+###     |         shared by all ConnectionHandlers of the       |
+###     |         process                                       |
+###     |       - Reconnect when a connection was lost          |
+###     |       - Each run executes in its own (forked)         |
+###     |         process, in which the connections of the      |
+###     |         parent are not used                           |
+###     |                                                       |
+###     =========================================================
+class ConnectionPool:
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__host_locks: Dict[str, threading.Lock] = dict()
+        self.__connections: Dict[str, object] = dict()
+        self.__inherited: List[object] = []
+        os.register_at_fork(after_in_child=self.__after_fork)
+
+    def get(self, host_name: str, connect: Callable[[], object]):
+        # Connecting can take long (e.g. an unreachable host), which only holds up the users of the same host
+        with self.__host_lock(host_name):
+            with self.__lock:
+                connection = self.__connections.get(host_name)
+            if connection is not None and not connection.is_alive():
+                output.console_log_WARNING(f"The connection to {host_name} was lost, reconnecting")
+                self.discard(host_name, connection)
+                connection = None
+            if connection is None:
+                connection = connect()
+                with self.__lock:
+                    self.__connections[host_name] = connection
+            return connection
+
+    def discard(self, host_name: str, connection):
+        with self.__lock:
+            if self.__connections.get(host_name) is connection:
+                del self.__connections[host_name]
+        self.__close(connection)
+
+    def close_all(self):
+        with self.__lock:
+            for connection in self.__connections.values():
+                self.__close(connection)
+            self.__connections = dict()
+
+    def __after_fork(self):
+        # The connections of the parent process (i.e. their sockets and transport threads) cannot be shared, and must
+        # not be closed from the child either. They are kept referenced, and replaced by new connections when used.
+        self.__lock = threading.Lock()
+        self.__host_locks = dict()
+        self.__inherited.extend(self.__connections.values())
+        self.__connections = dict()
+
+    def __host_lock(self, host_name: str) -> threading.Lock:
+        with self.__lock:
+            return self.__host_locks.setdefault(host_name, threading.Lock())
+
+    @staticmethod
+    def __close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
 
 class ConnectionHandler:
-    def __init__(self, host_name):
+    LOCAL_HOST = 'local'
+    pool = ConnectionPool()
+
+    def __init__(self, host_name, timeout_in_s: float = None, compress: bool = False):
+        """The credentials of the host are read from the environment variables <host_name>_HOST, _USER and _PASSWORD.
+        With <host_name>_HOST=local (or the host_name LOCAL_HOST), its commands are executed locally instead.
+        Connections are pooled: all handlers of a host share a single connection per process, which is closed at the
+        end of the run or the experiment.
+        With `compress`, a separate (zlib) compressed connection is used, e.g. for bulk transfers."""
         self.host_name = host_name
+        self.timeout_in_s = timeout_in_s
+        self.compress = compress
+        self.__pool_key = f"{host_name}+compressed" if compress else host_name
+
+    def run(self, command: str, timeout_in_s: float = None, barrier: threading.Barrier = None) -> CommandResult:
+        """Runs `command` on the host, and returns its stdout, stderr and exit status. With a `barrier`, the command
+        is only issued once the connection is ready and all parties have reached the barrier."""
+        timeout_in_s = timeout_in_s if timeout_in_s is not None else self.timeout_in_s
+        connection = self.__connection()
+        try:
+            return connection.run(command, timeout_in_s, barrier)
+        except ConnectionLostError:
+            # The command was not started (nor was the barrier passed), so it can safely be retried over a new connection
+            ConnectionHandler.pool.discard(self.__pool_key, connection)
+            return self.__connection().run(command, timeout_in_s, barrier)
+
+    @staticmethod
+    def run_concurrently(commands: List[Tuple[str, str]], synchronized: bool = True, timeout_in_s: float = None,
+                         barrier_timeout_in_s: float = 60) -> ConcurrentResults:
+        """Runs the (host_name, command) pairs concurrently, each in its own thread, and returns their results once
+        all have completed. When `synchronized`, the commands are only issued once all connections are ready, such
+        that e.g. all profilers start (or stop) at nearly the same time, see `ConcurrentResults.skew`. A command that
+        fails to run (e.g. an unreachable host) does not raise, its result holds the `error` instead."""
+        barrier = threading.Barrier(len(commands), timeout=barrier_timeout_in_s) if synchronized and commands else None
+
+        def run(host_name: str, command: str) -> CommandResult:
+            try:
+                return ConnectionHandler(host_name).run(command, timeout_in_s, barrier)
+            except Exception as e:
+                if barrier is not None:
+                    barrier.abort()  # release the other commands, which are then not issued either
+                output.console_log_FAIL(f"'{command}' could not be run on {host_name}: {e}")
+                return CommandResult(host_name, command, None, '', '', error=str(e) or type(e).__name__)
+
+        if not commands:
+            return ConcurrentResults([])
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            futures = [executor.submit(run, host_name, command) for host_name, command in commands]
+            return ConcurrentResults([future.result() for future in futures])
 
     def execute_remote_command(self, command, command_name):
-        con = self.connect_to_host()
+        """Runs `command` on the host, and returns 1 if it succeeded (exit status 0), or 0 otherwise."""
         output.console_log(command_name)
-        req, out, err = con.exec_command(command)
-        err = err.read()
-
-        if err != b'':
-            output.console_log(err)
+        result = self.run(command)
+        if result.stderr:
+            output.console_log(result.stderr)
+        if not result.ok:
+            output.console_log_FAIL(f"'{command_name}' failed with exit status {result.exit_status}")
             return 0
 
         output.console_log(f"'{command_name}' command successfully executed")
         return 1
 
     def connect_to_host(self):
-        host, username, password = self.get_credentials()
-        # connect to server
-        con = paramiko.SSHClient()
-        con.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        con.connect(host, username = username, password = password)
-        output.console_log(f"Connection successful to {self.host_name}")
+        """The (pooled) paramiko.SSHClient of the host."""
+        connection = self.__connection()
+        if not isinstance(connection, SSHBackend):
+            raise BaseError(f"{self.host_name} is not connected over SSH")
+        return connection.client
 
-        return con
+    def open_clock(self) -> CommandClock:
+        """Reads the clock of the host over a single command channel, see `ClockSync`."""
+        return self.__connection().open_clock()
+
+    def open_sftp(self):
+        """A paramiko.SFTPClient over the (pooled) connection of the host, or a `LocalSFTP` for a local host. It should
+        be closed after use."""
+        connection = self.__connection()
+        try:
+            return connection.open_sftp()
+        except ConnectionLostError:
+            ConnectionHandler.pool.discard(self.__pool_key, connection)
+            return self.__connection().open_sftp()
 
     def get_credentials(self):
         # declare credentials
@@ -43,10 +371,22 @@ class ConnectionHandler:
         return host, username, password
 
     def get_containers_count(self):
-        conn = self.connect_to_host()
         _, _, password = self.get_credentials()
-        _, number_of_containers_buf, err = conn.exec_command(f" echo {password} | sudo -S docker ps | wc -l")
-        number_of_containers = int(number_of_containers_buf.read().strip())
+        result = self.run(f" echo {password} | sudo -S docker ps | wc -l")
+        number_of_containers = int(result.stdout.strip())
         output.console_log(f"Found {number_of_containers} running after sleeping")
 
         return number_of_containers
+
+    @staticmethod
+    def close_all():
+        """Closes the pooled connections of this process."""
+        ConnectionHandler.pool.close_all()
+
+    def __connection(self):
+        return ConnectionHandler.pool.get(self.__pool_key, self.__connect)
+
+    def __connect(self):
+        if ConnectionHandler.LOCAL_HOST in (self.host_name, os.getenv(f"{self.host_name}_HOST")):
+            return LocalBackend(self.host_name)
+        return SSHBackend(self.host_name, *self.get_credentials(), compress=self.compress)
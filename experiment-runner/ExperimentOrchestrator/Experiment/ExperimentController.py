@@ -2,13 +2,24 @@ import time
 import multiprocessing
 
 from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.Cache.ResultCache import ResultCache
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 from ConfigValidator.Config.Models.OperationType import OperationType
 from EventManager.Models.RunnerEvents import RunnerEvents
 from ProgressManager.Output.CSVOutputManager import CSVOutputManager
 from ExperimentOrchestrator.Experiment.Run.RunController import RunController
+from ExperimentOrchestrator.Experiment.Run.ProcessReaper import ProcessReaper, run_in_new_process_group
+from ExperimentOrchestrator.Experiment.Run.CpuPlacement import CpuPlacement
+from ExperimentOrchestrator.Experiment.Run.ClockSync import ClockSync
+from ExperimentOrchestrator.Experiment.Run.ArtifactTransfer import ArtifactTransfer
+from ConnectionHandler import ConnectionHandler
+from ExperimentOrchestrator.Experiment.SequentialStopping import SequentialStopping
+from ExperimentOrchestrator.Experiment.TimeBudget import TimeBudget
+from ExperimentOrchestrator.Experiment.RollingBaseline import RollingBaseline
+from ExperimentOrchestrator.Experiment.Scheduling.StaticScheduler import StaticScheduler
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 from EventManager.EventSubscriptionController import EventSubscriptionController
@@ -36,7 +47,21 @@ class ExperimentController:
 
         self.csv_data_manager = CSVOutputManager(self.config.experiment_path)
         self.json_data_manager = JSONOutputManager(self.config.experiment_path)
-        self.run_table = self.config.create_run_table_model().generate_experiment_run_table()
+        run_table_model = self.config.create_run_table_model()
+        self.cpu_placement = None
+        if self.config.measured_cpus is not None:
+            self.cpu_placement = CpuPlacement(self.config.measured_cpus, self.config.housekeeping_cpus)
+            # The runner (and the hooks and profilers it starts) stays off the measured cpus
+            self.cpu_placement.pin_housekeeping()
+            run_table_model.get_data_columns().extend([data_column for data_column in CpuPlacement.DATA_COLUMNS
+                                                       if data_column not in run_table_model.get_data_columns()])
+        if self.config.remote_clock_hosts:
+            run_table_model.get_data_columns().extend([data_column for data_column
+                                                       in ClockSync.data_columns(self.config.remote_clock_hosts)
+                                                       if data_column not in run_table_model.get_data_columns()])
+        self.run_table = run_table_model.generate_experiment_run_table()
+        self.metadata.design = self.config.run_table_model.get_design().describe()
+        self.metadata.ordering = self.config.run_table_model.get_ordering().describe()
 
         # Create experiment output folder, and in case that it exists, check if we can resume
         self.restarted = False
@@ -46,23 +71,59 @@ class ExperimentController:
             output.console_log_WARNING(f"Reusing already existing experiment path: {self.config.experiment_path}")
             existing_run_table = self.csv_data_manager.read_run_table()
 
-            # First sanity check. If there is no "TODO" in the __done column, simply abort.
-            todo_run_found = any([variation['__done'] != RunProgress.DONE for variation in existing_run_table])
-            if not todo_run_found:
-                raise BaseError("The experiment was restarted, but all runs have already been completed.")
-
-            # The experiment has been restarted as there is >=1 "TODO" variations in the CSV file
             # In order to resume a previous experiment, the following conditions must hold true:
             #   1. The column names of the stored run_table and the generated one must match
-            #   2. The stored md5sum for the code must match the current one
+            #   2. There is >=1 "TODO" variation after merging the stored run_table with the generated one
+            #   3. The stored md5sum for the code must match the current one
 
             # check column names
             if not set(existing_run_table[0].keys()) == set(self.run_table[0].keys()):
                 raise BaseError("The generated run table from the config file, and the found run table in the CSV in "
                                 "the experiment output path, do not define the same columns!"
                                 )
+
+            # Merge the stored run_table into the generated one. Run ids are derived from the treatment levels, so:
+            #   - stored variations that are still generated keep their progress and data (and their stored order)
+            #   - newly generated variations (e.g. an added treatment level) are appended as TODO
+            #   - stored variations that are no longer generated (e.g. a removed treatment level) are dropped
+            # Note that the stored run_table has only a str() representation of the factor treatment levels.
+            # The generated one can have arbitrary python objects, which are kept.
+            generated_run_table = {generated_var['__run_id']: generated_var for generated_var in self.run_table}
+            merged_run_table = []
+            dropped_runs = 0
+            for existing_var in existing_run_table:
+                generated_var = generated_run_table.pop(existing_var['__run_id'], None)
+                if generated_var is None:
+                    dropped_runs += 1
+                    continue
+
+                for k in map(lambda factor: factor.factor_name,
+                             self.config.run_table_model.get_factors()):  # treatment levels remain the same
+                    assert (str(generated_var[k]) == str(existing_var[k]))
+
+                for k in set(self.config.run_table_model.get_data_columns()).union(
+                        ['__done']):  # update data columns and __done column
+                    generated_var[k] = existing_var[k]
+                merged_run_table.append(generated_var)
+
+            if not merged_run_table:
+                raise BaseError("None of the runs in the found run table in the CSV in the experiment output path are "
+                                "part of the generated run table from the config file! (Run tables created by older "
+                                "versions of experiment-runner use positional run ids, which cannot be resumed.)")
+
+            added_runs = [generated_var for generated_var in self.run_table if generated_var['__run_id'] in generated_run_table]
+            self.run_table = merged_run_table + added_runs
+
+            # If there is no "TODO" in the __done column, simply abort.
+            todo_run_found = any([variation['__done'] == RunProgress.TODO for variation in self.run_table])
+            if not todo_run_found:
+                raise BaseError("The experiment was restarted, but all runs have already been completed.")
+
             # check md5sum
             existing_metadata = self.json_data_manager.read_metadata()
+            if existing_metadata.ordering is not None:
+                # The stored order of the runs is kept when resuming, and so is the ordering (and seed) that created it
+                self.metadata.ordering = existing_metadata.ordering
             if existing_metadata.md5sum != self.metadata.md5sum:  # check md5sum
                 cont = output.query_yes_no("md5sum mismatch! This can occur if the configuration code "
                                            "has changed since the last run. Continue anyway?", default=None)
@@ -71,35 +132,15 @@ class ExperimentController:
 
                 output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
                 self.json_data_manager.write_metadata(self.metadata)
+            elif existing_metadata.design != self.metadata.design or existing_metadata.ordering != self.metadata.ordering:
+                self.json_data_manager.write_metadata(self.metadata)
 
-            self.restarted = True
-            assert(len(existing_run_table) == len(self.run_table))
-
-            # Re-order the generated run table to match the already existing one
-            tmp_run_table = []
-            for existing_var in existing_run_table:
-                for generated_var in self.run_table:
-                    if existing_var['__run_id'] == generated_var['__run_id']:
-                        tmp_run_table.append(generated_var)
-                        break
-            self.run_table = tmp_run_table
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert(existing_var['__run_id'] == generated_var['__run_id'])
-
-            # Fill in the run_table.
-            # Note that the stored run_table has only a str() representation of the factor treatment levels.
-            # The generated one can have arbitrary python objects.
-            for existing_var, generated_var in zip(existing_run_table, self.run_table):
-                assert (existing_var['__run_id'] == generated_var['__run_id'])
-
-                for k in map(lambda factor: factor.factor_name,
-                             self.config.run_table_model.get_factors()):  # treatment levels remain the same
-                    assert (str(generated_var[k]) == str(existing_var[k]))
-
-                for k in set(self.config.run_table_model.get_data_columns()).union(
-                        ['__done']):  # update data columns and __done column
-                    generated_var[k] = existing_var[k]
+            if added_runs or dropped_runs:
+                output.console_log_WARNING(f"The experiment design changed: {len(added_runs)} new runs added, "
+                                           f"{dropped_runs} runs no longer part of the design dropped")
+                self.csv_data_manager.write_run_table(self.run_table)
 
+            self.restarted = True
             output.console_log_WARNING(">> WARNING << -- Experiment is restarted!")
         if not self.restarted:
             self.csv_data_manager.write_run_table(self.run_table)
@@ -107,6 +148,30 @@ class ExperimentController:
 
         output.console_log_WARNING("Experiment run table created...")
 
+        self.result_cache = None
+        if self.config.result_cache_path is not None:
+            self.result_cache = ResultCache(self.config.result_cache_path, self.config.result_cache_max_size_in_mb,
+                                            self.metadata.md5sum, self.config.run_table_model.get_factors())
+            output.console_log_WARNING(f"Using result cache: {self.config.result_cache_path}")
+
+        self.sequential_stopping = None
+        if self.config.run_table_model.get_repetitions().is_adaptive():
+            self.sequential_stopping = SequentialStopping(self.config.run_table_model)
+
+        self.time_budget = None
+        if self.config.time_budget_in_ms is not None:
+            self.time_budget = TimeBudget(self.config.time_budget_in_ms, self.config.time_between_runs_in_ms,
+                                          [factor.factor_name for factor in self.config.run_table_model.get_factors()])
+
+        self.rolling_baseline = None
+        if self.config.run_table_model.get_baseline():
+            self.rolling_baseline = RollingBaseline(self.config.run_table_model.get_baseline())
+
+        self.process_reaper = ProcessReaper()
+
+        self.scheduler = self.config.scheduler if self.config.scheduler is not None else StaticScheduler()
+        self.scheduler.setup(self.config.run_table_model, self.run_table)
+
     def do_experiment(self):
         output.console_log_OK("Experiment setup completed...")
 
@@ -116,31 +181,190 @@ class ExperimentController:
         EventSubscriptionController.raise_event(RunnerEvents.BEFORE_EXPERIMENT)
 
         # -- Experiment
-        for variation in self.run_table:
-            if variation['__done'] == RunProgress.DONE:
-                continue
-
-            output.console_log_WARNING("Calling before_run config hook")
-            EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+        # Resume the statistics of a restarted experiment
+        completed_runs = [variation for variation in self.run_table if variation['__done'] == RunProgress.DONE]
+        self.__resume_artifact_transfers(completed_runs)
+        if self.rolling_baseline:
+            for variation in completed_runs:
+                if BaselineModel.is_baseline_run(variation):
+                    self.rolling_baseline.observe(variation)
+            completed_runs = [variation for variation in completed_runs if not BaselineModel.is_baseline_run(variation)]
+        for variation in completed_runs:
+            self.scheduler.observe(variation)
+        if self.sequential_stopping:
+            for variation in completed_runs:
+                self.sequential_stopping.observe(variation)
+            for variation in completed_runs:
+                self.__skip_remaining_repetitions_if_converged(variation)
 
-            run_controller = RunController(variation, self.config, (self.run_table.index(variation) + 1), len(self.run_table))
-            perform_run = multiprocessing.Process(
-                target=run_controller.do_run,
-                args=[]
-            )
-            perform_run.start()
-            perform_run.join()
+        if self.time_budget:
+            self.time_budget.start()
 
-            time_btwn_runs = self.config.time_between_runs_in_ms
-            if time_btwn_runs > 0:
-                output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s")
-                time.sleep(time_btwn_runs / 1000)
+        # Variations that fail remain TODO (to be retried on a restart), but are attempted only once per invocation
+        attempted_run_ids = set()
+        while True:
+            candidates = [variation for variation in self.run_table
+                          if variation['__done'] == RunProgress.TODO and variation['__run_id'] not in attempted_run_ids]
+            baseline_runs = [variation for variation in candidates if BaselineModel.is_baseline_run(variation)]
+            candidates = [variation for variation in candidates if not BaselineModel.is_baseline_run(variation)]
+            dismissed = self.scheduler.dismiss(candidates)
+            if dismissed:
+                self.__skip_variations(dismissed, "the scheduler dismissed them")
+                candidates = [variation for variation in candidates if variation['__done'] == RunProgress.TODO]
+            schedulable = self.time_budget.select_candidates(candidates, self.run_table) if self.time_budget else candidates
+            if self.rolling_baseline and self.rolling_baseline.is_due() and baseline_runs and schedulable:
+                self.__perform_run(baseline_runs[0], attempted_run_ids)
+                continue
+            variation = self.scheduler.next_variation(schedulable) if schedulable else None
+            if variation is None:
+                break
+            self.__perform_run(variation, attempted_run_ids)
 
-            if self.config.operation_type is OperationType.SEMI:
-                EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+        if candidates:
+            self.__skip_variations(candidates, "the time budget is exhausted" if not schedulable
+                                   else "the scheduler ended the experiment")
+        if baseline_runs:
+            self.__skip_variations(baseline_runs, "no runs remain to be measured against them")
 
         output.console_log_OK("Experiment completed...")
 
         # -- After experiment
         output.console_log_WARNING("Calling after_experiment config hook")
         EventSubscriptionController.raise_event(RunnerEvents.AFTER_EXPERIMENT)
+        ConnectionHandler.close_all()
+
+    def __perform_run(self, variation, attempted_run_ids):
+        attempted_run_ids.add(variation['__run_id'])
+        is_baseline = BaselineModel.is_baseline_run(variation)
+
+        # Baseline runs measure the current state of the system, and are never reused
+        if self.result_cache and not is_baseline and self.__reuse_cached_result(variation):
+            self.__observe_completed_run(variation)
+            return
+
+        run_start = time.monotonic()
+        if self.config.idle_cpu_threshold_percent is not None:
+            self.process_reaper.wait_until_idle(self.config.idle_cpu_threshold_percent, self.config.idle_timeout_in_ms)
+
+        # Any process started from here on (including in before_run) is killed when the run ends
+        self.process_reaper.snapshot()
+        output.console_log_WARNING("Calling before_run config hook")
+        EventSubscriptionController.raise_event(RunnerEvents.BEFORE_RUN)
+
+        run_controller = RunController(variation, self.config, (self.run_table.index(variation) + 1), len(self.run_table),
+                                       self.cpu_placement)
+        perform_run = multiprocessing.Process(
+            target=run_in_new_process_group,
+            args=[run_controller.do_run]
+        )
+        perform_run.start()
+        try:
+            run_timeout = self.config.run_timeout_in_ms
+            perform_run.join(run_timeout / 1000 if run_timeout is not None else None)
+            if perform_run.is_alive():
+                output.console_log_FAIL(f"Run {variation['__run_id']} exceeded the run timeout of {run_timeout}ms")
+        finally:
+            # Also when the run crashed, timed out or the experiment is interrupted
+            self.process_reaper.reap(perform_run.pid)
+            perform_run.join()
+
+        # Remote files of the run are retrieved in the background, during the cooldown
+        artifacts = ArtifactTransfer.load(self.config.experiment_path / variation['__run_id'])
+        if artifacts:
+            artifacts.start()
+        if self.time_budget and not is_baseline:
+            self.time_budget.record_run(time.monotonic() - run_start)
+
+        self.__read_stored_run_data(variation)
+        if self.rolling_baseline:
+            self.rolling_baseline.count_run(variation)
+        if variation['__done'] == RunProgress.DONE and is_baseline:
+            self.rolling_baseline.observe(variation)
+        elif variation['__done'] == RunProgress.DONE:
+            if self.rolling_baseline:
+                variation.update(self.rolling_baseline.correct(variation))
+                self.rolling_baseline.save_references(self.config.experiment_path / variation['__run_id'])
+                self.csv_data_manager.update_row_data(variation)
+            self.__observe_completed_run(variation)
+
+        time_btwn_runs = self.config.time_between_runs_in_ms
+        if time_btwn_runs > 0:
+            output.console_log_bold(f"Run fully ended, waiting for: {time_btwn_runs}ms == {time_btwn_runs / 1000}s")
+            time.sleep(time_btwn_runs / 1000)
+
+        if artifacts and not artifacts.wait(0):
+            output.console_log_WARNING("Waiting for the remote files of the run to be retrieved...")
+            artifacts.wait()
+
+        if variation['__done'] == RunProgress.DONE and not is_baseline:
+            self.__cache_run(variation, artifacts)
+
+        if self.config.operation_type is OperationType.SEMI:
+            EventSubscriptionController.raise_event(RunnerEvents.CONTINUE)
+
+    def __resume_artifact_transfers(self, completed_runs):
+        # The transfers that were interrupted (e.g. when the experiment was aborted during a cooldown)
+        for variation in completed_runs:
+            artifacts = ArtifactTransfer.load(self.config.experiment_path / variation['__run_id'])
+            if artifacts and artifacts.pending:
+                output.console_log_WARNING(f"Resuming the retrieval of the remote files of run {variation['__run_id']}")
+                artifacts.transfer_all()
+                if not BaselineModel.is_baseline_run(variation):
+                    self.__cache_run(variation, artifacts)
+
+    def __cache_run(self, variation, artifacts):
+        # The run directory is cached once it is complete, i.e. all remote files of the run have been retrieved
+        if not self.result_cache:
+            return
+        if artifacts and artifacts.pending:
+            output.console_log_WARNING(f"Not caching run {variation['__run_id']}, not all its remote files were retrieved")
+            return
+        self.result_cache.put(variation, self.__get_run_data(variation), self.config.experiment_path / variation['__run_id'])
+
+    def __get_run_data(self, variation):
+        return {k: variation[k] for k in self.config.run_table_model.get_data_columns()}
+
+    def __read_stored_run_data(self, variation):
+        # The run is performed in a separate process, the stored run table is the single source of truth for its results
+        stored_variation = next((row for row in self.csv_data_manager.read_run_table()
+                                 if row['__run_id'] == variation['__run_id']), None)
+        if stored_variation is None:
+            return
+
+        for k in set(self.config.run_table_model.get_data_columns()).union(['__done']):
+            variation[k] = stored_variation[k]
+
+    def __observe_completed_run(self, variation):
+        self.scheduler.observe(variation)
+        if self.sequential_stopping:
+            self.sequential_stopping.observe(variation)
+            self.__skip_remaining_repetitions_if_converged(variation)
+
+    def __skip_remaining_repetitions_if_converged(self, variation):
+        if not self.sequential_stopping.is_converged(variation):
+            return
+
+        remaining_variations = [var for var in self.sequential_stopping.get_remaining_variations(variation, self.run_table)
+                                if var['__done'] == RunProgress.TODO]
+        if not remaining_variations:
+            return
+
+        self.__skip_variations(remaining_variations, f"the stopping data columns of {variation['__run_id']} converged")
+
+    def __skip_variations(self, variations, reason):
+        for variation in variations:
+            variation['__done'] = RunProgress.SKIPPED
+        output.console_log_OK(f"Skipping {len(variations)} runs, {reason}")
+        self.csv_data_manager.update_multiple_row_data(variations)
+
+    def __reuse_cached_result(self, variation) -> bool:
+        run_dir = self.config.experiment_path / variation['__run_id']
+        cached_run_data = self.result_cache.get(variation, run_dir)
+        if cached_run_data is None:
+            return False
+
+        output.console_log_OK(f"Reusing cached result for {variation['__run_id']}")
+        variation.update(cached_run_data)
+        variation['__done'] = RunProgress.DONE
+        self.csv_data_manager.update_row_data(variation)
+        return True
@@ -0,0 +1,138 @@
+import os
+import sys
+import traceback
+import multiprocessing
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from EventManager.Models.RunnerEvents import RunnerEvents
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from ExperimentOrchestrator.Experiment.RollingBaseline import RollingBaseline
+from ExperimentOrchestrator.Experiment.Run.MeasurementTimeline import MeasurementTimeline
+from ExtendedTyping.Typing import SupportsStr
+
+
+def populate_run_data(variation: Dict, run_nr: int, run_dir: Path) -> Tuple[Optional[Dict[str, SupportsStr]], Optional[str]]:
+    # Executed in a worker process of the pool. The event subscriptions are inherited from the parent on fork.
+    try:
+        run_context = RunnerContext(variation, run_nr, run_dir, timeline=MeasurementTimeline.load(run_dir))
+        return EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, run_context), None
+    except Exception:
+        ex_type, ex_value, tb = sys.exc_info()
+        return None, f"{ex_type.__name__}: {ex_value}\n{''.join(traceback.format_tb(tb))}"
+
+
+###     =========================================================
+###     |                                                       |
+###     |                  ReprocessController                  |
+###     |       - Recompute the data columns of all DONE runs   |
+###     |         from the raw data stored in their run_dir,    |
+###     |         without performing the runs again             |
+###     |       - Only the POPULATE_RUN_DATA hook is invoked,   |
+###     |         in parallel over a process pool               |
+###     |                                                       |
+###     =========================================================
+class ReprocessController:
+
+    def __init__(self, config: RunnerConfig, metadata: Metadata, processes: int = None, update_md5sum: bool = False):
+        self.config = config
+        self.metadata = metadata
+        self.processes = processes if processes else os.cpu_count()
+        self.update_md5sum = update_md5sum
+
+        if not self.config.experiment_path.exists():
+            raise BaseError(f"Cannot reprocess, the experiment path {self.config.experiment_path} does not exist.")
+
+        self.csv_data_manager = CSVOutputManager(self.config.experiment_path)
+        self.json_data_manager = JSONOutputManager(self.config.experiment_path)
+        self.run_table = self.csv_data_manager.read_run_table()
+
+        # The stored run_table has only a str() representation of the factor treatment levels.
+        # Hooks expect the generated (arbitrary python) objects, as during the original run.
+        self.generated_run_table = {variation['__run_id']: variation
+                                    for variation in self.config.create_run_table_model().generate_experiment_run_table()}
+
+    def do_reprocess(self):
+        data_columns = self.config.run_table_model.get_data_columns()
+
+        to_reprocess = []
+        for run_nr, stored_var in enumerate(self.run_table, start=1):
+            if stored_var['__done'] != RunProgress.DONE:
+                continue
+
+            variation = dict(stored_var)
+            generated_var = self.generated_run_table.get(stored_var['__run_id'])
+            if generated_var is not None:
+                for factor in self.config.run_table_model.get_factors():
+                    variation[factor.factor_name] = generated_var[factor.factor_name]
+            to_reprocess.append((stored_var, (variation, run_nr, self.config.experiment_path / stored_var['__run_id'])))
+
+        if not to_reprocess:
+            raise BaseError("There are no completed runs to reprocess.")
+
+        output.console_log_WARNING(f"Reprocessing {len(to_reprocess)} runs over {self.processes} processes...")
+        with multiprocessing.Pool(processes=self.processes) as pool:
+            results = pool.starmap(populate_run_data, [args for _, args in to_reprocess])
+
+        failed_runs = []
+        for (stored_var, _), (run_data, error) in zip(to_reprocess, results):
+            if error is not None:
+                output.console_log_FAIL(f"Reprocessing {stored_var['__run_id']} failed, keeping its stored data:\n{error}")
+                failed_runs.append(stored_var['__run_id'])
+                continue
+            if not run_data:
+                continue
+
+            for k, v in run_data.items():
+                if k in data_columns:
+                    stored_var[k] = v
+                else:
+                    output.console_log_WARNING(f"Ignoring {k} returned for {stored_var['__run_id']}, it is not a data column")
+
+        baseline_model = self.config.run_table_model.get_baseline()
+        if baseline_model:
+            # Each run is corrected with the (reprocessed) baseline runs it was corrected with when it was performed.
+            # Runs without stored references fall back to the stored order, i.e. the order of a static schedule.
+            baseline_runs = {stored_var['__run_id']: stored_var for stored_var in self.run_table
+                             if stored_var['__done'] == RunProgress.DONE and BaselineModel.is_baseline_run(stored_var)}
+            rolling_baseline = RollingBaseline(baseline_model)
+            for stored_var in self.run_table:
+                if stored_var['__done'] != RunProgress.DONE:
+                    continue
+                if BaselineModel.is_baseline_run(stored_var):
+                    rolling_baseline.observe(stored_var)
+                    continue
+                references = RollingBaseline.load_references(self.config.experiment_path / stored_var['__run_id'])
+                if references is not None:
+                    restored = RollingBaseline(baseline_model)
+                    restored.restore(references, baseline_runs)
+                    stored_var.update(restored.correct(stored_var))
+                else:
+                    stored_var.update(rolling_baseline.correct(stored_var))
+
+        # All rows are written back at once, instead of rewriting the run table once per run
+        self.csv_data_manager.write_run_table(self.run_table)
+
+        # The md5sum identifies the config the runs were performed with, it is only replaced on request
+        existing_metadata = self.json_data_manager.read_metadata()
+        if existing_metadata.md5sum != self.metadata.md5sum and self.update_md5sum:
+            output.console_log_WARNING(f"Updating md5sum from {existing_metadata.md5sum.hex()} to {self.metadata.md5sum.hex()}")
+            existing_metadata.md5sum = self.metadata.md5sum
+            self.json_data_manager.write_metadata(existing_metadata)
+        elif existing_metadata.md5sum != self.metadata.md5sum:
+            output.console_log_WARNING(f"md5sum mismatch! The config changed since the runs were performed "
+                                       f"({existing_metadata.md5sum.hex()} != {self.metadata.md5sum.hex()}). The stored "
+                                       f"md5sum is kept, use --update-md5sum to replace it.")
+
+        if failed_runs:
+            raise BaseError(f"Reprocessing failed for the runs: {', '.join(failed_runs)}")
+        output.console_log_OK("Reprocessing completed...")
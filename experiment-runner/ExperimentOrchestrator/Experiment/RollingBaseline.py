@@ -0,0 +1,90 @@
+import json
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ExtendedTyping.Typing import SupportsStr
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    RollingBaseline                    |
+###     |       - Keep the data columns of the most recent      |
+###     |         baseline runs, in execution order             |
+###     |       - Subtract their mean from the data columns     |
+###     |         of the runs that follow                       |
+###     |       - Store the baseline runs each run is corrected |
+###     |         with, to reprocess it against the same ones   |
+###     |                                                       |
+###     =========================================================
+class RollingBaseline:
+    REFERENCES_FILE = 'baseline_references.json'
+
+    def __init__(self, baseline_model: BaselineModel):
+        self.__model = baseline_model
+        # The (run id, value) of the most recent baseline runs, per data column
+        self.__recent: Dict[str, Deque[Tuple[str, float]]] = {data_column: deque(maxlen=baseline_model.window)
+                                                  for data_column in baseline_model.data_columns}
+        self.__runs_since_baseline: Optional[int] = None  # no baseline run performed (yet) in this invocation
+
+    def is_due(self) -> bool:
+        """A baseline run starts the experiment (also when it is resumed), and follows every `every` runs."""
+        return self.__runs_since_baseline is None or self.__runs_since_baseline >= self.__model.every
+
+    def count_run(self, variation: Dict):
+        """Count a performed (completed or failed) run of this invocation."""
+        if BaselineModel.is_baseline_run(variation):
+            self.__runs_since_baseline = 0
+        elif self.__runs_since_baseline is not None:
+            self.__runs_since_baseline += 1
+
+    def observe(self, variation: Dict):
+        """Update the rolling estimates with the data columns of a completed baseline run."""
+        run_id = variation['__run_id']
+        for data_column, recent in self.__recent.items():
+            try:
+                recent.append((run_id, float(variation[data_column])))
+            except (KeyError, TypeError, ValueError):
+                continue  # not populated
+
+    def estimate(self, data_column: str) -> Optional[float]:
+        recent = self.__recent[data_column]
+        return sum(value for _, value in recent) / len(recent) if recent else None
+
+    def references(self) -> Dict[str, List[str]]:
+        """The run ids of the baseline runs the current estimates are based on, per data column."""
+        return {data_column: [run_id for run_id, _ in recent] for data_column, recent in self.__recent.items()}
+
+    def save_references(self, run_dir: Path):
+        with open(run_dir / RollingBaseline.REFERENCES_FILE, 'w') as f:
+            json.dump(self.references(), f, indent=2)
+
+    @staticmethod
+    def load_references(run_dir: Path) -> Optional[Dict[str, List[str]]]:
+        try:
+            with open(run_dir / RollingBaseline.REFERENCES_FILE, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None  # performed without a baseline, or before the references were stored
+
+    def restore(self, references: Dict[str, List[str]], baseline_runs: Dict[str, Dict]):
+        """Reset the estimates to the referenced baseline runs (by run id), e.g. to reprocess a run."""
+        for data_column, recent in self.__recent.items():
+            recent.clear()
+            for run_id in references.get(data_column, []):
+                try:
+                    recent.append((run_id, float(baseline_runs[run_id][data_column])))
+                except (KeyError, TypeError, ValueError):
+                    continue  # no longer populated
+
+    def correct(self, variation: Dict) -> Dict[str, SupportsStr]:
+        """The baseline corrected data columns of a completed run, empty if the baseline or the value is unknown."""
+        corrected = dict()
+        for data_column, corrected_column in zip(self.__model.data_columns, self.__model.corrected_data_columns):
+            baseline = self.estimate(data_column)
+            try:
+                corrected[corrected_column] = float(variation[data_column]) - baseline if baseline is not None else ' '
+            except (KeyError, TypeError, ValueError):
+                corrected[corrected_column] = ' '
+        return corrected
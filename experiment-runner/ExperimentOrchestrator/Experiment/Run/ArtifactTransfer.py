@@ -0,0 +1,165 @@
+import json
+import shlex
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConnectionHandler import ConnectionHandler
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class Artifact:
+    PENDING = 'PENDING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    def __init__(self, host_name: str, remote_path: str, local_name: str, compress: bool = True,
+                 status: str = PENDING, size: int = None, sha256: str = None, error: str = None):
+        self.host_name = host_name
+        self.remote_path = remote_path
+        self.local_name = local_name    # relative to the run directory
+        self.compress = compress
+        self.status = status
+        self.size = size
+        self.sha256 = sha256
+        self.error = error
+
+    def to_dict(self) -> Dict:
+        return vars(self).copy()
+
+    @property
+    def sftp_path(self) -> str:
+        # SFTP does not expand ~, but resolves relative paths from the home directory
+        return self.remote_path[2:] if self.remote_path.startswith('~/') else self.remote_path
+
+    @property
+    def shell_path(self) -> str:
+        return '~/' + shlex.quote(self.sftp_path) if self.remote_path.startswith('~/') else shlex.quote(self.remote_path)
+
+
+###     =========================================================
+###     |                                                       |
+###     |                    ArtifactTransfer                   |
+###     |       - Records the remote files (e.g. the raw data   |
+###     |         of remote profilers) to retrieve for a run    |
+###     |       - Pulls them into the run directory over SFTP,  |
+###     |         in the background during the cooldown         |
+###     |       - Resumes interrupted transfers, and verifies   |
+###     |         the files with their SHA-256 checksum         |
+###     |                                                       |
+###     =========================================================
+class ArtifactTransfer:
+    MANIFEST_FILE = 'artifacts.json'
+    PARTIAL_SUFFIX = '.part'
+
+    def __init__(self, run_dir: Path, chunk_size: int = 1024 * 1024, attempts: int = 3):
+        self.run_dir = run_dir
+        self.chunk_size = chunk_size
+        self.attempts = attempts
+        self.artifacts: List[Artifact] = []
+        self.__thread: Optional[threading.Thread] = None
+
+    def fetch(self, host_name: str, remote_path: str, local_name: str = None, compress: bool = True):
+        """Retrieves `remote_path` from the host (see `ConnectionHandler`) into the run directory once the run has
+        ended, such that the transfer does not interfere with the measurement. With `compress`, the file is compressed
+        in flight (over a separate compressed SSH connection)."""
+        if local_name is None:
+            local_name = f"{host_name}__{Path(remote_path).name}"
+        if any(artifact.local_name == local_name for artifact in self.artifacts):
+            raise BaseError(f"ArtifactTransfer: An artifact is already retrieved into {local_name}")
+        self.artifacts.append(Artifact(host_name, remote_path, local_name, compress))
+        self.save()
+
+    @property
+    def pending(self) -> List[Artifact]:
+        return [artifact for artifact in self.artifacts if artifact.status != Artifact.DONE]
+
+    def save(self):
+        with open(self.run_dir / ArtifactTransfer.MANIFEST_FILE, 'w') as f:
+            json.dump([artifact.to_dict() for artifact in self.artifacts], f, indent=2)
+
+    @staticmethod
+    def load(run_dir: Path) -> Optional['ArtifactTransfer']:
+        """The artifacts recorded for a run, or None if it did not fetch any."""
+        manifest_file = run_dir / ArtifactTransfer.MANIFEST_FILE
+        if not manifest_file.exists():
+            return None
+        with open(manifest_file, 'r') as f:
+            stored = json.load(f)
+        artifact_transfer = ArtifactTransfer(run_dir)
+        artifact_transfer.artifacts = [Artifact(**artifact) for artifact in stored]
+        return artifact_transfer
+
+    def start(self):
+        """Transfers the pending artifacts in a background thread."""
+        self.__thread = threading.Thread(target=self.transfer_all, daemon=True)
+        self.__thread.start()
+
+    def wait(self, timeout_in_s: float = None) -> bool:
+        """Waits for the background transfer, returns False if it is still in progress after `timeout_in_s`."""
+        if self.__thread is None:
+            return True
+        self.__thread.join(timeout_in_s)
+        return not self.__thread.is_alive()
+
+    def transfer_all(self) -> bool:
+        """Transfers the pending artifacts, each is attempted up to `attempts` times. Returns whether all succeeded."""
+        for artifact in self.pending:
+            for attempt in range(1, self.attempts + 1):
+                try:
+                    self.transfer(artifact)
+                    break
+                except Exception as e:
+                    output.console_log_WARNING(f"ArtifactTransfer: Attempt {attempt}/{self.attempts} to retrieve "
+                                               f"{artifact.remote_path} from {artifact.host_name} failed: {e}")
+                    artifact.status, artifact.error = Artifact.FAILED, str(e)
+            self.save()
+        return not self.pending
+
+    def transfer(self, artifact: Artifact):
+        conn_handler = ConnectionHandler(artifact.host_name, compress=artifact.compress)
+        local_file = self.run_dir / artifact.local_name
+        partial_file = self.run_dir / (artifact.local_name + ArtifactTransfer.PARTIAL_SUFFIX)
+        local_file.parent.mkdir(parents=True, exist_ok=True)
+
+        sftp = conn_handler.open_sftp()
+        try:
+            size = sftp.stat(artifact.sftp_path).st_size
+            # Resume from what a previous (interrupted) attempt retrieved
+            offset = partial_file.stat().st_size if partial_file.exists() else 0
+            if offset > size:
+                offset = 0
+            with sftp.open(artifact.sftp_path, 'rb') as remote_file, open(partial_file, 'ab' if offset else 'wb') as f:
+                remote_file.seek(offset)
+                if hasattr(remote_file, 'prefetch'):
+                    remote_file.prefetch(size)  # pipeline the SFTP read requests, from the offset up to the (file) size
+                while offset < size:
+                    chunk = remote_file.read(min(self.chunk_size, size - offset))
+                    if not chunk:
+                        raise BaseError(f"{artifact.remote_path} was truncated during the transfer")
+                    f.write(chunk)
+                    offset += len(chunk)
+        finally:
+            sftp.close()
+
+        sha256 = ArtifactTransfer.sha256(partial_file)
+        result = conn_handler.run(f"sha256sum {artifact.shell_path}")
+        if not result.ok:
+            raise BaseError(f"Could not compute the checksum of {artifact.remote_path}: {result.stderr.strip()}")
+        if result.stdout.split()[0] != sha256:
+            partial_file.unlink()  # retrieve it from scratch on the next attempt
+            raise BaseError(f"The checksum of {artifact.local_name} does not match the remote file")
+
+        partial_file.replace(local_file)
+        artifact.status, artifact.size, artifact.sha256, artifact.error = Artifact.DONE, size, sha256, None
+        output.console_log_OK(f"ArtifactTransfer: Retrieved {artifact.remote_path} from {artifact.host_name} ({size} B)")
+
+    @staticmethod
+    def sha256(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
@@ -0,0 +1,179 @@
+import sys
+import json
+import time
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class CommandClock:
+    """Reads the clock of a (remote) host over the stdin and stdout of a command that runs on it, and prints the time
+    (in s since the epoch) for each line it reads, such that a reading costs a single round trip over an established
+    channel (instead of starting a command per reading)."""
+    COMMAND = 'while read -r _; do date +%s.%N; done'
+
+    def __init__(self, stdin, stdout, close: Callable[[], None] = None):
+        self.stdin = stdin
+        self.stdout = stdout
+        self.__close = close
+
+    def read(self) -> float:
+        self.stdin.write(b'\n')
+        self.stdin.flush()
+        line = self.stdout.readline()
+        try:
+            return float(line)
+        except ValueError:
+            raise BaseError(f"CommandClock: Unexpected clock reading {line!r}")
+
+    def close(self):
+        if self.__close is not None:
+            self.__close()
+
+
+class LocalClock(CommandClock):
+    """A local stand-in for the clock of a remote host, which is off by `skew_in_s` and drifts by `drift_ppm`."""
+
+    def __init__(self, skew_in_s: float = 0.0, drift_ppm: float = 0.0):
+        script = (f'import sys, time\nstart = time.time()\nfor _ in sys.stdin:\n'
+                  f'    now = time.time()\n    print(now + {skew_in_s!r} + (now - start) * {drift_ppm!r} / 1e6, flush=True)')
+        self.process = subprocess.Popen([sys.executable, '-c', script], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        super().__init__(self.process.stdin, self.process.stdout, self.__terminate)
+
+    def __terminate(self):
+        self.process.stdin.close()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+class ClockOffset:
+    """The offset of a remote clock to the local wall clock (positive if the remote clock is ahead), estimated at the
+    local monotonic time `local_time`, with a round trip `delay` (the offset is accurate to within delay / 2)."""
+
+    def __init__(self, local_time: float, wall_clock_offset: float, offset: float, delay: float):
+        self.local_time = local_time                    # time.monotonic()
+        self.wall_clock_offset = wall_clock_offset      # time.time() - time.monotonic() at local_time
+        self.offset = offset
+        self.delay = delay
+
+    def to_dict(self) -> Dict[str, float]:
+        return vars(self).copy()
+
+    @staticmethod
+    def estimate(clock: CommandClock, probes: int = 8) -> 'ClockOffset':
+        """NTP-style: each probe reads the remote clock between two local readings, and the remote reading is assumed
+        to be taken halfway. Of all probes, the one with the shortest round trip is the least affected by asymmetric
+        delays, and is used."""
+        best = None
+        for _ in range(probes):
+            send = time.monotonic()
+            remote = clock.read()
+            receive = time.monotonic()
+            wall_clock_offset = time.time() - receive
+
+            local_time = (send + receive) / 2
+            offset = ClockOffset(local_time, wall_clock_offset, remote - (local_time + wall_clock_offset), receive - send)
+            if best is None or offset.delay < best.delay:
+                best = offset
+        return best
+
+
+###     =========================================================
+###     |                                                       |
+###     |                       ClockSync                       |
+###     |       - Estimate the clock offset of remote hosts at  |
+###     |         the start and the end of each run, and their  |
+###     |         drift in between                              |
+###     |       - Convert the timestamps of remote samples to   |
+###     |         the local time.monotonic() clock              |
+###     |                                                       |
+###     =========================================================
+class ClockSync:
+    OFFSETS_FILE = 'clock_offsets.json'
+
+    def __init__(self, clocks: Dict[str, Callable[[], CommandClock]], probes: int = 8):
+        """`clocks` opens a clock per host name, e.g. `ConnectionHandler(host).open_clock`."""
+        self.clocks = clocks
+        self.probes = probes
+        self.offsets: Dict[str, Dict[str, ClockOffset]] = {host: dict() for host in clocks}
+        self.__open_clocks: Dict[str, CommandClock] = dict()
+
+    @staticmethod
+    def data_columns(hosts: Iterable[str]) -> List[str]:
+        return [f'clock_sync__{host}__{column}' for host in hosts for column in ['offset_ms', 'drift_ppm', 'delay_ms']]
+
+    def measure(self, phase: str):
+        """Estimates the offsets at the 'start' or the 'end' of the run. The clocks are kept open in between."""
+        for host, open_clock in self.clocks.items():
+            if host not in self.__open_clocks:
+                self.__open_clocks[host] = open_clock()
+            self.offsets[host][phase] = ClockOffset.estimate(self.__open_clocks[host], self.probes)
+
+    def measure_safely(self, phase: str) -> bool:
+        """As `measure`, but a failure (e.g. an unreachable host) is logged instead of failing the run."""
+        try:
+            self.measure(phase)
+            return True
+        except Exception as e:
+            output.console_log_WARNING(f"ClockSync: Could not estimate the clock offsets at the {phase} of the run: {e}")
+            return False
+
+    def close(self):
+        for clock in self.__open_clocks.values():
+            clock.close()
+        self.__open_clocks = dict()
+
+    def drift(self, host: str) -> float:
+        """The drift of the remote clock (s/s), 0 if the offset was only estimated once."""
+        offsets = self.offsets[host]
+        if 'start' not in offsets or 'end' not in offsets or offsets['end'].local_time == offsets['start'].local_time:
+            return 0.0
+        return (offsets['end'].offset - offsets['start'].offset) / (offsets['end'].local_time - offsets['start'].local_time)
+
+    def to_local(self, host: str, remote_times: np.ndarray) -> np.ndarray:
+        """Converts wall clock times (s since the epoch) of the remote host to the local time.monotonic() clock,
+        correcting for the offset, and its drift over the run."""
+        offsets = self.offsets.get(host)
+        if not offsets:
+            raise BaseError(f"ClockSync: The clock offset of {host} has not been estimated")
+        reference = offsets.get('start', offsets.get('end'))
+        remote_times = np.asarray(remote_times, dtype=np.float64)
+
+        # The remote time at the reference, and the offset since, which grows with the drift
+        remote_reference = reference.local_time + reference.wall_clock_offset + reference.offset
+        drift = self.drift(host)
+        local_wall_times = remote_reference - reference.offset + (remote_times - remote_reference) / (1 + drift)
+        return local_wall_times - reference.wall_clock_offset
+
+    def get_run_data(self) -> Dict[str, float]:
+        run_data = dict()
+        for host, offsets in self.offsets.items():
+            reference = offsets.get('start', offsets.get('end'))
+            if reference is None:
+                continue
+            run_data[f'clock_sync__{host}__offset_ms'] = round(reference.offset * 1e3, 3)
+            run_data[f'clock_sync__{host}__drift_ppm'] = round(self.drift(host) * 1e6, 3)
+            run_data[f'clock_sync__{host}__delay_ms'] = round(max(offset.delay for offset in offsets.values()) * 1e3, 3)
+        return run_data
+
+    def save(self, run_dir: Path):
+        with open(run_dir / ClockSync.OFFSETS_FILE, 'w') as f:
+            json.dump({host: {phase: offset.to_dict() for phase, offset in offsets.items()}
+                       for host, offsets in self.offsets.items()}, f, indent=2)
+
+    @staticmethod
+    def load(run_dir: Path) -> Optional['ClockSync']:
+        offsets_file = run_dir / ClockSync.OFFSETS_FILE
+        if not offsets_file.exists():
+            return None
+        with open(offsets_file, 'r') as f:
+            stored = json.load(f)
+        clock_sync = ClockSync({host: None for host in stored})
+        for host, offsets in stored.items():
+            clock_sync.offsets[host] = {phase: ClockOffset(**offset) for phase, offset in offsets.items()}
+        return clock_sync
@@ -0,0 +1,107 @@
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+import psutil
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+def format_cpus(cpus: Iterable[int]) -> str:
+    """A compact cpu list, e.g. '0-3,6'."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(str(start) if start == end else f'{start}-{end}' for start, end in ranges)
+
+
+###     =========================================================
+###     |                                                       |
+###     |                      CpuPlacement                     |
+###     |       - Pin the runner (and thereby the hooks and     |
+###     |         profilers it starts) to the housekeeping      |
+###     |         cpus, and the target to the measured cpus     |
+###     |       - Verify the placement during the run, and      |
+###     |         record it in the run table                    |
+###     |                                                       |
+###     =========================================================
+class CpuPlacement:
+    DATA_COLUMNS = ['cpu_placement__housekeeping_cpus', 'cpu_placement__measured_cpus', 'cpu_placement__verified']
+
+    def __init__(self, measured_cpus: Iterable[int], housekeeping_cpus: Optional[Iterable[int]] = None):
+        available_cpus = os.sched_getaffinity(0)
+        self.measured_cpus: Set[int] = set(measured_cpus)
+        self.housekeeping_cpus: Set[int] = set(housekeeping_cpus) if housekeeping_cpus is not None \
+            else available_cpus - self.measured_cpus
+
+        if not self.measured_cpus or not self.housekeeping_cpus:
+            raise BaseError("CpuPlacement: Both the measured and the housekeeping cpus must be non-empty!")
+        if self.measured_cpus & self.housekeeping_cpus:
+            raise BaseError(f"CpuPlacement: The measured cpus ({format_cpus(self.measured_cpus)}) and the housekeeping "
+                            f"cpus ({format_cpus(self.housekeeping_cpus)}) must not overlap!")
+        if not (self.measured_cpus | self.housekeeping_cpus) <= available_cpus:
+            raise BaseError(f"CpuPlacement: Only the cpus {format_cpus(available_cpus)} are available!")
+
+        self.__targets: List[int] = []
+        self.__unpinned_targets: List[int] = []
+        self.__verified: Optional[bool] = None
+
+    @staticmethod
+    def __pin(pid: int, cpus: Set[int]):
+        # The affinity is a property of each thread, and is inherited by threads and processes created afterwards
+        for thread in psutil.Process(pid).threads():
+            try:
+                os.sched_setaffinity(thread.id, cpus)
+            except ProcessLookupError:
+                pass
+
+    def pin_housekeeping(self, pid: int = None):
+        CpuPlacement.__pin(pid if pid is not None else os.getpid(), self.housekeeping_cpus)
+
+    def pin_target(self, pid: int):
+        """Pins the target process `pid` (and the processes it starts afterwards) to the measured cpus."""
+        CpuPlacement.__pin(pid, self.measured_cpus)
+        self.__targets.append(pid)
+
+    def unpin_target(self, pid: int):
+        """Lets the target process `pid` run on all cpus, i.e. the measured and the housekeeping cpus, e.g. in the runs
+        of an unpinned treatment. It would otherwise inherit the housekeeping cpus from the runner."""
+        CpuPlacement.__pin(pid, self.measured_cpus | self.housekeeping_cpus)
+        self.__unpinned_targets.append(pid)
+
+    def verify(self) -> bool:
+        violations = []
+        if not os.sched_getaffinity(0) <= self.housekeeping_cpus:
+            violations.append(f"the runner runs on {format_cpus(os.sched_getaffinity(0))}")
+        if not self.__targets and not self.__unpinned_targets:
+            violations.append("no target was pinned (use `context.cpu_placement.pin_target(pid)`, or `unpin_target(pid)` "
+                              "to run it on all cpus)")
+
+        targets = [(pid, self.measured_cpus) for pid in self.__targets] + \
+                  [(pid, self.measured_cpus | self.housekeeping_cpus) for pid in self.__unpinned_targets]
+        for pid, cpus in targets:
+            try:
+                target = psutil.Process(pid)
+                for process in [target] + target.children(recursive=True):
+                    for thread in process.threads():
+                        affinity = os.sched_getaffinity(thread.id)
+                        if not affinity <= cpus:
+                            violations.append(f"thread {thread.id} of target process {process.pid} runs on "
+                                              f"{format_cpus(affinity)}")
+            except (psutil.Error, ProcessLookupError):
+                continue  # already finished
+
+        if violations:
+            output.console_log_WARNING(f"CpuPlacement: The placement could not be verified: {'; '.join(violations)}")
+        self.__verified = not violations
+        return self.__verified
+
+    def get_run_data(self) -> Dict[str, str]:
+        return {
+            'cpu_placement__housekeeping_cpus': format_cpus(self.housekeeping_cpus),
+            'cpu_placement__measured_cpus': format_cpus(self.measured_cpus),
+            'cpu_placement__verified': bool(self.__verified)
+        }
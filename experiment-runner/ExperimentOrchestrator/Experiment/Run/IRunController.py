@@ -7,6 +7,12 @@ from multiprocessing import Event
 
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ExperimentOrchestrator.Experiment.Run.CpuPlacement import CpuPlacement
+from ExperimentOrchestrator.Experiment.Run.MeasurementTimeline import MeasurementTimeline
+from ExperimentOrchestrator.Experiment.Run.ClockSync import ClockSync
+from ExperimentOrchestrator.Experiment.Run.ArtifactTransfer import ArtifactTransfer
+from ExperimentOrchestrator.Experiment.Run.Readiness import Readiness
+from ConnectionHandler import ConnectionHandler
 
 class IRunController(ABC):
     run_dir: Path = None
@@ -15,15 +21,31 @@ class IRunController(ABC):
     config: RunnerConfig = None
     run_context: RunnerContext = None
     data_manager: CSVOutputManager = None
-
-    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int):
+    cpu_placement: CpuPlacement = None
+    timeline: MeasurementTimeline = None
+    clock_sync: ClockSync = None
+    artifacts: ArtifactTransfer = None
+    readiness: Readiness = None
+
+    def __init__(self, variation: Dict, config: RunnerConfig, current_run: int, total_runs: int,
+                 cpu_placement: CpuPlacement = None):
         self.run_dir = config.experiment_path / variation['__run_id']
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         self.variation = variation
         self.config = config
         self.current_run = current_run
-        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir)
+        # The placement of the experiment: the runner is already pinned to the housekeeping cpus, such that it cannot
+        # be derived from the current affinity anymore
+        self.cpu_placement = cpu_placement
+        self.timeline = MeasurementTimeline(self.run_dir)
+        if config.remote_clock_hosts:
+            self.clock_sync = ClockSync({host: ConnectionHandler(host).open_clock for host in config.remote_clock_hosts})
+            self.timeline.clock_sync = self.clock_sync
+        self.artifacts = ArtifactTransfer(self.run_dir)
+        self.readiness = Readiness(self.run_dir)
+        self.run_context = RunnerContext(self.variation, self.current_run, self.run_dir, self.cpu_placement, self.timeline,
+                                         self.artifacts, self.readiness)
         self.data_manager = CSVOutputManager(self.config.experiment_path)
 
         self.run_completed_event = Event()
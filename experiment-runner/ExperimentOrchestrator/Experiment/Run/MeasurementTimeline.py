@@ -0,0 +1,155 @@
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Run.ClockSync import ClockSync
+
+
+###     =========================================================
+###     |                                                       |
+###     |                  MeasurementTimeline                  |
+###     |       - Records the measurement window of a run on    |
+###     |         the time.monotonic() clock                    |
+###     |       - Aligns timestamped sample streams (e.g. of    |
+###     |         several profilers) to a common time grid      |
+###     |         within the window                             |
+###     |                                                       |
+###     =========================================================
+class MeasurementTimeline:
+    WINDOW_FILE = 'measurement_window.json'
+    ALIGNED_FILE = 'timeline.npy'
+    METHODS = ('linear', 'previous')
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = run_dir
+        self.start: Optional[float] = None      # time.monotonic() once the START_MEASUREMENT hooks have completed
+        self.stop: Optional[float] = None       # time.monotonic() before the STOP_MEASUREMENT hooks are invoked
+        self.wall_clock_start: Optional[float] = None   # time.time() at `start`
+        self.clock_sync: Optional[ClockSync] = None     # the clock offsets of remote hosts, if configured
+        self.__streams: Dict[str, Tuple[np.ndarray, Dict[str, np.ndarray]]] = dict()
+
+    def mark_start(self):
+        self.start = time.monotonic()
+        self.wall_clock_start = time.time()
+        self.stop = None
+
+    def mark_stop(self):
+        self.stop = time.monotonic()
+        with open(self.run_dir / MeasurementTimeline.WINDOW_FILE, 'w') as f:
+            json.dump({'start': self.start, 'stop': self.stop, 'wall_clock_start': self.wall_clock_start}, f, indent=2)
+
+    @staticmethod
+    def load(run_dir: Path) -> Optional['MeasurementTimeline']:
+        """The timeline of a completed run, or None if its measurement window was not recorded."""
+        window_file = run_dir / MeasurementTimeline.WINDOW_FILE
+        if not window_file.exists():
+            return None
+        with open(window_file, 'r') as f:
+            window = json.load(f)
+        timeline = MeasurementTimeline(run_dir)
+        timeline.start, timeline.stop, timeline.wall_clock_start = window['start'], window['stop'], window['wall_clock_start']
+        timeline.clock_sync = ClockSync.load(run_dir)
+        return timeline
+
+    @property
+    def duration(self) -> float:
+        self.__check_window()
+        return self.stop - self.start
+
+    @property
+    def wall_clock_offset(self) -> float:
+        """The offset of the time.time() clock to the time.monotonic() clock, e.g. to add a stream with wall clock
+        timestamps: `add_stream(name, samples, offset_in_s=-timeline.wall_clock_offset)`."""
+        self.__check_window()
+        return self.wall_clock_start - self.start
+
+    def add_stream(self, name: str, samples: np.ndarray, time_field: str = 'time', columns: Iterable[str] = None,
+                   offset_in_s: float = 0.0, host: str = None):
+        """Adds a stream of samples, a NumPy structured array (e.g. as loaded from the samples file of a profiler
+        plugin) with their time in `time_field`. The times are on the time.monotonic() clock, after adding
+        `offset_in_s`. For the samples of a host in `RunnerConfig.remote_clock_hosts`, the times are instead on the
+        wall clock of that host (in s since the epoch, after adding `offset_in_s`), and are converted using its
+        estimated clock offset and drift. By default, all other numeric fields are aligned."""
+        if samples.dtype.names is None or time_field not in samples.dtype.names:
+            raise BaseError(f"MeasurementTimeline: The samples of stream {name} have no field {time_field}")
+        if columns is None:
+            columns = [field for field in samples.dtype.names
+                       if field != time_field and np.issubdtype(samples.dtype[field], np.number)]
+
+        order = np.argsort(samples[time_field], kind='stable')
+        times = samples[time_field][order].astype(np.float64) + offset_in_s
+        if host is not None:
+            if self.clock_sync is None:
+                raise BaseError(f"MeasurementTimeline: No clock offsets were estimated for {host} "
+                                f"(see RunnerConfig.remote_clock_hosts)")
+            times = self.clock_sync.to_local(host, times)
+        self.__streams[name] = (times, {column: samples[column][order].astype(np.float64) for column in columns})
+
+    def trim(self, name: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """The times and the columns of the samples of a stream within the measurement window."""
+        self.__check_window()
+        times, columns = self.__streams[name]
+        in_window = (times >= self.start) & (times <= self.stop)
+        return times[in_window], {column: values[in_window] for column, values in columns.items()}
+
+    def align(self, interval_in_s: float = 0.1, method: str = 'linear') -> np.ndarray:
+        """Resamples all streams to a common grid with `interval_in_s`, from the start until the stop of the
+        measurement. Returns a structured array with the time since the start, and a '<stream>__<column>' field per
+        column, which is NaN where the grid lies outside of the samples of the stream. With the 'linear' method,
+        the samples are interpolated linearly, with 'previous', the most recent sample holds (e.g. for counters, or
+        a sample that is the average over the preceding interval)."""
+        self.__check_window()
+        if interval_in_s <= 0:
+            raise BaseError("MeasurementTimeline: The interval must be positive!")
+        if method not in MeasurementTimeline.METHODS:
+            raise BaseError(f"MeasurementTimeline: Unknown method {method}, use one of {MeasurementTimeline.METHODS}")
+
+        offsets = np.arange(0, self.duration + interval_in_s / 2, interval_in_s)
+        grid = self.start + offsets
+        fields = [(f'{name}__{column}', '<f8') for name, (_, columns) in self.__streams.items() for column in columns]
+        aligned = np.zeros(len(grid), dtype=[('time', '<f8')] + fields)
+        aligned['time'] = offsets
+
+        for name, (times, columns) in self.__streams.items():
+            if len(times) == 0:
+                for column in columns:
+                    aligned[f'{name}__{column}'] = np.nan
+                continue
+            outside = (grid < times[0]) | (grid > times[-1])
+            if method == 'previous':
+                previous = np.clip(np.searchsorted(times, grid, side='right') - 1, 0, len(times) - 1)
+            for column, values in columns.items():
+                if method == 'linear':
+                    resampled = np.interp(grid, times, values)
+                else:
+                    resampled = values[previous]
+                resampled[outside] = np.nan
+                aligned[f'{name}__{column}'] = resampled
+        return aligned
+
+    def save(self, interval_in_s: float = 0.1, method: str = 'linear') -> np.ndarray:
+        """Aligns the streams, and stores the result in the ALIGNED_FILE of the run directory."""
+        aligned = self.align(interval_in_s, method)
+        np.save(self.run_dir / MeasurementTimeline.ALIGNED_FILE, aligned)
+        return aligned
+
+    def aggregate(self) -> Dict[str, float]:
+        """The mean, min and max of each column over its samples within the measurement window (e.g. 'ps__cpu__mean')."""
+        aggregates = dict()
+        for name in self.__streams:
+            _, columns = self.trim(name)
+            for column, values in columns.items():
+                if len(values) == 0:
+                    continue
+                aggregates[f'{name}__{column}__mean'] = float(np.mean(values))
+                aggregates[f'{name}__{column}__min'] = float(np.min(values))
+                aggregates[f'{name}__{column}__max'] = float(np.max(values))
+        return aggregates
+
+    def __check_window(self):
+        if self.start is None or self.stop is None:
+            raise BaseError("MeasurementTimeline: The measurement window has not been recorded (yet)")
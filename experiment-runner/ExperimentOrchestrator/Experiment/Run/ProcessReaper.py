@@ -0,0 +1,149 @@
+import os
+import time
+import ctypes
+import ctypes.util
+from typing import Callable, List, Set, Tuple
+
+import psutil
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+def run_in_new_process_group(target: Callable):
+    """Entry point of the run process: the run and all processes it starts (unless they change it themselves)
+    share a process group, which is killed as a whole at the end of the run."""
+    os.setpgid(0, 0)
+    target()
+
+
+###     =========================================================
+###     |                                                       |
+###     |                     ProcessReaper                     |
+###     |       - Kill the processes left behind by a run       |
+###     |         (e.g. a crashed hook, or a timeout), such     |
+###     |         that they cannot skew the next run            |
+###     |       - The runner becomes a child subreaper, such    |
+###     |         that orphaned descendants remain trackable    |
+###     |       - Verify that the system is idle before the     |
+###     |         next measurement                              |
+###     |                                                       |
+###     =========================================================
+class ProcessReaper:
+    PR_SET_CHILD_SUBREAPER = 36
+    TERMINATE_GRACE_PERIOD_IN_S = 3
+
+    def __init__(self):
+        self.__preexisting: Set[Tuple[int, float]] = set()
+        if not ProcessReaper.become_child_subreaper():
+            output.console_log_WARNING("ProcessReaper: Could not become a child subreaper, orphaned processes of a run "
+                                       "are only found through its process group")
+
+    @staticmethod
+    def become_child_subreaper() -> bool:
+        """Orphaned descendants are re-parented to this process instead of init (Linux >= 3.4)."""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            return libc.prctl(ProcessReaper.PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0
+        except (OSError, AttributeError, TypeError):
+            return False
+
+    @staticmethod
+    def __process_key(process: psutil.Process) -> Tuple[int, float]:
+        # The creation time distinguishes a process from a later one that reuses its pid
+        try:
+            return process.pid, process.create_time()
+        except psutil.Error:
+            return process.pid, 0.0
+
+    @staticmethod
+    def __describe(process: psutil.Process) -> str:
+        try:
+            return f"{process.pid} ({' '.join(process.cmdline()) or process.name()})"
+        except psutil.Error:
+            return str(process.pid)
+
+    @staticmethod
+    def __descendants() -> List[psutil.Process]:
+        try:
+            return psutil.Process().children(recursive=True)
+        except psutil.Error:
+            return []
+
+    def snapshot(self):
+        """Remembers the processes that exist before a run (e.g. started in before_experiment), which are left alone."""
+        self.__preexisting = set(map(ProcessReaper.__process_key, ProcessReaper.__descendants()))
+
+    def find_leftovers(self, process_group: int = None) -> List[psutil.Process]:
+        leftovers = {process.pid: process for process in ProcessReaper.__descendants()
+                     if ProcessReaper.__process_key(process) not in self.__preexisting}
+
+        if process_group is not None:
+            for process in psutil.process_iter():
+                try:
+                    if process.pid != os.getpid() and os.getpgid(process.pid) == process_group:
+                        leftovers.setdefault(process.pid, process)
+                except (OSError, psutil.Error):
+                    continue
+
+        return list(leftovers.values())
+
+    def reap(self, process_group: int = None):
+        """Terminates (and if needed, kills) all processes started since the snapshot, and those in `process_group`."""
+        leftovers = self.find_leftovers(process_group)
+        if not leftovers:
+            return
+
+        output.console_log_WARNING(f"ProcessReaper: Terminating {len(leftovers)} leftover processes: "
+                                   f"{', '.join(map(ProcessReaper.__describe, leftovers))}")
+        for process in leftovers:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(leftovers, timeout=ProcessReaper.TERMINATE_GRACE_PERIOD_IN_S)
+
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        _, alive = psutil.wait_procs(alive, timeout=ProcessReaper.TERMINATE_GRACE_PERIOD_IN_S)
+
+        alive = [process for process in alive if process.is_running() and process.status() != psutil.STATUS_ZOMBIE]
+        if alive:
+            raise BaseError(f"ProcessReaper: Could not kill the leftover processes "
+                            f"{', '.join(map(ProcessReaper.__describe, alive))}, which would skew the next runs!")
+
+    @staticmethod
+    def wait_until_idle(cpu_threshold_percent: float, timeout_in_ms: int, interval_in_s: float = 1.0) -> bool:
+        """Waits until the system-wide CPU utilization drops to `cpu_threshold_percent`.
+        Returns False (and reports the top CPU consumers) if the system is not idle within `timeout_in_ms`."""
+        deadline = time.monotonic() + timeout_in_ms / 1000
+        while True:
+            processes = list(psutil.process_iter())
+            for process in processes:
+                try:
+                    process.cpu_percent(None)
+                except psutil.Error:
+                    pass
+            utilization = psutil.cpu_percent(interval=interval_in_s)
+            if utilization <= cpu_threshold_percent:
+                return True
+
+            consumers = []
+            for process in processes:
+                try:
+                    consumers.append((process.cpu_percent(None), process))
+                except psutil.Error:
+                    continue
+            consumers.sort(key=lambda consumer: consumer[0], reverse=True)
+            top_consumers = ', '.join(f"{ProcessReaper.__describe(process)}: {usage:.0f}%"
+                                      for usage, process in consumers[:3] if usage > 0)
+
+            if time.monotonic() >= deadline:
+                output.console_log_FAIL(f"ProcessReaper: The system is not idle ({utilization:.0f}% CPU), "
+                                        f"continuing anyway. Top CPU consumers: {top_consumers}")
+                return False
+            output.console_log_WARNING(f"ProcessReaper: Waiting for the system to become idle ({utilization:.0f}% CPU). "
+                                       f"Top CPU consumers: {top_consumers}")
@@ -0,0 +1,213 @@
+import json
+import time
+import socket
+import operator
+import urllib.request
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import psutil
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConnectionHandler import ConnectionHandler
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class ReadinessTimeoutError(BaseError):
+    """A probe did not succeed before the deadline."""
+
+
+class Probe(ABC):
+    """Checks whether (a part of) the system under test is ready. A check that raises is not ready (yet)."""
+
+    @abstractmethod
+    def check(self) -> bool:
+        pass
+
+    @abstractmethod
+    def describe(self) -> str:
+        pass
+
+
+class CommandProbe(Probe):
+    """Ready once `command` exits with status 0, on the host (see `ConnectionHandler`), or locally."""
+
+    def __init__(self, command: str, host_name: str = ConnectionHandler.LOCAL_HOST, timeout_in_s: float = 10):
+        self.command = command
+        self.host_name = host_name
+        self.timeout_in_s = timeout_in_s
+
+    def check(self) -> bool:
+        return ConnectionHandler(self.host_name).run(self.command, self.timeout_in_s).ok
+
+    def describe(self) -> str:
+        return f"'{self.command}' succeeds on {self.host_name}"
+
+
+class OutputProbe(Probe):
+    """Ready once the (numeric) output of `command` compares to `threshold`, e.g. `docker ps | wc -l` >= 68."""
+    COMPARISONS = {'>=': operator.ge, '>': operator.gt, '<=': operator.le, '<': operator.lt, '==': operator.eq}
+
+    def __init__(self, command: str, threshold: float, comparison: str = '>=',
+                 host_name: str = ConnectionHandler.LOCAL_HOST, timeout_in_s: float = 10):
+        if comparison not in OutputProbe.COMPARISONS:
+            raise BaseError(f"OutputProbe: Unknown comparison {comparison}, use one of {list(OutputProbe.COMPARISONS)}")
+        self.command = command
+        self.threshold = threshold
+        self.comparison = comparison
+        self.host_name = host_name
+        self.timeout_in_s = timeout_in_s
+
+    def check(self) -> bool:
+        result = ConnectionHandler(self.host_name).run(self.command, self.timeout_in_s)
+        return result.ok and OutputProbe.COMPARISONS[self.comparison](float(result.stdout.strip()), self.threshold)
+
+    def describe(self) -> str:
+        return f"the output of '{self.command}' on {self.host_name} {self.comparison} {self.threshold}"
+
+
+class TcpProbe(Probe):
+    """Ready once a TCP connection to `host`:`port` is accepted."""
+
+    def __init__(self, host: str, port: int, timeout_in_s: float = 1):
+        self.host = host
+        self.port = port
+        self.timeout_in_s = timeout_in_s
+
+    def check(self) -> bool:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout_in_s):
+            return True
+
+    def describe(self) -> str:
+        return f"{self.host}:{self.port} accepts connections"
+
+
+class HttpProbe(Probe):
+    """Ready once a GET request of `url` returns a status in `statuses` (by default any 2xx)."""
+
+    def __init__(self, url: str, statuses: Iterable[int] = range(200, 300), timeout_in_s: float = 5):
+        self.url = url
+        self.statuses = statuses
+        self.timeout_in_s = timeout_in_s
+
+    def check(self) -> bool:
+        with urllib.request.urlopen(self.url, timeout=self.timeout_in_s) as response:
+            return response.status in self.statuses
+
+    def describe(self) -> str:
+        return f"{self.url} is healthy"
+
+
+class ProcessProbe(Probe):
+    """Ready once a (local) process, by `pid` or by `name`, runs, and has used at least `min_cpu_time_in_s`."""
+
+    def __init__(self, pid: int = None, name: str = None, min_cpu_time_in_s: float = 0.0):
+        if (pid is None) == (name is None):
+            raise BaseError("ProcessProbe: Either the pid or the name of the process is required")
+        self.pid = pid
+        self.name = name
+        self.min_cpu_time_in_s = min_cpu_time_in_s
+
+    def check(self) -> bool:
+        if self.pid is not None:
+            processes = [psutil.Process(self.pid)]
+        else:
+            processes = [process for process in psutil.process_iter(['name']) if process.info['name'] == self.name]
+        for process in processes:
+            if process.status() == psutil.STATUS_ZOMBIE:
+                continue
+            cpu_times = process.cpu_times()
+            if cpu_times.user + cpu_times.system >= self.min_cpu_time_in_s:
+                return True
+        return False
+
+    def describe(self) -> str:
+        return f"process {self.pid if self.pid is not None else self.name} runs"
+
+
+class FileProbe(Probe):
+    """Ready once the file at `path` exists (with at least `min_size` bytes), on the host or locally."""
+
+    def __init__(self, path: str, min_size: int = 0, host_name: str = ConnectionHandler.LOCAL_HOST):
+        self.path = path
+        self.min_size = min_size
+        self.host_name = host_name
+
+    def check(self) -> bool:
+        sftp = ConnectionHandler(self.host_name).open_sftp()
+        try:
+            return sftp.stat(self.path).st_size >= self.min_size
+        finally:
+            sftp.close()
+
+    def describe(self) -> str:
+        return f"{self.path} exists on {self.host_name}"
+
+
+###     =========================================================
+###     |                                                       |
+###     |                       Readiness                       |
+###     |       - Polls probes until the system under test is   |
+###     |         ready, instead of sleeping for a fixed time   |
+###     |       - Backs off exponentially, up to a deadline     |
+###     |       - Records the time to ready of each wait        |
+###     |                                                       |
+###     =========================================================
+class Readiness:
+    READINESS_FILE = 'readiness.json'
+
+    def __init__(self, run_dir: Path):
+        self.run_dir = run_dir
+        self.waits: Dict[str, Dict] = dict()
+
+    @staticmethod
+    def data_columns(names: Iterable[str]) -> List[str]:
+        """The run table data columns of the named waits, to declare in `RunnerConfig.create_run_table_model`."""
+        return [f'readiness__{name}__time_to_ready_s' for name in names]
+
+    def wait(self, name: str, *probes: Probe, interval_in_s: float = 1.0, backoff: float = 2.0,
+             max_interval_in_s: float = 30.0, deadline_in_s: float = 600.0) -> float:
+        """Waits until all probes have succeeded, and returns the time this took. The probes are checked immediately,
+        and then after `interval_in_s`, which grows by a factor `backoff` after each check up to `max_interval_in_s`.
+        Raises a ReadinessTimeoutError if they have not all succeeded within `deadline_in_s`."""
+        if not probes:
+            raise BaseError("Readiness: At least one probe is required")
+        start = time.monotonic()
+        deadline = start + deadline_in_s
+        remaining = list(probes)
+        errors: Dict[Probe, str] = dict()
+        checks = 0
+
+        while True:
+            checks += 1
+            for probe in list(remaining):
+                try:
+                    ready = probe.check()
+                except Exception as e:
+                    ready, errors[probe] = False, f"{type(e).__name__}: {e}"
+                if ready:
+                    remaining.remove(probe)
+
+            now = time.monotonic()
+            if not remaining:
+                return self.__record(name, now - start, checks)
+            if now >= deadline:
+                self.__record(name, None, checks)
+                raise ReadinessTimeoutError(f"Readiness: {name} was not ready within {deadline_in_s}s, waiting for "
+                                            + ', '.join(probe.describe() + (f" ({errors[probe]})" if probe in errors else '')
+                                                        for probe in remaining))
+            time.sleep(min(interval_in_s, deadline - now))
+            interval_in_s = min(interval_in_s * backoff, max_interval_in_s)
+
+    def get_run_data(self) -> Dict[str, Optional[float]]:
+        return {Readiness.data_columns([name])[0]: wait['time_to_ready_s'] for name, wait in self.waits.items()}
+
+    def __record(self, name: str, time_to_ready: Optional[float], checks: int) -> Optional[float]:
+        self.waits[name] = {'time_to_ready_s': round(time_to_ready, 3) if time_to_ready is not None else None,
+                            'checks': checks}
+        with open(self.run_dir / Readiness.READINESS_FILE, 'w') as f:
+            json.dump(self.waits, f, indent=2)
+        if time_to_ready is not None:
+            output.console_log_OK(f"Readiness: {name} was ready after {time_to_ready:.3f}s ({checks} checks)")
+        return time_to_ready
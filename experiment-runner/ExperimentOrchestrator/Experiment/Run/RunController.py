@@ -3,11 +3,15 @@ from EventManager.Models.RunnerEvents import RunnerEvents
 from EventManager.EventSubscriptionController import EventSubscriptionController
 from ExperimentOrchestrator.Architecture.Processify import processify
 from ExperimentOrchestrator.Experiment.Run.IRunController import IRunController
+from ConnectionHandler import ConnectionHandler
 from ProgressManager.Output.OutputProcedure import OutputProcedure as output
 
 class RunController(IRunController):
     @processify
     def do_run(self):
+        if self.clock_sync:
+            self.clock_sync.measure_safely('start')
+
         # -- Start run
         output.console_log_WARNING("Calling start_run config hook")
         EventSubscriptionController.raise_event(RunnerEvents.START_RUN, self.run_context)
@@ -15,20 +19,30 @@ class RunController(IRunController):
         # -- Start measurement
         output.console_log_WARNING("... Starting measurement ...")
         EventSubscriptionController.raise_event(RunnerEvents.START_MEASUREMENT, self.run_context)
+        self.timeline.mark_start()  # all profilers are running
 
         # -- Start interaction
         output.console_log_WARNING("Calling interaction config hook")
         EventSubscriptionController.raise_event(RunnerEvents.INTERACT, self.run_context)
         output.console_log_OK("... Run completed ...")
 
+        if self.cpu_placement:
+            self.cpu_placement.verify()
+
         # -- Stop measurement
         output.console_log_WARNING("... Stopping measurement ...")
+        self.timeline.mark_stop()
         EventSubscriptionController.raise_event(RunnerEvents.STOP_MEASUREMENT, self.run_context)
 
         # -- Stop run
         output.console_log_WARNING("Calling stop_run config hook")
         EventSubscriptionController.raise_event(RunnerEvents.STOP_RUN, self.run_context)
 
+        if self.clock_sync:
+            self.clock_sync.measure_safely('end')
+            self.clock_sync.close()
+            self.clock_sync.save(self.run_dir)
+
         # -- Collect data from measurements
         output.console_log_WARNING("Calling populate_run_data config hook")
         user_run_data = EventSubscriptionController.raise_event(RunnerEvents.POPULATE_RUN_DATA, self.run_context)
@@ -40,5 +54,17 @@ class RunController(IRunController):
         else:
             updated_run_data = self.run_context.run_variation
 
+        if self.cpu_placement:
+            updated_run_data = {**updated_run_data, **self.cpu_placement.get_run_data()}
+        if self.clock_sync:
+            updated_run_data = {**updated_run_data, **self.clock_sync.get_run_data()}
+        # The time to ready of the waits that have a data column (see `Readiness.data_columns`)
+        data_columns = self.config.run_table_model.get_data_columns()
+        updated_run_data = {**updated_run_data, **{k: v for k, v in self.readiness.get_run_data().items()
+                                                   if k in data_columns}}
+
         updated_run_data['__done'] = RunProgress.DONE
         self.data_manager.update_row_data(updated_run_data)
+
+        # The connections opened by the hooks of this run (process)
+        ConnectionHandler.close_all()
@@ -0,0 +1,126 @@
+import random
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class BayesianOptimization(Scheduler):
+    LENGTH_SCALES = [0.1, 0.2, 0.5, 1.0, 2.0]
+    NOISE_LEVELS = [1e-4, 1e-2, 1e-1]
+
+    def __init__(self, objective: str, minimize: bool = True, max_runs: int = None, initial_runs: int = 5,
+                 min_expected_improvement: float = 0.01, seed: int = 0):
+        """Searches the variation that minimizes (or maximizes) the `objective` data column with a Gaussian process
+        surrogate (Matern 5/2 kernel) and the expected improvement acquisition function.
+        After `initial_runs` randomly chosen variations, the variation with the highest expected improvement is run next.
+        The search ends after `max_runs` completed runs, or once the highest expected improvement (relative to the
+        standard deviation of the observed objective values) drops below `min_expected_improvement`.
+        Numeric factors are scaled to [0, 1], other factors are one-hot encoded."""
+        super().__init__()
+        if initial_runs < 1:
+            raise BaseError("BayesianOptimization requires at least one initial run!")
+        if max_runs is not None and max_runs < initial_runs:
+            raise BaseError("The max_runs of BayesianOptimization must be at least its initial_runs!")
+
+        self.__objective = objective
+        self.__sign = 1 if minimize else -1
+        self.__max_runs = max_runs
+        self.__initial_runs = initial_runs
+        self.__min_expected_improvement = min_expected_improvement
+        self.__rng = random.Random(seed)
+        self.__encodings: List[Dict[str, List[float]]] = []
+        self.__observations: List[Tuple[List[float], float]] = []
+
+    def setup(self, run_table_model: RunTableModel, run_table: List[Dict]):
+        super().setup(run_table_model, run_table)
+        if self.__objective not in run_table_model.get_data_columns():
+            raise BaseError(f"The objective {self.__objective} of BayesianOptimization must be a data column!")
+
+        self.__encodings = []
+        for factor in run_table_model.get_factors():
+            levels = factor.treatments
+            if all(isinstance(t, (int, float)) and not isinstance(t, bool) for t in levels):
+                low, high = min(levels), max(levels)
+                scale = (high - low) if high != low else 1
+                self.__encodings.append({str(t): [(t - low) / scale] for t in levels})
+            else:
+                self.__encodings.append({str(t): [1.0 if i == j else 0.0 for j in range(len(levels))]
+                                         for i, t in enumerate(levels)})
+
+    def encode(self, variation: Dict) -> List[float]:
+        return [x for encoding, level in zip(self.__encodings, self.treatment_key(variation)) for x in encoding[level]]
+
+    def observe(self, variation: Dict):
+        value = self.data_column_value(variation, self.__objective)
+        if value is not None:
+            self.__observations.append((self.encode(variation), self.__sign * value))
+
+    def next_variation(self, candidates: List[Dict]) -> Optional[Dict]:
+        if not candidates:
+            return None
+        if self.__max_runs is not None and len(self.__observations) >= self.__max_runs:
+            output.console_log_OK(f"BayesianOptimization: budget of {self.__max_runs} runs reached")
+            return None
+        if len(self.__observations) < self.__initial_runs:
+            return self.__rng.choice(candidates)
+
+        # Repetitions of the same treatment levels share their encoding, only the first candidate of each is considered
+        unique_candidates = dict()
+        for candidate in candidates:
+            unique_candidates.setdefault(self.treatment_key(candidate), candidate)
+        unique_candidates = list(unique_candidates.values())
+        expected_improvement = self.expected_improvement(np.array([self.encode(c) for c in unique_candidates]))
+        best = int(np.argmax(expected_improvement))
+        if expected_improvement[best] < self.__min_expected_improvement:
+            output.console_log_OK(f"BayesianOptimization: converged, the highest expected improvement is "
+                                  f"{expected_improvement[best]:.4f}")
+            return None
+        return unique_candidates[best]
+
+    def expected_improvement(self, candidates: np.ndarray) -> np.ndarray:
+        """The expected improvement over the best observation, in units of the standard deviation of the observations."""
+        x = np.array([x for x, _ in self.__observations])
+        y = np.array([y for _, y in self.__observations])
+        std = y.std() if y.std() > 0 else 1.0
+        y = (y - y.mean()) / std
+
+        mean, sd = BayesianOptimization.__gp_posterior(x, y, candidates)
+        improvement = y.min() - mean
+        z = improvement / sd
+        normal = NormalDist()
+        cdf = np.array([normal.cdf(v) for v in z])
+        pdf = np.array([normal.pdf(v) for v in z])
+        return improvement * cdf + sd * pdf
+
+    @staticmethod
+    def __kernel(a: np.ndarray, b: np.ndarray, length_scale: float) -> np.ndarray:
+        r = np.sqrt(np.maximum(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2), 0)) / length_scale
+        return (1 + np.sqrt(5) * r + 5 / 3 * r ** 2) * np.exp(-np.sqrt(5) * r)
+
+    @staticmethod
+    def __gp_posterior(x: np.ndarray, y: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # The hyperparameters maximize the log marginal likelihood over a small grid
+        fit = None
+        for length_scale in BayesianOptimization.LENGTH_SCALES:
+            for noise in BayesianOptimization.NOISE_LEVELS:
+                k = BayesianOptimization.__kernel(x, x, length_scale) + noise * np.eye(len(x))
+                try:
+                    cholesky = np.linalg.cholesky(k)
+                except np.linalg.LinAlgError:
+                    continue
+                alpha = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, y))
+                log_likelihood = -0.5 * y @ alpha - np.log(np.diag(cholesky)).sum()
+                if fit is None or log_likelihood > fit[0]:
+                    fit = (log_likelihood, length_scale, cholesky, alpha)
+
+        _, length_scale, cholesky, alpha = fit
+        k_star = BayesianOptimization.__kernel(candidates, x, length_scale)
+        v = np.linalg.solve(cholesky, k_star.T)
+        variance = np.maximum(1 - (v ** 2).sum(axis=0), 1e-12)
+        return k_star @ alpha, np.sqrt(variance)
@@ -0,0 +1,113 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
+from ExperimentOrchestrator.Misc.OnlineStatistics import chi2_critical_value, t_critical_value
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+def average_ranks(values: List[float]) -> List[float]:
+    """The ranks (starting at 1) of `values`, tied values receive the average of their ranks."""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def friedman_dominated(blocks: List[List[float]], confidence_level: float) -> List[int]:
+    """The treatments (column indices of `blocks`) that are significantly worse (higher) than the best treatment,
+    according to the Friedman test followed by its post-hoc pairwise comparisons (Conover, 1999), as in F-race."""
+    n, k = len(blocks), len(blocks[0])
+    if n < 2 or k < 2:
+        return []
+
+    ranks = [average_ranks(block) for block in blocks]
+    rank_sums = [sum(block_ranks[j] for block_ranks in ranks) for j in range(k)]
+    sum_of_squares = sum(r ** 2 for block_ranks in ranks for r in block_ranks) - n * k * (k + 1) ** 2 / 4
+    if sum_of_squares <= 0:
+        return []  # all treatments are tied in every block
+
+    statistic = (k - 1) * sum((r - n * (k + 1) / 2) ** 2 for r in rank_sums) / sum_of_squares
+    if statistic <= chi2_critical_value(confidence_level, k - 1):
+        return []
+
+    dof = (n - 1) * (k - 1)
+    difference = t_critical_value(confidence_level, dof) * \
+                 math.sqrt(max(2 * n * (1 - statistic / (n * (k - 1))) * sum_of_squares / dof, 0))
+    best = min(rank_sums)
+    return [j for j in range(k) if rank_sums[j] - best > difference]
+
+
+class Racing(Scheduler):
+
+    def __init__(self, objective: str, minimize: bool = True, confidence_level: float = 0.95, first_test: int = 5):
+        """Races the treatment levels against each other on the `objective` data column (F-race, Birattari et al. 2002).
+        The repetitions are interleaved in rounds: one repetition of every remaining treatment level per round.
+        From round `first_test` on, the treatment levels that are dominated according to the Friedman test (and its
+        post-hoc comparisons) at `confidence_level` are eliminated, and their remaining repetitions are SKIPPED.
+        The race ends when a single treatment level remains, or when the repetitions are exhausted."""
+        super().__init__()
+        if first_test < 2:
+            raise BaseError("Racing requires at least two rounds before the first test!")
+        if not 0 < confidence_level < 1:
+            raise BaseError("The confidence level of Racing must be between 0 and 1!")
+
+        self.__objective = objective
+        self.__sign = 1 if minimize else -1
+        self.__confidence_level = confidence_level
+        self.__first_test = first_test
+        self.__observations: Dict[Tuple, List[float]] = dict()
+        self.__survivors: List[Tuple] = []
+        self.__tested_rounds = 0
+
+    def setup(self, run_table_model: RunTableModel, run_table: List[Dict]):
+        super().setup(run_table_model, run_table)
+        if self.__objective not in run_table_model.get_data_columns():
+            raise BaseError(f"The objective {self.__objective} of Racing must be a data column!")
+        # Baseline runs are no treatment level (they are not scheduled, nor observed)
+        self.__survivors = list(dict.fromkeys(self.treatment_key(variation) for variation in run_table
+                                              if not BaselineModel.is_baseline_run(variation)))
+
+    def observe(self, variation: Dict):
+        value = self.data_column_value(variation, self.__objective)
+        if value is not None:
+            self.__observations.setdefault(self.treatment_key(variation), []).append(self.__sign * value)
+
+    def __rounds(self, key: Tuple) -> int:
+        return len(self.__observations.get(key, []))
+
+    def dismiss(self, candidates: List[Dict]) -> List[Dict]:
+        candidate_keys = set(self.treatment_key(c) for c in candidates)
+        rounds = min((self.__rounds(key) for key in self.__survivors if key in candidate_keys), default=0)
+
+        if rounds >= self.__first_test and rounds > self.__tested_rounds:
+            self.__tested_rounds = rounds
+            # Only the treatment levels that completed all rounds take part (the others have failed runs)
+            contenders = [key for key in self.__survivors if self.__rounds(key) >= rounds]
+            blocks = [[self.__observations[key][i] for key in contenders] for i in range(rounds)]
+            dominated = [contenders[j] for j in friedman_dominated(blocks, self.__confidence_level)]
+            if dominated:
+                self.__survivors = [key for key in self.__survivors if key not in dominated]
+                output.console_log_OK(f"Racing: eliminated {len(dominated)} dominated treatments after {rounds} rounds, "
+                                      f"{len(self.__survivors)} remaining")
+
+        return [c for c in candidates if self.treatment_key(c) not in self.__survivors]
+
+    def next_variation(self, candidates: List[Dict]) -> Optional[Dict]:
+        if len(self.__survivors) <= 1:
+            return None
+        pending = [c for c in candidates if self.treatment_key(c) in self.__survivors]
+        if not pending:
+            return None
+        # The treatment level that is the furthest behind runs next, such that the rounds are interleaved
+        return min(pending, key=lambda c: self.__rounds(self.treatment_key(c)))
@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+
+
+class Scheduler(ABC):
+    """Decides which variation of the run table is run next, based on the results observed so far.
+    Variations that are never chosen (once `next_variation` returns None) are marked as SKIPPED."""
+
+    def __init__(self):
+        self.run_table_model: Optional[RunTableModel] = None
+        self.run_table: List[Dict] = []
+
+    def setup(self, run_table_model: RunTableModel, run_table: List[Dict]):
+        """Invoked once before the experiment starts, with the complete run table."""
+        self.run_table_model = run_table_model
+        self.run_table = run_table
+
+    def treatment_key(self, variation: Dict) -> Tuple:
+        # Stored and generated variations are compared by the str() representation of their treatment levels
+        return tuple(str(variation[factor.factor_name]) for factor in self.run_table_model.get_factors())
+
+    @staticmethod
+    def data_column_value(variation: Dict, data_column: str) -> Optional[float]:
+        try:
+            return float(variation[data_column])
+        except (KeyError, TypeError, ValueError):
+            return None  # not (yet) populated
+
+    def observe(self, variation: Dict):
+        """Invoked with each completed (DONE) variation, including those completed before a restart."""
+        pass
+
+    def dismiss(self, candidates: List[Dict]) -> List[Dict]:
+        """Returns the `candidates` that will never be chosen, such that they can be marked as SKIPPED right away."""
+        return []
+
+    @abstractmethod
+    def next_variation(self, candidates: List[Dict]) -> Optional[Dict]:
+        """Returns one of the `candidates` (the TODO variations not yet attempted, in run table order)
+        to run next, or None to end the experiment."""
+        pass
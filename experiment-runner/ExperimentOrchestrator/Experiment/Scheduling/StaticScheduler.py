@@ -0,0 +1,10 @@
+from typing import Dict, List, Optional
+
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
+
+
+class StaticScheduler(Scheduler):
+    """Runs all variations in the order of the run table."""
+
+    def next_variation(self, candidates: List[Dict]) -> Optional[Dict]:
+        return candidates[0] if candidates else None
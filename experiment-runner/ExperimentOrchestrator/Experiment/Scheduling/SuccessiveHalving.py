@@ -0,0 +1,69 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Scheduling.Scheduler import Scheduler
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class SuccessiveHalving(Scheduler):
+
+    def __init__(self, objective: str, minimize: bool = True, min_repetitions: int = 1, eta: int = 3):
+        """Searches the variation that minimizes (or maximizes) the `objective` data column, spending the repetitions
+        of the run table on the most promising treatment levels. Suited to categorical factors, which have no
+        notion of distance between their treatment levels.
+        All treatment levels are first run `min_repetitions` times. Then only the best 1/`eta` of them (by their mean
+        objective value) are kept, and run `eta` times as often, until a single one remains or the repetitions
+        of the run table are exhausted."""
+        super().__init__()
+        if min_repetitions < 1:
+            raise BaseError("SuccessiveHalving requires at least one repetition per rung!")
+        if eta < 2:
+            raise BaseError("The eta of SuccessiveHalving must be at least 2!")
+
+        self.__objective = objective
+        self.__sign = 1 if minimize else -1
+        self.__min_repetitions = min_repetitions
+        self.__eta = eta
+        self.__observations: Dict[Tuple, List[float]] = dict()
+        self.__rung = 0
+
+    def setup(self, run_table_model: RunTableModel, run_table: List[Dict]):
+        super().setup(run_table_model, run_table)
+        if self.__objective not in run_table_model.get_data_columns():
+            raise BaseError(f"The objective {self.__objective} of SuccessiveHalving must be a data column!")
+
+    def observe(self, variation: Dict):
+        value = self.data_column_value(variation, self.__objective)
+        if value is not None:
+            self.__observations.setdefault(self.treatment_key(variation), []).append(self.__sign * value)
+
+    def __mean(self, key: Tuple) -> float:
+        values = self.__observations.get(key)
+        return sum(values) / len(values) if values else math.inf
+
+    def next_variation(self, candidates: List[Dict]) -> Optional[Dict]:
+        # The rungs are derived from the observations, such that a restarted experiment continues where it left off
+        max_repetitions = self.run_table_model.get_repetitions().max_repetitions
+        survivors = list(dict.fromkeys(self.treatment_key(variation) for variation in self.run_table
+                                       if not BaselineModel.is_baseline_run(variation)))
+        repetitions = self.__min_repetitions
+        rung = 0
+        while True:
+            repetitions = min(repetitions, max_repetitions)
+            pending = [c for c in candidates if self.treatment_key(c) in survivors
+                       and len(self.__observations.get(self.treatment_key(c), [])) < repetitions]
+            if pending:
+                if rung > self.__rung:
+                    self.__rung = rung
+                    output.console_log_OK(f"SuccessiveHalving: rung {rung}, {len(survivors)} treatments remaining")
+                # Interleave the repetitions of the surviving treatment levels
+                return min(pending, key=lambda c: len(self.__observations.get(self.treatment_key(c), [])))
+
+            if len(survivors) <= 1 or repetitions >= max_repetitions:
+                return None
+            survivors = sorted(survivors, key=self.__mean)[:math.ceil(len(survivors) / self.__eta)]
+            repetitions *= self.__eta
+            rung += 1
@@ -0,0 +1,64 @@
+from typing import Dict, List, Tuple
+
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ExperimentOrchestrator.Misc.OnlineStatistics import WelfordAccumulator
+
+
+###     =========================================================
+###     |                                                       |
+###     |                  SequentialStopping                   |
+###     |       - Keep online statistics of the stopping data   |
+###     |         columns per variation, updated after each     |
+###     |         run                                           |
+###     |       - Decide whether a variation needs further      |
+###     |         repetitions                                   |
+###     |                                                       |
+###     =========================================================
+class SequentialStopping:
+
+    def __init__(self, run_table_model: RunTableModel):
+        self.__factors = run_table_model.get_factors()
+        self.__repetitions = run_table_model.get_repetitions()
+        self.__statistics: Dict[Tuple, Dict[str, WelfordAccumulator]] = dict()
+        self.__completed_runs: Dict[Tuple, int] = dict()
+
+    def treatment_key(self, variation: Dict) -> Tuple:
+        # Stored and generated variations are compared by the str() representation of their treatment levels
+        return tuple(str(variation[factor.factor_name]) for factor in self.__factors)
+
+    def observe(self, variation: Dict):
+        """Update the statistics with the data columns of a completed run."""
+        key = self.treatment_key(variation)
+        self.__completed_runs[key] = self.__completed_runs.get(key, 0) + 1
+
+        statistics = self.__statistics.setdefault(key, dict())
+        for data_column in self.__repetitions.stopping_data_columns:
+            try:
+                value = float(variation[data_column])
+            except (TypeError, ValueError):
+                continue  # not (yet) populated
+            statistics.setdefault(data_column, WelfordAccumulator()).update(value)
+
+    def is_converged(self, variation: Dict) -> bool:
+        key = self.treatment_key(variation)
+        if self.__completed_runs.get(key, 0) < self.__repetitions.min_repetitions:
+            return False
+
+        statistics = self.__statistics.get(key, dict())
+        for data_column in self.__repetitions.stopping_data_columns:
+            accumulator = statistics.get(data_column)
+            if accumulator is None or accumulator.count < 2:
+                return False
+            if accumulator.mean == 0:
+                if accumulator.variance != 0:
+                    return False
+                continue
+            relative_ci_width = 2 * accumulator.ci_half_width(self.__repetitions.confidence_level) / abs(accumulator.mean)
+            if relative_ci_width > self.__repetitions.max_relative_ci_width:
+                return False
+        return True
+
+    def get_remaining_variations(self, variation: Dict, run_table: List[Dict]) -> List[Dict]:
+        """The variations in `run_table` that are further repetitions of the same treatment levels as `variation`."""
+        key = self.treatment_key(variation)
+        return [var for var in run_table if var is not variation and self.treatment_key(var) == key]
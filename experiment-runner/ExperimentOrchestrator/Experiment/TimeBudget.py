@@ -0,0 +1,77 @@
+import math
+import time
+from typing import Dict, List
+
+from ExperimentOrchestrator.Misc.OnlineStatistics import WelfordAccumulator
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+###     =========================================================
+###     |                                                       |
+###     |                      TimeBudget                       |
+###     |       - Keep track of the wall-clock time left for    |
+###     |         the experiment, and of the observed run       |
+###     |         durations                                     |
+###     |       - Restrict the runs to balanced rounds (one     |
+###     |         repetition of each treatment) that are        |
+###     |         expected to finish within the budget          |
+###     |                                                       |
+###     =========================================================
+class TimeBudget:
+
+    def __init__(self, budget_in_ms: int, time_between_runs_in_ms: int, factor_names: List[str]):
+        self.__budget = budget_in_ms / 1000
+        self.__cooldown = time_between_runs_in_ms / 1000
+        self.__factor_names = factor_names
+        self.__durations = WelfordAccumulator()
+        self.__deadline = None
+
+    def start(self):
+        self.__deadline = time.monotonic() + self.__budget
+        output.console_log_WARNING(f"Time budget: {self.__budget:.0f}s")
+
+    @property
+    def remaining(self) -> float:
+        return self.__deadline - time.monotonic()
+
+    def record_run(self, duration: float):
+        self.__durations.update(duration)
+
+    def estimate_run(self) -> float:
+        """A conservative estimate of the duration of the next run, including its cooldown."""
+        if self.__durations.count == 0:
+            return 0
+        if self.__durations.count == 1:
+            return 1.5 * self.__durations.mean + self.__cooldown
+        return self.__durations.mean + 2 * math.sqrt(self.__durations.variance) + self.__cooldown
+
+    def __treatment_key(self, variation: Dict):
+        return tuple(str(variation[factor_name]) for factor_name in self.__factor_names)
+
+    def select_candidates(self, candidates: List[Dict], run_table: List[Dict]) -> List[Dict]:
+        """The candidates of the treatments with the fewest runs, if they are expected to finish within the budget.
+        A new round (one more repetition of every treatment) is only started if the complete round fits,
+        such that the repetitions remain balanced when the budget runs out."""
+        candidate_keys = set(self.__treatment_key(c) for c in candidates)
+        if not candidate_keys:
+            return []
+
+        # The runs performed (or attempted) so far of each treatment that still has candidates
+        candidate_run_ids = set(c['__run_id'] for c in candidates)
+        progress = {key: 0 for key in candidate_keys}
+        for variation in run_table:
+            key = self.__treatment_key(variation)
+            if key in progress and variation['__done'] != RunProgress.SKIPPED and variation['__run_id'] not in candidate_run_ids:
+                progress[key] += 1
+
+        fewest = min(progress.values())
+        round_candidates = [c for c in candidates if progress[self.__treatment_key(c)] == fewest]
+        runs = len(set(self.__treatment_key(c) for c in round_candidates)) \
+            if all(p == fewest for p in progress.values()) else 1
+
+        if runs * self.estimate_run() > self.remaining:
+            output.console_log_WARNING(f"Time budget: {runs} more runs are estimated to take "
+                                       f"{runs * self.estimate_run():.1f}s, but only {max(self.remaining, 0):.1f}s remain")
+            return []
+        return round_candidates
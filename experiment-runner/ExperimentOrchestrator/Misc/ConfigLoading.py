@@ -0,0 +1,40 @@
+import sys
+import ast
+import hashlib
+from types import ModuleType
+from importlib import util
+
+import dill
+
+
+def load_config_file_as_module(config_path: str) -> ModuleType:
+    module_name = config_path.split('/')[-1].replace('.py', '')
+    spec = util.spec_from_file_location(module_name, config_path)
+    config_file = util.module_from_spec(spec)
+    sys.modules[module_name] = config_file
+    spec.loader.exec_module(config_file)
+    return config_file
+
+def calc_ast_md5sum(src, name):
+    tree = compile(src, name, 'exec', flags=ast.PyCF_ONLY_AST, optimize=0)
+
+    for node in ast.walk(tree):
+        # Ignores empty lines and comment only lines
+        if hasattr(node, 'lineno'):
+            setattr(node, 'lineno', 0)
+        if hasattr(node, 'col_offset'):
+            setattr(node, 'col_offset', 0)
+        if hasattr(node, 'end_lineno'):
+            setattr(node, 'end_lineno', 0)
+        if hasattr(node, 'end_col_offset'):
+            setattr(node, 'end_col_offset', 0)
+
+        # Ignore docstring
+        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module)) and ast.get_docstring(node) is not None:
+            docstring_node = node.body[0].value
+            if isinstance(docstring_node, ast.Str):
+                docstring_node.s = ''
+            elif isinstance(docstring_node, ast.Constant) and isinstance(docstring_node.value, str):
+                docstring_node.value = ''
+
+    return hashlib.md5(dill.dumps(tree)).digest()
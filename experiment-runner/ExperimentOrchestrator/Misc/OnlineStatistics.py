@@ -0,0 +1,94 @@
+import math
+from statistics import NormalDist
+
+
+def t_two_sided_probability(t: float, dof: int) -> float:
+    '''
+    P(|T| <= t) for Student's t-distribution with an integer number of degrees of freedom,
+    by its closed form (Abramowitz & Stegun 26.7.3 and 26.7.4).
+    '''
+    theta = math.atan(t / math.sqrt(dof))
+    cos2 = math.cos(theta) ** 2
+    term, total = 1.0, 1.0
+    if dof % 2 == 1:
+        if dof == 1:
+            return 2 * theta / math.pi
+        for k in range(2, dof - 1, 2):
+            term *= cos2 * k / (k + 1)
+            total += term
+        return 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    for k in range(1, dof - 2, 2):
+        term *= cos2 * k / (k + 1)
+        total += term
+    return math.sin(theta) * total
+
+
+def t_critical_value(confidence_level: float, dof: int) -> float:
+    '''
+    Two-sided critical value of Student's t-distribution with `dof` degrees of freedom.
+
+    Exact for 1 and 2 degrees of freedom, otherwise `t_two_sided_probability` is inverted by
+    bisection (to ~1e-9).
+    '''
+    p = 1 - (1 - confidence_level) / 2
+    if dof == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if dof == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    # The normal quantile is a lower bound
+    low = NormalDist().inv_cdf(p)
+    high = 2 * low
+    while t_two_sided_probability(high, dof) < confidence_level:
+        low, high = high, 2 * high
+    while high - low > 1e-9:
+        middle = (low + high) / 2
+        if t_two_sided_probability(middle, dof) < confidence_level:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
+
+
+class WelfordAccumulator:
+    '''
+    Numerically stable, single-pass mean and variance (Welford's online algorithm).
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.__m2 = 0.0
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.__m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        if self.count < 2:
+            return math.nan
+        return self.__m2 / (self.count - 1)
+
+    def ci_half_width(self, confidence_level: float) -> float:
+        if self.count < 2:
+            return math.inf
+        return t_critical_value(confidence_level, self.count - 1) * math.sqrt(self.variance / self.count)
+
+
+def chi2_critical_value(confidence_level: float, dof: int) -> float:
+    '''
+    Upper critical value of the chi-squared distribution with `dof` degrees of freedom.
+
+    Exact for 1 and 2 degrees of freedom, otherwise the Wilson-Hilferty approximation is used,
+    which is accurate to within 1% for dof >= 3.
+    '''
+    if dof == 1:
+        return NormalDist().inv_cdf(1 - (1 - confidence_level) / 2) ** 2
+    if dof == 2:
+        return -2 * math.log(1 - confidence_level)
+
+    z = NormalDist().inv_cdf(confidence_level)
+    return dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
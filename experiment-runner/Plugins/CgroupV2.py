@@ -0,0 +1,185 @@
+import os
+import time
+import signal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+class ResourceFactors(Enum):
+    """Factors whose treatment levels are applied as cgroup v2 resource limits to the target. Treatment levels:
+      - CPU_QUOTA: the number of CPUs (e.g. 0.5 or 2), or 'max' for no limit (cpu.max)
+      - CPUSET: the CPUs the target may run on, e.g. '0-3' or [0, 2] (cpuset.cpus)
+      - MEMORY_MAX: the memory limit in bytes, e.g. 536870912 or '512M', or 'max' (memory.max)
+      - IO_MAX: a limit per device, e.g. '8:0 rbps=1048576 wiops=120', or a list of them (io.max)
+    """
+    CPU_QUOTA   = 'cpu'
+    CPUSET      = 'cpuset'
+    MEMORY_MAX  = 'memory'
+    IO_MAX      = 'io'
+
+    @property
+    def name(self) -> str:
+        return f'cgroup__{super().name.lower()}'
+
+    @property
+    def controller(self) -> str:
+        return self.value
+
+
+CPU_MAX_PERIOD_IN_US = 100000
+
+
+def _read(path: Path) -> str:
+    try:
+        return path.read_text()
+    except FileNotFoundError:
+        return ''
+
+
+def _write(path: Path, value: str):
+    with open(path, 'w') as f:
+        f.write(value)
+
+
+class RunCgroup:
+    """The cgroup of a single run. Only the processes added to it are limited, not the runner or the profilers."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def add(self, pid: int):
+        """Moves a running process (and its future children) into the cgroup."""
+        _write(self.path / 'cgroup.procs', str(pid))
+
+    def add_self(self):
+        """To be used as `preexec_fn` of `subprocess.Popen`, such that the target is limited from its very start."""
+        self.add(os.getpid())
+
+    def pids(self) -> List[int]:
+        return [int(pid) for pid in _read(self.path / 'cgroup.procs').split()]
+
+    def remove(self, timeout_in_s: float = 5):
+        """Kills the processes remaining in the cgroup, and removes it."""
+        if self.pids():
+            if (self.path / 'cgroup.kill').exists():
+                _write(self.path / 'cgroup.kill', '1')
+            else:
+                for pid in self.pids():
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+
+            deadline = time.monotonic() + timeout_in_s
+            while self.pids() and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+        try:
+            os.rmdir(self.path)
+        except OSError as e:
+            output.console_log_WARNING(f"CgroupV2: Could not remove the cgroup {self.path}: {e}")
+
+
+class CgroupV2:
+    DEFAULT_BASE_PATH = Path('/sys/fs/cgroup/experiment-runner')
+
+    def __init__(self, base_path: Path = DEFAULT_BASE_PATH):
+        """The run cgroups are created in `base_path`, which requires write access to it (e.g. run as root, or
+        delegate a cgroup with `systemd-run --user --scope -p Delegate=yes`). It must not contain processes itself."""
+        self.base_path = base_path
+
+    def __enable_controllers(self, controllers: List[str]):
+        # Controllers are only available to the run cgroups if they are enabled in the subtree_control of all ancestors
+        self.base_path.mkdir(exist_ok=True)
+        for path in [self.base_path.parent, self.base_path]:
+            available = _read(path / 'cgroup.controllers').split()
+            enabled = _read(path / 'cgroup.subtree_control').split()
+            for controller in controllers:
+                if controller in enabled:
+                    continue
+                if controller not in available:
+                    raise BaseError(f"CgroupV2: The {controller} controller is not available in {path}!")
+                try:
+                    _write(path / 'cgroup.subtree_control', f'+{controller}')
+                except OSError as e:
+                    raise BaseError(f"CgroupV2: Could not enable the {controller} controller in {path}: {e}")
+
+    def __remove_stale_cgroups(self):
+        # Left behind by runs that crashed before their cgroup was removed (removal fails if processes remain)
+        for path in self.base_path.iterdir():
+            if path.is_dir():
+                try:
+                    os.rmdir(path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def limit_files(factor: ResourceFactors, level: Any) -> Dict[str, List[str]]:
+        """The interface files (and the values written to them) that apply the treatment `level` of `factor`."""
+        if factor is ResourceFactors.CPU_QUOTA:
+            quota = 'max' if level in (None, 'max') else str(int(round(float(level) * CPU_MAX_PERIOD_IN_US)))
+            return {'cpu.max': [f'{quota} {CPU_MAX_PERIOD_IN_US}']}
+        if factor is ResourceFactors.CPUSET:
+            return {'cpuset.cpus': [level if isinstance(level, str) else ','.join(map(str, level))]}
+        if factor is ResourceFactors.MEMORY_MAX:
+            return {'memory.max': ['max' if level is None else str(level)]}
+        if factor is ResourceFactors.IO_MAX:
+            return {'io.max': [level] if isinstance(level, str) else list(level)}
+        raise BaseError(f"CgroupV2: Unknown resource factor {factor}")
+
+    def create_run_cgroup(self, name: str, limits: Dict[ResourceFactors, Any]) -> RunCgroup:
+        self.__enable_controllers(sorted(set(factor.controller for factor in limits)))
+        self.__remove_stale_cgroups()
+
+        path = self.base_path / name
+        path.mkdir(exist_ok=True)
+        for factor, level in limits.items():
+            for file, values in CgroupV2.limit_files(factor, level).items():
+                for value in values:  # e.g. io.max accepts a single device per write
+                    try:
+                        _write(path / file, value)
+                    except OSError as e:
+                        RunCgroup(path).remove()
+                        raise BaseError(f"CgroupV2: Could not apply {factor.name}={level} ({file}: {value}): {e}")
+        return RunCgroup(path)
+
+
+def resource_limits(cgroup_path: Union[Path, str] = CgroupV2.DEFAULT_BASE_PATH):
+    def resource_limits_decorator(cls: RunnerConfig.__class__):
+        cls.start_run   = create_run_cgroup(cgroup_path)(cls.start_run)
+        cls.stop_run    = remove_run_cgroup(cls.stop_run)
+
+        return cls
+    return resource_limits_decorator
+
+
+def create_run_cgroup(cgroup_path: Union[Path, str] = CgroupV2.DEFAULT_BASE_PATH):
+    def create_run_cgroup_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            factors = {factor.name: factor for factor in ResourceFactors}
+            limits = {factors[k]: v for k, v in context.run_variation.items() if k in factors}
+            self.cgroup = CgroupV2(Path(cgroup_path)).create_run_cgroup(context.run_variation['__run_id'], limits)
+            return func(*args, **kwargs)
+        return wrapper
+    return create_run_cgroup_decorator
+
+
+def remove_run_cgroup(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # Also when stop_run fails, the run cgroup must not be leaked
+            self.cgroup.remove()
+    return wrapper
@@ -5,11 +5,14 @@ from typing import Iterable
 
 import codecarbon
 import csv
+import dataclasses
 import re
 
 from ConfigValidator.Config.Models.RunnerContext import RunnerContext
 from ConfigValidator.Config.RunnerConfig import RunnerConfig
 
+EMISSIONS_FILE = 'emissions.csv'
+
 class DataColumns(Enum):
     """For the description of data columns, see
       1. https://mlco2.github.io/codecarbon/output.html#id2
@@ -33,6 +36,7 @@ def emission_tracker(online=False, *decargs, **deckwargs):
         data_columns =  deckwargs.pop('data_columns', [DataColumns.EMISSIONS])
 
         cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
+        cls.before_experiment       = create_emission_tracker(online=online, *decargs, **deckwargs)(cls.before_experiment)
         cls.start_measurement       = start_emission_tracker(online=online, *decargs, **deckwargs)(cls.start_measurement)
         cls.stop_measurement        = stop_emission_tracker(cls.stop_measurement)
         cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
@@ -40,30 +44,70 @@ def emission_tracker(online=False, *decargs, **deckwargs):
         return cls
     return emission_tracker_decorator
 
+def _create_tracker(self: RunnerConfig, online, decargs, deckwargs):
+    tracker_kwargs = {k: v for k, v in deckwargs.items() if k != 'output_dir'}  # the results are stored per run
+    if 'project_name' not in tracker_kwargs:
+        tracker_kwargs['project_name'] = self.name
+    codecarbon_cls = codecarbon.EmissionsTracker if online else codecarbon.OfflineEmissionsTracker
+
+    tracker = codecarbon_cls(*decargs, **tracker_kwargs)
+    # Detect the hardware (and the carbon intensity of its location) with a first task, outside of any measurement
+    tracker.start_task('experiment-runner-setup')
+    tracker.stop_task('experiment-runner-setup')
+    return tracker
+
+def create_emission_tracker(online=False, *decargs, **deckwargs):
+    """Creates a single tracker for the whole experiment. Each run (a process forked from the experiment)
+    inherits the detected hardware, and measures a lightweight task of the tracker."""
+    def create_emission_tracker_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            self.__emission_tracker__ = _create_tracker(self, online, decargs, deckwargs)
+            return func(*args, **kwargs)
+        return wrapper
+    return create_emission_tracker_decorator
+
 def start_emission_tracker(online=False, *decargs, **deckwargs):
     def start_emission_tracker_decorator(func):
         def wrapper(*args, **kwargs):
             self: RunnerConfig = args[0]
             context: RunnerContext = args[1]
 
-            if 'project_name' not in deckwargs:
-                deckwargs['project_name'] = self.name
-            if 'output_dir' not in deckwargs:
-                deckwargs['output_dir'] = str(context.run_dir.resolve())
-            codecarbon_cls = codecarbon.EmissionsTracker if online else codecarbon.OfflineEmissionsTracker
+            if getattr(self, '__emission_tracker__', None) is None:
+                # Not created before the experiment (see create_emission_tracker), detect the hardware now
+                self.__emission_tracker__ = _create_tracker(self, online, decargs, deckwargs)
+            self.__emission_output_dir__ = Path(deckwargs['output_dir']) if 'output_dir' in deckwargs else None
 
-            self.__emission_tracker__ = codecarbon_cls(*decargs, **deckwargs)
-            self.__emission_tracker__.start()
+            self.__emission_tracker__.start_task(context.run_variation['__run_id'] if context else None)
             return func(*args, **kwargs)
         return wrapper
     return start_emission_tracker_decorator
 
+def _write_emissions(path: Path, data: dict, append: bool = False):
+    # In the format of codecarbon's emissions.csv
+    write_header = not append or not path.exists() or path.stat().st_size == 0
+    with open(path, 'a' if append else 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=list(data.keys()))
+        if write_header:
+            writer.writeheader()
+        writer.writerow(data)
+
 def stop_emission_tracker(func):
     def wrapper(*args, **kwargs):
         self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
 
         ret_val = func(*args, **kwargs)
-        self.__emission_tracker__.stop()
+        self.__emission_data__ = self.__emission_tracker__.stop_task()
+
+        data = dataclasses.asdict(self.__emission_data__)
+        if context is not None:
+            # Stored per run, such that the run can be reprocessed
+            _write_emissions(context.run_dir.resolve() / EMISSIONS_FILE, data)
+        if self.__emission_output_dir__ is not None:
+            # The output_dir collects (a row per run) the emissions of the whole experiment
+            _write_emissions(self.__emission_output_dir__ / EMISSIONS_FILE, data, append=True)
         return ret_val
     return wrapper
 
@@ -82,18 +126,25 @@ def add_data_columns(data_cols: Iterable[DataColumns]):
 def populate_data_columns(func):
     def wrapper(*args, **kwargs):
         self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
 
         ret_val = func(*args, **kwargs)
         if ret_val is None:
             ret_val = {}
-        with open(Path(self.__emission_tracker__._output_dir) / Path(self.__emission_tracker__._output_file)) as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = [row for row in reader]
-            assert(len(rows) == 1)
-            data = rows[0]
-            for dc in self.run_table_model.get_data_columns():
-                m = DataColumns._PATTERN.value.match(dc)
-                if m:
-                    ret_val[dc] = float(data[m.group(2)])
+
+        emission_data = getattr(self, '__emission_data__', None)
+        if emission_data is not None:
+            data = dataclasses.asdict(emission_data)  # measured by this process
+        else:
+            # e.g. when reprocessing the run
+            with open(context.run_dir.resolve() / EMISSIONS_FILE) as csvfile:
+                rows = [row for row in csv.DictReader(csvfile)]
+                assert(len(rows) == 1)
+                data = rows[0]
+
+        for dc in self.run_table_model.get_data_columns():
+            m = DataColumns._PATTERN.value.match(dc)
+            if m:
+                ret_val[dc] = float(data[m.group(2)])
         return ret_val
     return wrapper
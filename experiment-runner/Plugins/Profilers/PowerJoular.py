@@ -0,0 +1,300 @@
+import time
+import signal
+import threading
+import subprocess
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+SAMPLE_DTYPE = np.dtype([
+    ('time',            '<f8'),  # time.monotonic() at which the row was read, i.e. the end of its interval
+    ('weight',          '<f8'),  # s, the part of the row's interval that lies within the measurement
+    ('cpu_utilization', '<f4'),
+    ('power',           '<f4'),  # W, the total power (the CPU power, for a process)
+    ('cpu_power',       '<f4'),  # W
+    ('gpu_power',       '<f4'),  # W, NaN when not reported
+])
+
+# The columns of the csv files of powerjoular, by the name of their header
+CSV_COLUMNS = {
+    'CPU Utilization':  'cpu_utilization',
+    'Total Power':      'power',
+    'CPU Power':        'cpu_power',
+    'GPU Power':        'gpu_power',
+}
+DEFAULT_HEADERS = {
+    5: ['Date', 'CPU Utilization', 'Total Power', 'CPU Power', 'GPU Power'],   # the whole system
+    3: ['Date', 'CPU Utilization', 'CPU Power'],                               # a process (-p)
+}
+
+
+class DataColumns(Enum):
+    """Aggregates of the powerjoular samples within the measurement."""
+    ENERGY              = 'power'               # J
+    CPU_ENERGY          = 'cpu_power'           # J
+    GPU_ENERGY          = 'gpu_power'           # J
+    AVG_POWER           = 'avg_power'           # W
+    AVG_CPU_UTILIZATION = 'cpu_utilization'     # as reported by powerjoular, i.e. a fraction
+
+    @property
+    def name(self) -> str:
+        return f'powerjoular__{super().name.lower()}'
+
+
+def window_weights(times: np.ndarray, sampling_interval_in_s: float, start: float, stop: float) -> np.ndarray:
+    """The overlap (s) of the interval of each row, i.e. (time - sampling_interval_in_s, time], with [start, stop]."""
+    overlap = np.minimum(times, stop) - np.maximum(times - sampling_interval_in_s, start)
+    return np.clip(overlap, 0, sampling_interval_in_s)
+
+
+class CsvTail:
+    """Incrementally reads the complete lines appended to a (possibly not yet existing) file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.__file = None
+        self.__partial_line = b''
+
+    def read_lines(self) -> List[str]:
+        if self.__file is None:
+            try:
+                self.__file = open(self.path, 'rb')
+            except FileNotFoundError:
+                return []
+        lines = (self.__partial_line + self.__file.read()).split(b'\n')
+        self.__partial_line = lines.pop()
+        return [line.decode().strip() for line in lines if line.strip()]
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class PowerJoular:
+    CSV_FILE = 'powerjoular.csv'
+    SAMPLES_FILE = 'powerjoular_samples.bin'
+
+    def __init__(self, output_dir: Path, pid: int = None, powerjoular_path: str = 'powerjoular',
+                 extra_args: Iterable[str] = (), sampling_interval_in_s: float = 1.0, poll_interval_in_s: float = 0.1,
+                 stop_timeout_in_s: float = 5):
+        """Runs powerjoular (for the process `pid`, or the whole system) in the background, writing its csv files to
+        `output_dir`. The csv file is tailed every `poll_interval_in_s` while powerjoular runs, such that each row is
+        parsed once, timestamped when it is read. As powerjoular writes a row per `sampling_interval_in_s`, with the
+        power over the preceding interval, only the part of each row that overlaps with the measurement (between
+        `start` and `stop`) is counted. `extra_args` are passed on to powerjoular, e.g. ['-l']."""
+        if poll_interval_in_s <= 0 or sampling_interval_in_s <= 0:
+            raise BaseError("PowerJoular: The sampling and poll intervals must be positive!")
+
+        self.output_dir = output_dir
+        self.pid = pid
+        self.command = [powerjoular_path, *extra_args, *(['-p', str(pid)] if pid is not None else []),
+                        '-f', str(output_dir / PowerJoular.CSV_FILE)]
+        self.sampling_interval_in_s = sampling_interval_in_s
+        self.poll_interval_in_s = poll_interval_in_s
+        self.stop_timeout_in_s = stop_timeout_in_s
+
+        self.__process: Optional[subprocess.Popen] = None
+        self.__tail: Optional[CsvTail] = None
+        self.__header: Optional[List[str]] = None
+        self.__rows: List[tuple] = []
+        self.__stop_event = threading.Event()
+        self.__tailer: Optional[threading.Thread] = None
+        self.__start_time = None
+
+    @property
+    def csv_file(self) -> Path:
+        # For a process, powerjoular writes its power to a separate "<file>-<pid>.csv"
+        if self.pid is not None:
+            return self.output_dir / f'{PowerJoular.CSV_FILE}-{self.pid}.csv'
+        return self.output_dir / PowerJoular.CSV_FILE
+
+    def start(self):
+        # powerjoular appends to existing files, e.g. of a previous attempt of the run
+        for csv_file in {self.output_dir / PowerJoular.CSV_FILE, self.csv_file}:
+            csv_file.unlink(missing_ok=True)
+
+        try:
+            self.__process = subprocess.Popen(self.command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise BaseError(f"PowerJoular: {self.command[0]} was not found (is powerjoular installed?)")
+
+        self.__tail = CsvTail(self.csv_file)
+        self.__header = None
+        self.__rows = []
+        self.__stop_event.clear()
+        self.__tailer = threading.Thread(target=self.__tail_periodically, daemon=True)
+        self.__tailer.start()
+        self.__start_time = time.monotonic()
+
+    def stop(self) -> np.ndarray:
+        """Stops powerjoular, and returns the samples within the measurement (which are also stored in the
+        SAMPLES_FILE of the output directory)."""
+        stop_time = time.monotonic()
+        # The rows written during the measurement are read now, before the time powerjoular takes to shut down
+        self.__stop_event.set()
+        self.__tailer.join()
+        self.__poll(received=stop_time)
+
+        exit_code = self.__process.poll()
+        if exit_code is None:
+            self.__process.send_signal(signal.SIGINT)  # powerjoular shuts down gracefully on SIGINT
+            try:
+                self.__process.wait(timeout=self.stop_timeout_in_s)
+            except subprocess.TimeoutExpired:
+                self.__process.kill()
+                self.__process.wait()
+        stderr = self.__process.stderr.read().decode(errors='replace').strip()
+        self.__process.stderr.close()
+
+        self.__poll()  # the rows written while powerjoular shut down
+        self.__tail.close()
+
+        if exit_code is not None:
+            raise BaseError(f"PowerJoular: powerjoular exited during the measurement with exit code {exit_code} "
+                            f"(it requires read access to the RAPL energy counters, e.g. run as root): {stderr}")
+
+        samples = np.array(self.__rows, dtype=SAMPLE_DTYPE)
+        samples['weight'] = window_weights(samples['time'], self.sampling_interval_in_s, self.__start_time, stop_time)
+        samples = samples[samples['weight'] > 0]
+        samples.tofile(self.output_dir / PowerJoular.SAMPLES_FILE)
+        return samples
+
+    def __tail_periodically(self):
+        while not self.__stop_event.wait(self.poll_interval_in_s):
+            self.__poll()
+
+    def __poll(self, received: float = None):
+        received = received if received is not None else time.monotonic()
+        for line in self.__tail.read_lines():
+            fields = line.split(',')
+            if fields[0] == 'Date':
+                self.__header = fields
+                continue
+            header = self.__header or DEFAULT_HEADERS.get(len(fields))
+            if header is None or len(fields) != len(header):
+                continue
+
+            row = dict.fromkeys(CSV_COLUMNS.values(), np.nan)
+            try:
+                for name, value in zip(header, fields):
+                    if name in CSV_COLUMNS:
+                        row[CSV_COLUMNS[name]] = float(value)
+            except ValueError:
+                continue
+            if np.isnan(row['power']):
+                row['power'] = row['cpu_power']
+            self.__rows.append((received, 0, row['cpu_utilization'], row['power'], row['cpu_power'], row['gpu_power']))
+
+    @staticmethod
+    def load(samples_file: Path) -> np.ndarray:
+        return np.fromfile(samples_file, dtype=SAMPLE_DTYPE)
+
+    @staticmethod
+    def aggregate(samples: np.ndarray) -> Dict[str, float]:
+        duration = np.sum(samples['weight'])
+        if len(samples) == 0 or duration == 0:
+            return dict()
+
+        aggregates = dict()
+        for dc in [DataColumns.ENERGY, DataColumns.CPU_ENERGY, DataColumns.GPU_ENERGY]:
+            if not np.all(np.isnan(samples[dc.value])):
+                aggregates[dc.name] = float(np.nansum(samples[dc.value] * samples['weight']))
+        if DataColumns.ENERGY.name in aggregates:
+            aggregates[DataColumns.AVG_POWER.name] = aggregates[DataColumns.ENERGY.name] / float(duration)
+        aggregates = {name: round(value, 3) for name, value in aggregates.items()}
+        aggregates[DataColumns.AVG_CPU_UTILIZATION.name] = \
+            round(float(np.sum(samples['cpu_utilization'] * samples['weight']) / duration), 5)
+        return aggregates
+
+
+def powerjoular(target: Optional[str] = 'target', powerjoular_path: str = 'powerjoular', extra_args: Iterable[str] = (),
+                poll_interval_in_s: float = 0.1,
+                data_columns: Iterable[DataColumns] = (DataColumns.ENERGY, DataColumns.AVG_POWER,
+                                                       DataColumns.AVG_CPU_UTILIZATION)):
+    """Measures the power of `self.<target>` (a `subprocess.Popen` or a pid), or of the whole system when `target`
+    is None, with powerjoular between the start and stop of the measurement."""
+    def powerjoular_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
+        cls.start_measurement       = start_powerjoular(target, powerjoular_path, extra_args,
+                                                        poll_interval_in_s)(cls.start_measurement)
+        cls.stop_measurement        = stop_powerjoular(cls.stop_measurement)
+        cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
+
+        return cls
+    return powerjoular_decorator
+
+
+def start_powerjoular(target: Optional[str] = 'target', powerjoular_path: str = 'powerjoular',
+                      extra_args: Iterable[str] = (), poll_interval_in_s: float = 0.1):
+    def start_powerjoular_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            pid = None
+            self.__powerjoular__ = None
+            if target is not None:
+                process = getattr(self, target, None)
+                pid = getattr(process, 'pid', process)
+                if pid is None:
+                    # e.g. a baseline run, which does not start the target
+                    output.console_log_WARNING(f"PowerJoular: self.{target} is not set, not measuring this run")
+                    return func(*args, **kwargs)
+
+            self.__powerjoular__ = PowerJoular(context.run_dir, pid, powerjoular_path, extra_args,
+                                               poll_interval_in_s=poll_interval_in_s)
+            self.__powerjoular__.start()
+            return func(*args, **kwargs)
+        return wrapper
+    return start_powerjoular_decorator
+
+
+def stop_powerjoular(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+
+        ret_val = func(*args, **kwargs)
+        if getattr(self, '__powerjoular__', None) is not None:
+            self.__powerjoular__.stop()
+        return ret_val
+    return wrapper
+
+
+def add_data_columns(data_cols: Iterable[DataColumns]):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            for dc in data_cols:
+                self.run_table_model.get_data_columns().append(dc.name)
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+
+def populate_data_columns(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        if ret_val is None:
+            ret_val = {}
+        samples_file = context.run_dir / PowerJoular.SAMPLES_FILE
+        if samples_file.exists():
+            aggregates = PowerJoular.aggregate(PowerJoular.load(samples_file))
+            for dc in self.run_table_model.get_data_columns():
+                if dc in aggregates:
+                    ret_val[dc] = aggregates[dc]
+        return ret_val
+    return wrapper
@@ -0,0 +1,374 @@
+import os
+import time
+import multiprocessing
+from enum import Enum, auto
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+SAMPLE_DTYPE = np.dtype([
+    ('time',                        '<f8'),  # seconds since the first sample (monotonic clock)
+    ('processes',                   '<u4'),
+    ('threads',                     '<u4'),
+    ('cpu_percent',                 '<f8'),  # since the previous sample, 100 per fully used cpu
+    ('rss_bytes',                   '<u8'),
+    ('voluntary_ctx_switches',      '<u8'),  # since the previous sample
+    ('involuntary_ctx_switches',    '<u8'),  # since the previous sample
+    ('read_bytes',                  '<u8'),  # since the previous sample, from/to the storage layer
+    ('write_bytes',                 '<u8'),  # since the previous sample
+])
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+class DataColumns(Enum):
+    """Aggregates of the samples of a run, over the measured process and its descendants."""
+    AVG_CPU                     = auto()  # percent, 100 per fully used cpu
+    MAX_CPU                     = auto()
+    AVG_RSS                     = auto()  # bytes
+    MAX_RSS                     = auto()
+    VOLUNTARY_CTX_SWITCHES      = auto()
+    INVOLUNTARY_CTX_SWITCHES    = auto()
+    READ_BYTES                  = auto()
+    WRITE_BYTES                 = auto()
+    MAX_PROCESSES               = auto()
+
+    @property
+    def name(self) -> str:
+        return f'process_tree__{super().name.lower()}'
+
+
+def _read_fd(fd: int) -> str:
+    # procfs regenerates the file contents on every read from offset 0
+    return os.pread(fd, 65536, 0).decode()
+
+
+def _open(path: str) -> Optional[int]:
+    try:
+        return os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    except OSError:
+        return None
+
+
+def _field(contents: str, key: str) -> int:
+    start = contents.find(key)
+    if start < 0:
+        return 0
+    return int(contents[start + len(key):].split(maxsplit=1)[0])
+
+
+class _TrackedProcess:
+    """The persistent file descriptors of a process (and its threads). The descriptors stay bound to the process,
+    reads fail once it exited (also when its pid is reused)."""
+
+    def __init__(self, pid: int, stat_fd: int, count_from_zero: bool):
+        self.pid = pid
+        self.stat_fd = stat_fd
+        self.io_fd = _open(f'/proc/{pid}/io')  # not readable for processes of other users
+        self.task_fds: Dict[int, tuple] = dict()  # tid: (status fd, children fd)
+        self.previous: Optional[Dict[str, int]] = dict() if count_from_zero else None
+
+    def read(self) -> Dict[str, int]:
+        stat = _read_fd(self.stat_fd)
+        fields = stat[stat.rindex(')') + 2:].split()  # the command name can contain spaces and parentheses
+        counters = {
+            'cpu_ticks': int(fields[11]) + int(fields[12]),  # utime + stime
+            'threads': int(fields[17]),
+            'rss_bytes': int(fields[21]) * PAGE_SIZE,
+            'voluntary_ctx_switches': 0,
+            'involuntary_ctx_switches': 0,
+            'read_bytes': 0,
+            'write_bytes': 0,
+        }
+        if self.io_fd is not None:
+            io = _read_fd(self.io_fd)
+            counters['read_bytes'] = _field(io, '\nread_bytes:')
+            counters['write_bytes'] = _field(io, '\nwrite_bytes:')
+
+        # Context switches are counted per thread
+        self.__update_tasks()
+        for status_fd, _ in self.task_fds.values():
+            try:
+                status = _read_fd(status_fd)
+            except OSError:
+                continue  # the thread exited
+            counters['voluntary_ctx_switches'] += _field(status, '\nvoluntary_ctxt_switches:')
+            counters['involuntary_ctx_switches'] += _field(status, '\nnonvoluntary_ctxt_switches:')
+        return counters
+
+    def children(self) -> List[int]:
+        pids = []
+        for _, children_fd in self.task_fds.values():
+            try:
+                pids.extend(int(pid) for pid in _read_fd(children_fd).split())
+            except OSError:
+                continue
+        return pids
+
+    def __update_tasks(self):
+        try:
+            tids = set(int(tid) for tid in os.listdir(f'/proc/{self.pid}/task'))
+        except OSError:
+            tids = set()
+        for tid in set(self.task_fds) - tids:
+            for fd in self.task_fds.pop(tid):
+                if fd is not None:
+                    os.close(fd)
+        for tid in tids - set(self.task_fds):
+            status_fd = _open(f'/proc/{self.pid}/task/{tid}/status')
+            children_fd = _open(f'/proc/{self.pid}/task/{tid}/children')
+            if status_fd is not None and children_fd is not None:
+                self.task_fds[tid] = (status_fd, children_fd)
+            else:
+                for fd in (status_fd, children_fd):
+                    if fd is not None:
+                        os.close(fd)
+
+    def close(self):
+        for fd in [self.stat_fd, self.io_fd] + [fd for fds in self.task_fds.values() for fd in fds]:
+            if fd is not None:
+                os.close(fd)
+        self.task_fds = dict()
+
+
+class ProcessTree:
+    """Samples the resource usage of a process and all its (current) descendants from /proc."""
+    DELTA_COUNTERS = ['cpu_ticks', 'voluntary_ctx_switches', 'involuntary_ctx_switches', 'read_bytes', 'write_bytes']
+
+    def __init__(self, pid: int):
+        stat_fd = _open(f'/proc/{pid}/stat')
+        if stat_fd is None:
+            raise BaseError(f"ProcessTreeSampler: The process {pid} does not exist!")
+        self.__processes: Dict[int, _TrackedProcess] = {pid: _TrackedProcess(pid, stat_fd, count_from_zero=False)}
+        self.__root = pid
+        self.__last_sample_time = None
+
+    def sample(self, sample):
+        """Fills the (SAMPLE_DTYPE) `sample` with the usage of the process tree since the previous sample.
+        The usage of a descendant between its last sample and its exit is not observed."""
+        now = time.monotonic()
+        interval = now - self.__last_sample_time if self.__last_sample_time is not None else None
+        self.__last_sample_time = now
+
+        # The processes of the first sample are measured from that sample on, those started later from their start
+        count_from_zero = interval is not None
+        totals = dict.fromkeys(ProcessTree.DELTA_COUNTERS + ['processes', 'threads', 'rss_bytes'], 0)
+        pending = [self.__root]
+        visited = set()
+        while pending:
+            pid = pending.pop()
+            if pid in visited:
+                continue
+            visited.add(pid)
+
+            process = self.__processes.get(pid)
+            if process is None:
+                stat_fd = _open(f'/proc/{pid}/stat')
+                if stat_fd is None:
+                    continue  # exited since its parent listed it
+                process = self.__processes[pid] = _TrackedProcess(pid, stat_fd, count_from_zero)
+
+            try:
+                counters = process.read()
+            except OSError:
+                process.close()  # exited
+                del self.__processes[pid]
+                continue
+
+            totals['processes'] += 1
+            totals['threads'] += counters['threads']
+            totals['rss_bytes'] += counters['rss_bytes']
+            if process.previous is not None:
+                for counter in ProcessTree.DELTA_COUNTERS:
+                    totals[counter] += max(counters[counter] - process.previous.get(counter, 0), 0)
+            process.previous = counters
+            pending.extend(process.children())
+
+        # Processes that are no longer part of the tree (e.g. exited, or reparented after their parent exited)
+        for pid in set(self.__processes) - visited:
+            self.__processes.pop(pid).close()
+
+        sample['processes'] = totals['processes']
+        sample['threads'] = totals['threads']
+        sample['cpu_percent'] = 100 * totals['cpu_ticks'] / CLOCK_TICKS / interval if interval else 0
+        sample['rss_bytes'] = totals['rss_bytes']
+        for counter in ProcessTree.DELTA_COUNTERS[1:]:
+            sample[counter] = totals[counter]
+
+    def close(self):
+        for process in self.__processes.values():
+            process.close()
+        self.__processes = dict()
+
+
+def _sample_process_tree(pid: int, output_file: Path, interval_in_s: float, buffer_size: int, stop_event):
+    tree = ProcessTree(pid)
+    buffer = np.zeros(buffer_size, dtype=SAMPLE_DTYPE)
+    idx = 0
+    try:
+        with open(output_file, 'wb') as f:
+            start = time.monotonic()
+            next_sample = start
+            stopping = False
+            while True:
+                tree.sample(buffer[idx])
+                buffer[idx]['time'] = time.monotonic() - start
+                idx += 1
+                if idx == buffer_size:
+                    f.write(buffer.tobytes())
+                    idx = 0
+                if stopping:
+                    break
+
+                # Sample on a fixed schedule (without drift), a stop request ends the waiting immediately
+                next_sample += interval_in_s
+                stopping = stop_event.wait(max(next_sample - time.monotonic(), 0))
+            f.write(buffer[:idx].tobytes())
+    finally:
+        tree.close()
+
+
+class ProcessTreeSampler:
+    SAMPLES_FILE = 'process_tree_samples.bin'
+
+    def __init__(self, pid: int, output_file: Path, interval_in_s: float = 0.1, buffer_size: int = 1024):
+        """Samples the CPU usage, resident memory, context switches and I/O of process `pid` and its descendants
+        every `interval_in_s` seconds, in a dedicated sampler process. The /proc files are read through persistent
+        file descriptors. Samples are collected in a preallocated buffer of `buffer_size` samples, which is flushed
+        to `output_file` (an array of SAMPLE_DTYPE records, see `load`) whenever it is full, and on stop."""
+        if interval_in_s <= 0 or buffer_size < 1:
+            raise BaseError("ProcessTreeSampler: The interval must be positive, and the buffer hold at least one sample!")
+        if not os.path.exists(f'/proc/{pid}/stat'):
+            raise BaseError(f"ProcessTreeSampler: The process {pid} does not exist!")
+
+        self.pid = pid
+        self.output_file = output_file
+        self.interval_in_s = interval_in_s
+        self.buffer_size = buffer_size
+        self.__stop_event = multiprocessing.Event()
+        self.__sampler = None
+
+    def start(self):
+        self.__sampler = multiprocessing.Process(
+            target=_sample_process_tree,
+            args=[self.pid, self.output_file, self.interval_in_s, self.buffer_size, self.__stop_event],
+            daemon=True
+        )
+        self.__sampler.start()
+
+    def stop(self) -> np.ndarray:
+        """Stops sampling (after a final sample), and returns the samples."""
+        self.__stop_event.set()
+        self.__sampler.join()
+        if self.__sampler.exitcode != 0:
+            raise BaseError(f"ProcessTreeSampler: The sampler process failed with exit code {self.__sampler.exitcode}")
+        return ProcessTreeSampler.load(self.output_file)
+
+    @staticmethod
+    def load(samples_file: Path) -> np.ndarray:
+        return np.fromfile(samples_file, dtype=SAMPLE_DTYPE)
+
+    @staticmethod
+    def aggregate(samples: np.ndarray) -> Dict[str, float]:
+        if len(samples) < 2:
+            return dict()
+
+        # The first sample establishes the counters of the root process, its usage is zero
+        intervals = np.diff(samples['time'])
+        cpu_percent = samples['cpu_percent'][1:]
+        return {
+            DataColumns.AVG_CPU.name: round(float(np.sum(cpu_percent * intervals) / np.sum(intervals)), 3),
+            DataColumns.MAX_CPU.name: round(float(np.max(cpu_percent)), 3),
+            DataColumns.AVG_RSS.name: int(np.mean(samples['rss_bytes'])),
+            DataColumns.MAX_RSS.name: int(np.max(samples['rss_bytes'])),
+            DataColumns.VOLUNTARY_CTX_SWITCHES.name: int(np.sum(samples['voluntary_ctx_switches'])),
+            DataColumns.INVOLUNTARY_CTX_SWITCHES.name: int(np.sum(samples['involuntary_ctx_switches'])),
+            DataColumns.READ_BYTES.name: int(np.sum(samples['read_bytes'])),
+            DataColumns.WRITE_BYTES.name: int(np.sum(samples['write_bytes'])),
+            DataColumns.MAX_PROCESSES.name: int(np.max(samples['processes'])),
+        }
+
+
+def process_tree_sampler(target: str = 'target', interval_in_s: float = 0.1, buffer_size: int = 1024,
+                         data_columns: Iterable[DataColumns] = (DataColumns.AVG_CPU, DataColumns.MAX_RSS)):
+    """Samples the process tree of `self.<target>` (a `subprocess.Popen` or a pid) between the start and stop
+    of the measurement."""
+    def process_tree_sampler_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
+        cls.start_measurement       = start_sampler(target, interval_in_s, buffer_size)(cls.start_measurement)
+        cls.stop_measurement        = stop_sampler(cls.stop_measurement)
+        cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
+
+        return cls
+    return process_tree_sampler_decorator
+
+
+def start_sampler(target: str = 'target', interval_in_s: float = 0.1, buffer_size: int = 1024):
+    def start_sampler_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            process = getattr(self, target, None)
+            pid = getattr(process, 'pid', process)
+            self.__process_tree_sampler__ = None
+            if pid is None:
+                # e.g. a baseline run, which does not start the target
+                output.console_log_WARNING(f"ProcessTreeSampler: self.{target} is not set, not sampling this run")
+            else:
+                self.__process_tree_sampler__ = ProcessTreeSampler(
+                    pid, context.run_dir / ProcessTreeSampler.SAMPLES_FILE, interval_in_s, buffer_size)
+                self.__process_tree_sampler__.start()
+            return func(*args, **kwargs)
+        return wrapper
+    return start_sampler_decorator
+
+
+def stop_sampler(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+
+        ret_val = func(*args, **kwargs)
+        if getattr(self, '__process_tree_sampler__', None) is not None:
+            self.__process_tree_sampler__.stop()
+        return ret_val
+    return wrapper
+
+
+def add_data_columns(data_cols: Iterable[DataColumns]):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            for dc in data_cols:
+                self.run_table_model.get_data_columns().append(dc.name)
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+
+def populate_data_columns(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        if ret_val is None:
+            ret_val = {}
+        samples_file = context.run_dir / ProcessTreeSampler.SAMPLES_FILE
+        if samples_file.exists():
+            aggregates = ProcessTreeSampler.aggregate(ProcessTreeSampler.load(samples_file))
+            for dc in self.run_table_model.get_data_columns():
+                if dc in aggregates:
+                    ret_val[dc] = aggregates[dc]
+        return ret_val
+    return wrapper
@@ -0,0 +1,224 @@
+import json
+import time
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+class DataColumns(Enum):
+    """The energy (J) of a RAPL domain during the measurement, summed over all sockets.
+    The core and uncore domains are part of the package domain, the dram domain is not."""
+    PACKAGE_ENERGY  = 'package'
+    CORE_ENERGY     = 'core'
+    UNCORE_ENERGY   = 'uncore'
+    DRAM_ENERGY     = 'dram'
+    PSYS_ENERGY     = 'psys'
+
+    @property
+    def name(self) -> str:
+        return f'rapl__{super().name.lower()}'
+
+    @property
+    def domain(self) -> str:
+        return self.value
+
+
+class RaplZone:
+    """A powercap zone (e.g. /sys/class/powercap/intel-rapl:0:2), with a monotonically increasing energy counter
+    that wraps around after `max_energy_range_uj`."""
+
+    def __init__(self, path: Path, name: str, domain: str):
+        self.path = path
+        self.name = name        # unique, e.g. 'package-0' or 'package-0/dram'
+        self.domain = domain    # e.g. 'package' or 'dram'
+        self.max_energy_range_uj = int((path / 'max_energy_range_uj').read_text())
+
+    def read_energy_uj(self) -> int:
+        try:
+            return int((self.path / 'energy_uj').read_text())
+        except PermissionError:
+            raise BaseError(f"Rapl: No permission to read {self.path / 'energy_uj'}, which is readable by root only "
+                            f"on recent kernels (e.g. run as root, or make it readable with chmod)")
+
+    def energy_delta_uj(self, previous_uj: int, current_uj: int) -> int:
+        # The counter wraps around to 0 after max_energy_range_uj (at most once between two reads)
+        return (current_uj - previous_uj) % (self.max_energy_range_uj + 1)
+
+
+class Rapl:
+    DEFAULT_POWERCAP_PATH = Path('/sys/class/powercap')
+    ENERGY_FILE = 'rapl_energy.json'
+    SAMPLES_FILE = 'rapl_samples.npy'
+
+    def __init__(self, powercap_path: Path = DEFAULT_POWERCAP_PATH, sampling_interval_in_s: float = None):
+        """Measures the energy of the RAPL domains from their powercap energy counters, read at the start and the stop
+        of the measurement. With a `sampling_interval_in_s`, the counters are also read periodically (in a background
+        thread), which records the energy over time, and handles measurements longer than the wraparound period of
+        the counters (which can be as short as a minute on older CPUs)."""
+        if sampling_interval_in_s is not None and sampling_interval_in_s <= 0:
+            raise BaseError("Rapl: The sampling interval must be positive!")
+
+        self.zones = Rapl.discover_zones(powercap_path)
+        if not self.zones:
+            raise BaseError(f"Rapl: No RAPL zones found in {powercap_path} (is the intel_rapl driver loaded?)")
+        self.sampling_interval_in_s = sampling_interval_in_s
+
+        self.__previous_uj: Dict[str, int] = dict()
+        self.__energy_uj: Dict[str, int] = dict()
+        self.__samples: List[tuple] = []
+        self.__start_time = None
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__sampler = None
+
+    @staticmethod
+    def discover_zones(powercap_path: Path) -> List[RaplZone]:
+        zones = dict()
+        # Both the zones and their subzones are listed in the powercap class, e.g. intel-rapl:0 and intel-rapl:0:2.
+        # The zones of other control types are excluded, e.g. intel-rapl-mmio:0, which (re)measures package-0.
+        for path in sorted(powercap_path.glob('intel-rapl:*'), key=lambda p: p.name):
+            if not (path / 'energy_uj').exists():
+                continue  # e.g. the intel-rapl control type itself
+            name = (path / 'name').read_text().strip()
+            parent = path.name.rsplit(':', 1)[0]
+            zones[path.name] = (path, name, parent)
+
+        rapl_zones = []
+        for path, name, parent in zones.values():
+            domain = name.split('-')[0]  # package-0 -> package
+            unique_name = f'{zones[parent][1]}/{name}' if parent in zones else name
+            rapl_zones.append(RaplZone(path, unique_name, domain))
+        return rapl_zones
+
+    def start(self):
+        self.__start_time = time.monotonic()
+        self.__previous_uj = {zone.name: zone.read_energy_uj() for zone in self.zones}
+        self.__energy_uj = dict.fromkeys(self.__previous_uj, 0)
+        self.__samples = [(0.0, *self.__energy_uj.values())]
+
+        if self.sampling_interval_in_s is not None:
+            self.__stop_event.clear()
+            self.__sampler = threading.Thread(target=self.__sample_periodically, daemon=True)
+            self.__sampler.start()
+
+    def sample(self):
+        """Reads the energy counters, and accumulates the energy since the previous read."""
+        with self.__lock:
+            for zone in self.zones:
+                current_uj = zone.read_energy_uj()
+                self.__energy_uj[zone.name] += zone.energy_delta_uj(self.__previous_uj[zone.name], current_uj)
+                self.__previous_uj[zone.name] = current_uj
+            self.__samples.append((time.monotonic() - self.__start_time, *self.__energy_uj.values()))
+
+    def stop(self) -> Dict[str, float]:
+        """Stops the measurement, and returns the energy (J) per zone."""
+        if self.__sampler is not None:
+            self.__stop_event.set()
+            self.__sampler.join()
+            self.__sampler = None
+        self.sample()
+        return self.energy()
+
+    def energy(self) -> Dict[str, float]:
+        return {name: energy_uj / 1e6 for name, energy_uj in self.__energy_uj.items()}
+
+    def samples(self) -> np.ndarray:
+        """The time (s since the start) and the cumulative energy (J) per zone of each read."""
+        dtype = np.dtype([('time', '<f8')] + [(zone.name, '<f8') for zone in self.zones])
+        samples = np.array(self.__samples, dtype=dtype)
+        for zone in self.zones:
+            samples[zone.name] /= 1e6
+        return samples
+
+    def save(self, run_dir: Path):
+        energy = self.energy()
+        with open(run_dir / Rapl.ENERGY_FILE, 'w') as f:
+            json.dump({zone.name: {'domain': zone.domain, 'energy_j': energy[zone.name]} for zone in self.zones}, f, indent=2)
+        if self.sampling_interval_in_s is not None:
+            np.save(run_dir / Rapl.SAMPLES_FILE, self.samples())
+
+    @staticmethod
+    def load_energy(run_dir: Path) -> Dict[str, float]:
+        """The energy (J) per domain of a run, summed over the zones (i.e. sockets) of each domain."""
+        with open(run_dir / Rapl.ENERGY_FILE, 'r') as f:
+            zones = json.load(f)
+        energy = dict()
+        for zone in zones.values():
+            energy[zone['domain']] = energy.get(zone['domain'], 0) + zone['energy_j']
+        return energy
+
+    def __sample_periodically(self):
+        while not self.__stop_event.wait(self.sampling_interval_in_s):
+            self.sample()
+
+
+def rapl_energy(powercap_path: Union[Path, str] = Rapl.DEFAULT_POWERCAP_PATH, sampling_interval_in_s: float = None,
+                data_columns: Iterable[DataColumns] = (DataColumns.PACKAGE_ENERGY, DataColumns.DRAM_ENERGY)):
+    def rapl_energy_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
+        cls.start_measurement       = start_rapl(powercap_path, sampling_interval_in_s)(cls.start_measurement)
+        cls.stop_measurement        = stop_rapl(cls.stop_measurement)
+        cls.populate_run_data       = populate_data_columns(cls.populate_run_data)
+
+        return cls
+    return rapl_energy_decorator
+
+
+def start_rapl(powercap_path: Union[Path, str] = Rapl.DEFAULT_POWERCAP_PATH, sampling_interval_in_s: float = None):
+    def start_rapl_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            self.__rapl__ = Rapl(Path(powercap_path), sampling_interval_in_s)
+            self.__rapl__.start()
+            return func(*args, **kwargs)
+        return wrapper
+    return start_rapl_decorator
+
+
+def stop_rapl(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        self.__rapl__.stop()
+        self.__rapl__.save(context.run_dir)
+        return ret_val
+    return wrapper
+
+
+def add_data_columns(data_cols: Iterable[DataColumns]):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            for dc in data_cols:
+                self.run_table_model.get_data_columns().append(dc.name)
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+
+def populate_data_columns(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+        context: RunnerContext = args[1]
+
+        ret_val = func(*args, **kwargs)
+        if ret_val is None:
+            ret_val = {}
+        energy = Rapl.load_energy(context.run_dir)
+        for dc in DataColumns:
+            if dc.name in self.run_table_model.get_data_columns() and dc.domain in energy:
+                ret_val[dc.name] = round(energy[dc.domain], 6)
+        return ret_val
+    return wrapper
@@ -0,0 +1,228 @@
+import os
+import time
+import signal
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+# A parser turns a line of the profiler's stdout into the values of the columns, or None to skip the line
+Parser = Callable[[str], Optional[Sequence[Any]]]
+Command = Union[str, List[str], Callable[[RunnerConfig, RunnerContext], Union[str, List[str]]]]
+
+
+class SubprocessProfiler:
+    def __init__(self, command: Union[str, List[str]], parser: Parser, columns: Iterable[Tuple[str, str]],
+                 output_file: Path, stderr_file: Path = None, stop_signal: Optional[int] = signal.SIGINT,
+                 stop_timeout_in_s: float = 5, deadline_in_s: float = None, buffer_size: int = 1024, **popen_kwargs):
+        """Runs a profiler (`command`, a shell command if it is a string) in the background, and parses its stdout while
+        it runs: a reader thread drains stdout line by line (such that a chatty profiler never blocks on a full pipe),
+        and `parser` turns each line into the values of `columns` (a list of (name, NumPy type), e.g. [('cpu', 'f4')]).
+        The samples, with the time.monotonic() at which their line was read, are collected in a preallocated buffer of
+        `buffer_size` samples, which is flushed to `output_file` whenever it is full (see `load`).
+
+        The profiler is stopped with `stop_signal` (or, if it is None, is expected to exit by itself), and killed if it
+        has not exited within `stop_timeout_in_s`. With a `deadline_in_s`, it is stopped at the latest this long after
+        its start. The signals are sent to the profiler's process group, i.e. including the processes it started."""
+        if buffer_size < 1:
+            raise BaseError("SubprocessProfiler: The buffer must hold at least one sample!")
+
+        self.command = command
+        self.parser = parser
+        self.dtype = SubprocessProfiler.samples_dtype(columns)
+        self.output_file = output_file
+        self.stderr_file = stderr_file
+        self.stop_signal = stop_signal
+        self.stop_timeout_in_s = stop_timeout_in_s
+        self.deadline_in_s = deadline_in_s
+        self.buffer_size = buffer_size
+        self.popen_kwargs = popen_kwargs
+        self.skipped_lines = 0      # the lines that could not be parsed
+
+        self.__process: Optional[subprocess.Popen] = None
+        self.__reader: Optional[threading.Thread] = None
+        self.__deadline: Optional[threading.Timer] = None
+        self.__stopping = threading.Lock()
+
+    @staticmethod
+    def samples_dtype(columns: Iterable[Tuple[str, str]]) -> np.dtype:
+        return np.dtype([('time', '<f8')] + list(columns))
+
+    def start(self):
+        stderr = open(self.stderr_file, 'wb') if self.stderr_file is not None else subprocess.DEVNULL
+        try:
+            self.__process = subprocess.Popen(self.command, shell=isinstance(self.command, str),
+                                              stdout=subprocess.PIPE, stderr=stderr, start_new_session=True,
+                                              **self.popen_kwargs)
+        except OSError as e:
+            raise BaseError(f"SubprocessProfiler: Could not start {self.command}: {e}")
+        finally:
+            if stderr is not subprocess.DEVNULL:
+                stderr.close()
+
+        self.__reader = threading.Thread(target=self.__read, daemon=True)
+        self.__reader.start()
+        if self.deadline_in_s is not None:
+            self.__deadline = threading.Timer(self.deadline_in_s, self.__terminate)
+            self.__deadline.daemon = True
+            self.__deadline.start()
+
+    def stop(self) -> np.ndarray:
+        """Stops the profiler, and returns its samples."""
+        if self.__deadline is not None:
+            self.__deadline.cancel()
+        self.__terminate()
+        self.__reader.join()
+        return SubprocessProfiler.load(self.output_file, self.dtype)
+
+    @property
+    def exit_code(self) -> Optional[int]:
+        return self.__process.poll() if self.__process is not None else None
+
+    def __terminate(self):
+        with self.__stopping:
+            if self.__process.poll() is None:
+                if self.stop_signal is not None:
+                    self.__signal(self.stop_signal)
+                try:
+                    self.__process.wait(timeout=self.stop_timeout_in_s)
+                except subprocess.TimeoutExpired:
+                    output.console_log_WARNING(f"SubprocessProfiler: {self.command} did not exit within "
+                                               f"{self.stop_timeout_in_s}s, killing it")
+            # Also kill the processes it left behind, which could keep stdout open
+            self.__signal(signal.SIGKILL)
+            self.__process.wait()
+
+    def __signal(self, sig: int):
+        try:
+            os.killpg(self.__process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def __read(self):
+        buffer = np.zeros(self.buffer_size, dtype=self.dtype)
+        idx = 0
+        with open(self.output_file, 'wb') as f:
+            for line in self.__process.stdout:
+                received = time.monotonic()
+                try:
+                    values = self.parser(line.decode(errors='replace').rstrip('\r\n'))
+                    if values is None:
+                        continue
+                    buffer[idx] = (received, *values)
+                except Exception:
+                    # Any error of the (user) parser skips the line, the reader must keep draining stdout
+                    self.skipped_lines += 1
+                    continue
+
+                idx += 1
+                if idx == self.buffer_size:
+                    f.write(buffer.tobytes())
+                    idx = 0
+            f.write(buffer[:idx].tobytes())
+        self.__process.stdout.close()
+
+    @staticmethod
+    def load(samples_file: Path, dtype: np.dtype) -> np.ndarray:
+        return np.fromfile(samples_file, dtype=dtype)
+
+    @staticmethod
+    def samples_file(name: str) -> str:
+        return f'{name}_samples.bin'
+
+
+def subprocess_profiler(name: str, command: Command, parser: Parser, columns: Iterable[Tuple[str, str]],
+                        aggregate: Callable[[np.ndarray], Dict[str, Any]] = None, data_columns: Iterable[str] = (),
+                        **profiler_kwargs):
+    """Runs the profiler `command` (or `command(self, context)`, e.g. to profile the pid of the target) between the
+    start and stop of the measurement. Its samples are stored as "<name>_samples.bin" in the run directory, and
+    `aggregate(samples)` populates the `data_columns`."""
+    columns = list(columns)
+
+    def subprocess_profiler_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(data_columns)(cls.create_run_table_model)
+        cls.start_measurement       = start_profiler(name, command, parser, columns,
+                                                     **profiler_kwargs)(cls.start_measurement)
+        cls.stop_measurement        = stop_profiler(name)(cls.stop_measurement)
+        if aggregate is not None:
+            cls.populate_run_data   = populate_data_columns(name, columns, aggregate)(cls.populate_run_data)
+
+        return cls
+    return subprocess_profiler_decorator
+
+
+def start_profiler(name: str, command: Command, parser: Parser, columns: Iterable[Tuple[str, str]], **profiler_kwargs):
+    columns = list(columns)
+
+    def start_profiler_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            profiler = SubprocessProfiler(
+                command(self, context) if callable(command) else command, parser, columns,
+                context.run_dir / SubprocessProfiler.samples_file(name),
+                stderr_file=context.run_dir / f'{name}.stderr', **profiler_kwargs)
+            if getattr(self, '__subprocess_profilers__', None) is None:
+                self.__subprocess_profilers__ = dict()
+            self.__subprocess_profilers__[name] = profiler
+            profiler.start()
+            return func(*args, **kwargs)
+        return wrapper
+    return start_profiler_decorator
+
+
+def stop_profiler(name: str):
+    def stop_profiler_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            ret_val = func(*args, **kwargs)
+            self.__subprocess_profilers__.pop(name).stop()
+            return ret_val
+        return wrapper
+    return stop_profiler_decorator
+
+
+def add_data_columns(data_cols: Iterable[str]):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            for dc in data_cols:
+                if dc not in self.run_table_model.get_data_columns():
+                    self.run_table_model.get_data_columns().append(dc)
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+
+def populate_data_columns(name: str, columns: Iterable[Tuple[str, str]],
+                          aggregate: Callable[[np.ndarray], Dict[str, Any]]):
+    dtype = SubprocessProfiler.samples_dtype(columns)
+
+    def populate_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            ret_val = func(*args, **kwargs)
+            if ret_val is None:
+                ret_val = {}
+            samples_file = context.run_dir / SubprocessProfiler.samples_file(name)
+            if samples_file.exists():
+                aggregates = aggregate(SubprocessProfiler.load(samples_file, dtype))
+                for dc in self.run_table_model.get_data_columns():
+                    if dc in aggregates:
+                        ret_val[dc] = aggregates[dc]
+            return ret_val
+        return wrapper
+    return populate_data_columns_decorator
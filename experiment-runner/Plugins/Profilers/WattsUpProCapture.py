@@ -0,0 +1,236 @@
+import os
+import time
+import selectors
+import multiprocessing
+from enum import Enum, auto
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import serial
+
+from ConfigValidator.Config.Models.RunnerContext import RunnerContext
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+SAMPLE_DTYPE = np.dtype([
+    ('time',    '<f8'),  # time.monotonic() at which the sample was received
+    ('meter',   '<u2'),  # the index of the meter, in the order in which the meters are configured
+    ('watts',   '<f4'),
+    ('volts',   '<f4'),
+    ('amps',    '<f4'),
+])
+
+
+class DataColumns(Enum):
+    """Aggregates of the samples of a meter during the measurement."""
+    ENERGY      = auto()  # J, the integral of the power over time
+    AVG_POWER   = auto()  # W
+    SAMPLES     = auto()
+
+    def column(self, meter: str) -> str:
+        return f'wattsuppro__{meter}__{self.name.lower()}'
+
+
+def parse_sample(line: bytes) -> Optional[Tuple[float, float, float]]:
+    """Parses a data line of the meter, e.g. b'#d,-,18,1234,2301,532,...;' (in 0.1 W, 0.1 V and mA)."""
+    if not line.startswith(b'#d'):
+        return None
+    fields = line.split(b',', 6)
+    if len(fields) < 6:
+        return None
+    try:
+        return int(fields[3]) / 10, int(fields[4]) / 10, int(fields[5]) / 1000
+    except ValueError:
+        return None
+
+
+def _capture(fds: List[int], stop_fd: int, output_file: Path, buffer_size: int):
+    selector = selectors.DefaultSelector()
+    for meter, fd in enumerate(fds):
+        selector.register(fd, selectors.EVENT_READ, meter)
+    selector.register(stop_fd, selectors.EVENT_READ, None)
+
+    partial_lines = [b''] * len(fds)
+    buffer = np.zeros(buffer_size, dtype=SAMPLE_DTYPE)
+    idx = 0
+    with open(output_file, 'wb') as f:
+        stopping = False
+        while not stopping:
+            for key, _ in selector.select():
+                if key.data is None:
+                    stopping = True  # the data that is ready in this round is still captured
+                    continue
+
+                received = time.monotonic()
+                try:
+                    data = os.read(key.fd, 4096)
+                except OSError:
+                    data = b''
+                if not data:
+                    selector.unregister(key.fd)  # the meter was disconnected
+                    continue
+
+                lines = (partial_lines[key.data] + data).split(b'\n')
+                partial_lines[key.data] = lines.pop()
+                for line in lines:
+                    sample = parse_sample(line)
+                    if sample is None:
+                        continue
+                    buffer[idx] = (received, key.data, *sample)
+                    idx += 1
+                    if idx == buffer_size:
+                        f.write(buffer.tobytes())
+                        idx = 0
+        f.write(buffer[:idx].tobytes())
+    selector.close()
+
+
+class WattsUpProCapture:
+    SAMPLES_FILE = 'wattsuppro_samples.bin'
+    EXTERNAL_MODE = 'E'
+
+    def __init__(self, meters: Dict[str, str], output_file: Path, interval: int = 1, buffer_size: int = 1024):
+        """Captures the samples of several "Watts up? Pro" power meters (`meters` maps a name to a serial port) in a
+        single background process, which multiplexes the serial ports. The samples are collected in a preallocated
+        buffer of `buffer_size` samples, which is flushed to `output_file` (an array of SAMPLE_DTYPE records, see
+        `load`) whenever it is full, and on stop. The meters log a sample every `interval` seconds."""
+        if not meters:
+            raise BaseError("WattsUpProCapture: At least one meter must be specified!")
+        if buffer_size < 1:
+            raise BaseError("WattsUpProCapture: The buffer must hold at least one sample!")
+
+        self.meters = meters
+        self.output_file = output_file
+        self.interval = interval
+        self.buffer_size = buffer_size
+        self.__ports: List[serial.Serial] = []
+        self.__stop_fd = None
+        self.__capture = None
+
+    def start(self):
+        for name, port in self.meters.items():
+            if not os.path.exists(port):
+                self.__close_ports()
+                raise BaseError(f"WattsUpProCapture: The serial port {port} of meter {name} does not exist "
+                                f"(are the FTDI drivers installed?)")
+            self.__ports.append(serial.Serial(port, 115200, timeout=0))
+
+        stop_read_fd, self.__stop_fd = os.pipe()
+        self.__capture = multiprocessing.Process(
+            target=_capture,
+            args=[[port.fileno() for port in self.__ports], stop_read_fd, self.output_file, self.buffer_size],
+            daemon=True
+        )
+        self.__capture.start()
+        os.close(stop_read_fd)
+
+        # Start logging once the capture process is listening, such that the first samples are not missed
+        for port in self.__ports:
+            port.write(f'#L,W,3,{WattsUpProCapture.EXTERNAL_MODE},,{self.interval};'.encode())
+
+    def stop(self) -> np.ndarray:
+        """Stops capturing, and returns the samples."""
+        os.write(self.__stop_fd, b'\0')
+        self.__capture.join()
+        os.close(self.__stop_fd)
+        self.__close_ports()
+        if self.__capture.exitcode != 0:
+            raise BaseError(f"WattsUpProCapture: The capture process failed with exit code {self.__capture.exitcode}")
+        return WattsUpProCapture.load(self.output_file)
+
+    def __close_ports(self):
+        for port in self.__ports:
+            port.close()
+        self.__ports = []
+
+    @staticmethod
+    def load(samples_file: Path) -> np.ndarray:
+        return np.fromfile(samples_file, dtype=SAMPLE_DTYPE)
+
+    @staticmethod
+    def aggregate(samples: np.ndarray, meters: Iterable[str]) -> Dict[str, float]:
+        aggregates = dict()
+        for idx, meter in enumerate(meters):
+            meter_samples = samples[samples['meter'] == idx]
+            aggregates[DataColumns.SAMPLES.column(meter)] = len(meter_samples)
+            if len(meter_samples) == 0:
+                continue
+
+            watts = meter_samples['watts'].astype(np.float64)
+            aggregates[DataColumns.AVG_POWER.column(meter)] = round(float(np.mean(watts)), 3)
+            if len(meter_samples) > 1:
+                # Trapezoidal integration over the receive times
+                energy = np.sum((watts[1:] + watts[:-1]) / 2 * np.diff(meter_samples['time']))
+                aggregates[DataColumns.ENERGY.column(meter)] = round(float(energy), 3)
+        return aggregates
+
+
+def wattsuppro_capture(meters: Dict[str, str], interval: int = 1, buffer_size: int = 1024,
+                       data_columns: Iterable[DataColumns] = (DataColumns.ENERGY, DataColumns.AVG_POWER)):
+    def wattsuppro_capture_decorator(cls: RunnerConfig.__class__):
+        cls.create_run_table_model  = add_data_columns(meters, data_columns)(cls.create_run_table_model)
+        cls.start_measurement       = start_capture(meters, interval, buffer_size)(cls.start_measurement)
+        cls.stop_measurement        = stop_capture(cls.stop_measurement)
+        cls.populate_run_data       = populate_data_columns(meters)(cls.populate_run_data)
+
+        return cls
+    return wattsuppro_capture_decorator
+
+
+def start_capture(meters: Dict[str, str], interval: int = 1, buffer_size: int = 1024):
+    def start_capture_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            self.__wattsuppro_capture__ = WattsUpProCapture(
+                meters, context.run_dir / WattsUpProCapture.SAMPLES_FILE, interval, buffer_size)
+            self.__wattsuppro_capture__.start()
+            return func(*args, **kwargs)
+        return wrapper
+    return start_capture_decorator
+
+
+def stop_capture(func):
+    def wrapper(*args, **kwargs):
+        self: RunnerConfig = args[0]
+
+        ret_val = func(*args, **kwargs)
+        self.__wattsuppro_capture__.stop()
+        return ret_val
+    return wrapper
+
+
+def add_data_columns(meters: Dict[str, str], data_cols: Iterable[DataColumns]):
+    def add_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+
+            func(*args, **kwargs)  # will set self.run_table_model
+            for meter in meters:
+                for dc in data_cols:
+                    self.run_table_model.get_data_columns().append(dc.column(meter))
+            return self.run_table_model
+        return wrapper
+    return add_data_columns_decorator
+
+
+def populate_data_columns(meters: Dict[str, str]):
+    def populate_data_columns_decorator(func):
+        def wrapper(*args, **kwargs):
+            self: RunnerConfig = args[0]
+            context: RunnerContext = args[1]
+
+            ret_val = func(*args, **kwargs)
+            if ret_val is None:
+                ret_val = {}
+            aggregates = WattsUpProCapture.aggregate(
+                WattsUpProCapture.load(context.run_dir / WattsUpProCapture.SAMPLES_FILE), meters)
+            for dc in self.run_table_model.get_data_columns():
+                if dc in aggregates:
+                    ret_val[dc] = aggregates[dc]
+            return ret_val
+        return wrapper
+    return populate_data_columns_decorator
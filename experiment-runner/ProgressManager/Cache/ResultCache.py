@@ -0,0 +1,160 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import platform
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ExtendedTyping.Typing import SupportsStr
+from ProgressManager.Output.OutputProcedure import OutputProcedure as output
+
+
+###     =========================================================
+###     |                                                       |
+###     |                      ResultCache                      |
+###     |       - Content-addressed store of measured runs,     |
+###     |         shared between experiments                    |
+###     |       - Keyed by config md5sum, treatment levels      |
+###     |         and a fingerprint of the measuring host       |
+###     |       - Size-bounded, least recently used entries     |
+###     |         are evicted first                             |
+###     |                                                       |
+###     =========================================================
+class ResultCache:
+    ENTRY_FILE = 'entry.json'
+    ARTIFACTS_DIR = 'artifacts'
+
+    def __init__(self, cache_path: Path, max_size_in_mb: int, md5sum: bytes, factors: List[FactorModel]):
+        self.__cache_path = cache_path
+        self.__max_size_in_bytes = max_size_in_mb * 1024 * 1024
+        self.__md5sum = md5sum
+        self.__factors = factors
+        self.__host_fingerprint = ResultCache.calc_host_fingerprint()
+
+        self.__cache_path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def calc_host_fingerprint() -> str:
+        """Describes the hardware and OS the measurements were taken on. Results are only reused on an identical host."""
+        uname = platform.uname()
+        cpu_model = ''
+        try:
+            with open('/proc/cpuinfo', 'r') as cpuinfo:
+                for line in cpuinfo:
+                    if line.startswith('model name'):
+                        cpu_model = line.split(':', 1)[1].strip()
+                        break
+        except OSError:
+            pass
+
+        return '|'.join([uname.node, uname.system, uname.release, uname.machine, cpu_model,
+                         str(os.cpu_count()), str(psutil.virtual_memory().total)])
+
+    def calc_key(self, variation: Dict) -> str:
+        treatment_levels = [(factor.factor_name, str(variation[factor.factor_name])) for factor in self.__factors]
+
+        key = hashlib.md5()
+        key.update(self.__md5sum)
+        key.update(self.__host_fingerprint.encode())
+        key.update(json.dumps(treatment_levels).encode())
+        key.update(variation['__run_id'].encode())  # distinguishes the repetitions of the same treatment levels
+        return key.hexdigest()
+
+    def get(self, variation: Dict, run_dir: Path) -> Optional[Dict[str, SupportsStr]]:
+        """Returns the cached data columns of `variation` and hard-links its raw artifacts into `run_dir`,
+        or None in case of a cache miss."""
+        entry_dir = self.__cache_path / self.calc_key(variation)
+        try:
+            with open(entry_dir / ResultCache.ENTRY_FILE, 'r') as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        run_dir.mkdir(parents=True, exist_ok=True)
+        ResultCache.__link_tree(entry_dir / ResultCache.ARTIFACTS_DIR, run_dir)
+        os.utime(entry_dir / ResultCache.ENTRY_FILE)  # mark as recently used
+
+        return entry['run_data']
+
+    def put(self, variation: Dict, run_data: Dict[str, SupportsStr], run_dir: Path):
+        key = self.calc_key(variation)
+        entry_dir = self.__cache_path / key
+        if entry_dir.exists():
+            return
+
+        # Assemble the entry next to its final location, and move it in place atomically
+        # such that experiments sharing the cache never observe a partial entry.
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f'.{key}-', dir=self.__cache_path))
+        try:
+            ResultCache.__link_tree(run_dir, tmp_dir / ResultCache.ARTIFACTS_DIR)
+            with open(tmp_dir / ResultCache.ENTRY_FILE, 'w') as entry_file:
+                json.dump({
+                    'run_id': variation['__run_id'],
+                    'treatment_levels': {factor.factor_name: str(variation[factor.factor_name]) for factor in self.__factors},
+                    'run_data': run_data,
+                    'created': time.time()
+                }, entry_file, indent=2)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not entry_dir.exists():
+                raise
+
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for entry_dir in self.__cache_path.iterdir():
+            entry_file = entry_dir / ResultCache.ENTRY_FILE
+            if entry_dir.name.startswith('.') or not entry_file.is_file():
+                continue
+            size = ResultCache.__tree_size(entry_dir)
+            entries.append((entry_file.stat().st_mtime, size, entry_dir))
+            total_size += size
+
+        entries.sort()
+        for _, size, entry_dir in entries:
+            if total_size <= self.__max_size_in_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            output.console_log_WARNING(f"ResultCache: Evicted entry {entry_dir.name}")
+
+    @staticmethod
+    def __link_tree(src: Path, dst: Path):
+        """Recreates the directory tree `src` in `dst`. Files are hard-linked where possible and copied otherwise
+        (e.g. when `src` and `dst` reside on different file systems)."""
+        dst.mkdir(parents=True, exist_ok=True)
+        if not src.is_dir():
+            return
+
+        for root, dirs, files in os.walk(src):
+            dst_root = dst / Path(root).relative_to(src)
+            for d in dirs:
+                (dst_root / d).mkdir(exist_ok=True)
+            for f in files:
+                dst_file = dst_root / f
+                if dst_file.exists():
+                    continue
+                try:
+                    os.link(Path(root) / f, dst_file)
+                except OSError:
+                    shutil.copy2(Path(root) / f, dst_file)
+
+    @staticmethod
+    def __tree_size(path: Path) -> int:
+        size = 0
+        for root, _, files in os.walk(path):
+            for f in files:
+                try:
+                    size += os.lstat(os.path.join(root, f)).st_size
+                except OSError:
+                    pass
+        return size
@@ -36,8 +36,7 @@ class CSVOutputManager(BaseOutputManager):
                 writer = csv.DictWriter(myfile, fieldnames=list(run_table[0].keys()))
                 writer.writeheader()
                 for data in run_table:
-                    data['__done'] = data['__done'].name
-                    writer.writerow(data)
+                    writer.writerow({**data, '__done': data['__done'].name})
         except:
             raise ExperimentOutputFileDoesNotExistError
 
@@ -46,23 +45,29 @@ class CSVOutputManager(BaseOutputManager):
         pass
     
     def update_row_data(self, updated_row: dict):
+        self.update_multiple_row_data([updated_row])
+
+    def update_multiple_row_data(self, updated_rows: List[dict]):
+        # Rewrites the run table once, regardless of the number of updated rows
+        updated_rows = {updated_row['__run_id']: updated_row for updated_row in updated_rows}
+        fieldnames = list(next(iter(updated_rows.values())).keys())
         tempfile = NamedTemporaryFile(mode='w', delete=False)
 
         with open(self._experiment_path / 'run_table.csv', 'r') as csvfile, tempfile:
-            reader = csv.DictReader(csvfile, fieldnames=list(updated_row.keys()))
-            writer = csv.DictWriter(tempfile, fieldnames=list(updated_row.keys()))
+            reader = csv.DictReader(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(tempfile, fieldnames=fieldnames)
 
             for row in reader:
-                if row['__run_id'] == updated_row['__run_id']:
+                updated_row = updated_rows.get(row['__run_id'])
+                if updated_row is not None:
                     # When the row is updated, it is an ENUM value again.
                     # Write as human-readable: enum_value.name
-                    updated_row['__done'] = updated_row['__done'].name
-                    writer.writerow(updated_row)
+                    writer.writerow({**updated_row, '__done': updated_row['__done'].name})
                 else:
                     writer.writerow(row)
 
         shutil.move(tempfile.name, self._experiment_path / 'run_table.csv')
-        output.console_log_WARNING(f"CSVManager: Updated row {updated_row['__run_id']}")
+        output.console_log_WARNING(f"CSVManager: Updated row{'s' if len(updated_rows) > 1 else ''} {', '.join(updated_rows.keys())}")
 
         # with open(self.experiment_path + '/run_table.csv', 'w', newline='') as myfile:
         #     wr = csv.writer(myfile, quoting=csv.QUOTE_ALL)
@@ -2,4 +2,5 @@ from enum import Enum
 
 class RunProgress(Enum):
     TODO = 1
-    DONE = 2
\ No newline at end of file
+    DONE = 2
+    SKIPPED = 3
\ No newline at end of file
@@ -2,10 +2,7 @@ import sys
 import traceback
 sys.path.append('/home/gabbie/.local/lib/python3.10/site-packages')
 import dill
-import hashlib
-import ast
 from typing import List
-from importlib import util
 
 from ConfigValidator.Config.Models.Metadata import Metadata
 from ConfigValidator.CustomErrors.BaseError import BaseError
@@ -13,40 +10,11 @@ from ConfigValidator.CLIRegister.CLIRegister import CLIRegister
 from ConfigValidator.Config.Validation.ConfigValidator import ConfigValidator
 from ConfigValidator.CustomErrors.ConfigErrors import ConfigInvalidClassNameError
 from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Misc.ConfigLoading import load_config_file_as_module, calc_ast_md5sum
 
 def is_no_argument_given(args: List[str]): return (len(args) == 1)
 def is_config_file_given(args: List[str]): return (args[1][-3:] == '.py')
-def load_and_get_config_file_as_module(args: List[str]):
-    module_name = args[1].split('/')[-1].replace('.py', '')
-    spec = util.spec_from_file_location(module_name, args[1]) 
-    config_file = util.module_from_spec(spec)
-    sys.modules[module_name] = config_file
-    spec.loader.exec_module(config_file)
-    return config_file
-
-def calc_ast_md5sum(src, name):
-    tree = compile(src, name, 'exec', flags=ast.PyCF_ONLY_AST, optimize=0)
-
-    for node in ast.walk(tree):
-        # Ignores empty lines and comment only lines
-        if hasattr(node, 'lineno'):
-            setattr(node, 'lineno', 0)
-        if hasattr(node, 'col_offset'):
-            setattr(node, 'col_offset', 0)
-        if hasattr(node, 'end_lineno'):
-            setattr(node, 'end_lineno', 0)
-        if hasattr(node, 'end_col_offset'):
-            setattr(node, 'end_col_offset', 0)
-
-        # Ignore docstring
-        if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef, ast.ClassDef, ast.Module)) and ast.get_docstring(node) is not None:
-            docstring_node = node.body[0].value
-            if isinstance(docstring_node, ast.Str):
-                docstring_node.s = ''
-            elif isinstance(docstring_node, ast.Constant) and isinstance(docstring_node.value, str):
-                docstring_node.value = ''
-
-    return hashlib.md5(dill.dumps(tree)).digest()
+def load_and_get_config_file_as_module(args: List[str]): return load_config_file_as_module(args[1])
 
 
 if __name__ == "__main__":
@@ -14,7 +14,7 @@ if __name__ == '__main__':
     csv_data_manager = CSVOutputManager(RunnerConfig.results_output_path / RunnerConfig.name)
     run_table = csv_data_manager.read_run_table()
     for row in run_table:
-        if row['__run_id'] == 'run_1':
+        if (row['example_factor1'], row['example_factor2']) == (13, 'True'):
             row['__done']  = RunProgress.TODO
             row['avg_cpu'] = 0
     csv_data_manager.write_run_table(run_table)
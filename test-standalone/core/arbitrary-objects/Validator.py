@@ -19,5 +19,5 @@ if __name__ == 'main':
     for row in run_table:
         assert(row['avg_cpu'] == row['example_factor1'])
         assert(row['__done']) == RunProgress.DONE.name
-        if row['__run_id'] == 'run_1':
+        if (row['example_factor1'], row['example_factor2']) == (13, 'True'):
             assert(int(row['avg_cpu'])) == 13
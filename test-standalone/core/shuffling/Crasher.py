@@ -20,7 +20,7 @@ if __name__ == '__main__':
     shutil.move(csv_data_manager._experiment_path / 'run_table.csv', csv_data_manager._experiment_path / 'run_table.old.csv')
 
     for row in run_table:
-        if row['__run_id'] in ['run_2', 'run_5']:
+        if (row['example_factor1'], row['example_factor2']) in [('level2', 'True'), ('level3', 'False')]:
             row['__done']  = RunProgress.TODO
             row['avg_cpu'] = 0
     csv_data_manager.write_run_table(run_table)
@@ -0,0 +1,114 @@
+import unittest
+import itertools
+from collections import Counter
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.DesignModel import FractionalFactorialDesign, PlackettBurmanDesign, \
+    OrthogonalArrayDesign, LatinHypercubeDesign
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+def is_orthogonal(combinations, factors):
+    # Every pair of factors is observed in all combinations of their treatment levels equally often
+    for i, j in itertools.combinations(range(len(factors)), 2):
+        counts = Counter((combo[i], combo[j]) for combo in combinations)
+        if len(counts) != len(factors[i].treatments) * len(factors[j].treatments) or len(set(counts.values())) != 1:
+            return False
+    return True
+
+
+class TestFractionalFactorialDesign(unittest.TestCase):
+    def setUp(self):
+        self.factors = [FactorModel(f"f{i}", ['low', 'high']) for i in range(1, 6)]
+        self.design = FractionalFactorialDesign({'f5': ['f1', 'f2', 'f3', 'f4']})
+
+    def test_half_fraction(self):
+        combinations = self.design.generate_treatment_combinations(self.factors)
+        self.assertEqual(len(combinations), 16)
+        self.assertEqual(len(set(combinations)), 16)
+        self.assertTrue(is_orthogonal(combinations, self.factors))
+
+        for combo in combinations:  # f5 = f1*f2*f3*f4
+            self.assertEqual(combo[4] == 'high', combo[:4].count('low') % 2 == 0)
+
+    def test_aliasing(self):
+        self.design.generate_treatment_combinations(self.factors)
+        description = self.design.describe()
+        self.assertEqual(description['resolution'], 5)
+        self.assertEqual(description['defining_relation'], ['f1*f2*f3*f4*f5'])
+        self.assertEqual(description['aliases']['f1*f2'], ['f3*f4*f5'])
+        self.assertNotIn('f1', description['aliases'])  # aliased with a four-factor interaction only
+
+    def test_invalid_generator(self):
+        with self.assertRaises(BaseError):
+            FractionalFactorialDesign({'f5': ['f1', 'f6']}).generate_treatment_combinations(self.factors)
+
+    def test_no_generators(self):
+        with self.assertRaises(BaseError):
+            FractionalFactorialDesign({})
+        self.assertIsNone(self.design.describe()['resolution'])  # not generated yet
+
+
+class TestPlackettBurmanDesign(unittest.TestCase):
+    def test_twelve_runs(self):
+        factors = [FactorModel(f"f{i}", [0, 1]) for i in range(11)]
+        combinations = PlackettBurmanDesign().generate_treatment_combinations(factors)
+        self.assertEqual(len(combinations), 12)
+        self.assertTrue(is_orthogonal(combinations, factors))
+
+    def test_single_factor(self):
+        design = PlackettBurmanDesign()
+        run_table = RunTableModel(factors=[FactorModel("f", ['low', 'high'])],
+                                  design=design).generate_experiment_run_table()
+        self.assertEqual(sorted(variation['f'] for variation in run_table), ['high', 'low'])
+        self.assertEqual(design.describe()['runs'], 2)
+
+    def test_requires_two_levels(self):
+        with self.assertRaises(BaseError):
+            PlackettBurmanDesign().generate_treatment_combinations([FactorModel("f", [1, 2, 3])])
+
+
+class TestOrthogonalArrayDesign(unittest.TestCase):
+    def test_three_levels(self):
+        factors = [FactorModel(f"f{i}", ['a', 'b', 'c']) for i in range(4)]
+        combinations = OrthogonalArrayDesign().generate_treatment_combinations(factors)
+        self.assertEqual(len(combinations), 9)
+        self.assertTrue(is_orthogonal(combinations, factors))
+
+    def test_single_factor(self):
+        for treatments in [['a', 'b'], ['a', 'b', 'c']]:
+            design = OrthogonalArrayDesign()
+            run_table = RunTableModel(factors=[FactorModel("f", treatments)],
+                                      design=design).generate_experiment_run_table()
+            self.assertEqual(sorted(variation['f'] for variation in run_table), treatments)
+            self.assertEqual(design.describe()['array'], f"OA({len(treatments)}, 1, {len(treatments)}, 2)")
+
+    def test_too_many_factors(self):
+        with self.assertRaises(BaseError):
+            OrthogonalArrayDesign().generate_treatment_combinations([FactorModel(f"f{i}", [1, 2, 3]) for i in range(5)])
+
+
+class TestLatinHypercubeDesign(unittest.TestCase):
+    def test_strata_sampled_once(self):
+        factors = [FactorModel("threads", list(range(1, 9))), FactorModel("freq", [x * 100.0 for x in range(8)])]
+        combinations = LatinHypercubeDesign(samples=8, seed=42).generate_treatment_combinations(factors)
+        self.assertEqual(len(combinations), 8)
+        for i, factor in enumerate(factors):
+            self.assertEqual(sorted(combo[i] for combo in combinations), sorted(factor.treatments))
+
+    def test_reproducible_run_table(self):
+        def run_ids():
+            return [variation['__run_id'] for variation in RunTableModel(
+                factors=[FactorModel("x", list(range(100))), FactorModel("y", list(range(100)))],
+                design=LatinHypercubeDesign(samples=10, seed=1)
+            ).generate_experiment_run_table()]
+        self.assertEqual(run_ids(), run_ids())
+
+    def test_requires_numeric_factors(self):
+        with self.assertRaises(BaseError):
+            LatinHypercubeDesign(samples=2).generate_treatment_combinations([FactorModel("f", ['a', 'b'])])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from collections import Counter
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.OrderingModel import RoundRobinOrder, BlockedRandomOrder, OneRepetitionFirstOrder, \
+    RandomOrder
+from ConfigValidator.CustomErrors.BaseError import BaseError
+
+
+def generate_run_table(ordering):
+    return RunTableModel(
+        factors=[FactorModel("example_factor1", ['a', 'b', 'c']), FactorModel("example_factor2", [True, False])],
+        repetitions=4,
+        ordering=ordering
+    ).generate_experiment_run_table()
+
+
+def treatment(run):
+    return run['example_factor1'], run['example_factor2']
+
+
+class TestOrderingModel(unittest.TestCase):
+    def assertPrefixesBalanced(self, run_table):
+        for length in range(1, len(run_table) + 1):
+            counts = Counter(treatment(run) for run in run_table[:length])
+            self.assertLessEqual(max(counts.values()) - (min(counts.values()) if len(counts) == 6 else 0), 1)
+
+    def test_round_robin(self):
+        run_table = generate_run_table(RoundRobinOrder())
+        self.assertEqual(len(run_table), 24)
+        self.assertPrefixesBalanced(run_table)
+        self.assertEqual([treatment(run) for run in run_table[:6]], [treatment(run) for run in run_table[6:12]])
+
+    def test_blocked_random(self):
+        run_table = generate_run_table(BlockedRandomOrder(seed=3))
+        self.assertPrefixesBalanced(run_table)
+        self.assertEqual([run['__run_id'] for run in run_table],
+                         [run['__run_id'] for run in generate_run_table(BlockedRandomOrder(seed=3))])
+        self.assertNotEqual([treatment(run) for run in run_table[:6]], [treatment(run) for run in run_table[6:12]])
+
+    def test_seed_recorded(self):
+        ordering = BlockedRandomOrder()
+        self.assertEqual(ordering.describe(), {'ordering': 'BlockedRandomOrder', 'seed': ordering.seed})
+        self.assertEqual([run['__run_id'] for run in generate_run_table(ordering)],
+                         [run['__run_id'] for run in generate_run_table(BlockedRandomOrder(seed=ordering.seed))])
+
+    def test_one_repetition_first(self):
+        run_table = generate_run_table(OneRepetitionFirstOrder())
+        self.assertEqual(len(set(treatment(run) for run in run_table[:6])), 6)
+        self.assertEqual([run['__run_id'] for run in run_table[6:9]], [run_table[0]['__run_id'][:-1] + str(i) for i in (1, 2, 3)])
+
+    def test_shuffle_and_ordering(self):
+        with self.assertRaises(BaseError):
+            RunTableModel(factors=[FactorModel("example_factor1", ['a', 'b'])], shuffle=True, ordering=RandomOrder())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import itertools
 
 from ConfigValidator.Config.Models.FactorModel import FactorModel
 from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.Models.RepetitionsModel import RepetitionsModel
 from ConfigValidator.CustomErrors.BaseError import BaseError
 from ProgressManager.RunTable.Models.RunProgress import RunProgress
 
@@ -88,5 +89,53 @@ class TestRunTableModelExclusions(unittest.TestCase):
             ])
 
 
+class TestRunTableModelStableRunIds(unittest.TestCase):
+    def test_run_ids_survive_added_treatment_level(self):
+        table = RunTableModel(
+            factors=[FactorModel("example_factor1", [1, 2]), FactorModel("example_factor2", [True, False])]
+        ).generate_experiment_run_table()
+        extended_table = RunTableModel(
+            factors=[FactorModel("example_factor1", [1, 2, 3]), FactorModel("example_factor2", [True, False])]
+        ).generate_experiment_run_table()
+
+        run_ids = {(run['example_factor1'], run['example_factor2']): run['__run_id'] for run in table}
+        extended_run_ids = {(run['example_factor1'], run['example_factor2']): run['__run_id'] for run in extended_table}
+        self.assertEqual(len(set(extended_run_ids.values())), len(extended_table))
+        for treatment_levels, run_id in run_ids.items():
+            self.assertEqual(extended_run_ids[treatment_levels], run_id)
+
+    def test_indistinguishable_treatment_levels(self):
+        try:
+            RunTableModel(factors=[FactorModel("example_factor1", [1, '1'])]).generate_experiment_run_table()
+            self.assert_(False)
+        except BaseError:
+            pass
+
+
+class TestRunTableModelRepetitions(unittest.TestCase):
+    def test_repetitions(self):
+        table = RunTableModel(
+            factors=[FactorModel("example_factor1", [1, 2, 3])],
+            data_columns=['avg_cpu'],
+            repetitions=RepetitionsModel(min_repetitions=2, max_repetitions=5, stopping_data_columns=['avg_cpu'])
+        ).generate_experiment_run_table()
+
+        self.assertEqual(len(table), 3 * 5)
+        self.assertEqual(len(set([run['__run_id'] for run in table])), len(table))
+        for level in [1, 2, 3]:
+            self.assertEqual(len([run for run in table if run['example_factor1'] == level]), 5)
+
+    def test_invalid_stopping_data_columns(self):
+        try:
+            RunTableModel(
+                factors=[FactorModel("example_factor1", [1, 2, 3])],
+                data_columns=['avg_cpu'],
+                repetitions=RepetitionsModel(min_repetitions=2, max_repetitions=5, stopping_data_columns=['avg_mem'])
+            )
+            self.assert_(False)
+        except BaseError:
+            pass
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConnectionHandler import ConnectionHandler, LocalSFTP
+from ExperimentOrchestrator.Experiment.Run.ArtifactTransfer import Artifact, ArtifactTransfer
+
+DATA = bytes(range(256)) * 4000  # ~1 MB
+
+
+class TestArtifactTransfer(unittest.TestCase):
+    def setUp(self):
+        os.environ['TEST_HOST'] = ConnectionHandler.LOCAL_HOST
+        self.run_dir = Path(tempfile.mkdtemp())
+        self.remote_dir = Path(tempfile.mkdtemp())
+        self.remote_file = self.remote_dir / 'samples.csv'
+        self.remote_file.write_bytes(DATA)
+
+    def tearDown(self):
+        ConnectionHandler.close_all()
+        del os.environ['TEST_HOST']
+        shutil.rmtree(self.run_dir)
+        shutil.rmtree(self.remote_dir)
+
+    def test_fetch_in_background(self):
+        # Recorded during the run, retrieved afterwards (in another process)
+        ArtifactTransfer(self.run_dir).fetch('TEST', str(self.remote_file))
+        with self.assertRaises(BaseError):
+            ArtifactTransfer.load(self.run_dir).fetch('TEST', str(self.remote_file))
+
+        artifacts = ArtifactTransfer.load(self.run_dir)
+        artifacts.chunk_size = 100000
+        artifacts.start()
+        self.assertTrue(artifacts.wait(30))
+
+        self.assertEqual((self.run_dir / 'TEST__samples.csv').read_bytes(), DATA)
+        self.assertFalse((self.run_dir / ('TEST__samples.csv' + ArtifactTransfer.PARTIAL_SUFFIX)).exists())
+        artifact = ArtifactTransfer.load(self.run_dir).artifacts[0]
+        self.assertEqual((artifact.status, artifact.size), (Artifact.DONE, len(DATA)))
+        self.assertEqual(artifact.sha256, ArtifactTransfer.sha256(self.remote_file))
+        self.assertEqual(ArtifactTransfer.load(self.run_dir).pending, [])
+
+    def test_resume(self):
+        artifacts = ArtifactTransfer(self.run_dir, attempts=1)
+        artifacts.fetch('TEST', str(self.remote_file), 'samples.csv')
+        (self.run_dir / 'samples.csv.part').write_bytes(DATA[:1000])
+
+        read_from = []
+        local_open = LocalSFTP.open
+
+        def open_remote(sftp, path, mode='r'):
+            remote_file = local_open(sftp, path, mode)
+            seek = remote_file.seek
+            remote_file.seek = lambda offset: read_from.append(offset) or seek(offset)
+            return remote_file
+
+        with mock.patch.object(LocalSFTP, 'open', open_remote):
+            self.assertTrue(artifacts.transfer_all())
+        self.assertEqual(read_from, [1000])
+        self.assertEqual((self.run_dir / 'samples.csv').read_bytes(), DATA)
+
+    def test_resume_prefetch(self):
+        artifacts = ArtifactTransfer(self.run_dir, attempts=1)
+        artifacts.fetch('TEST', str(self.remote_file), 'samples.csv')
+        (self.run_dir / 'samples.csv.part').write_bytes(DATA[:700000])
+
+        prefetched = []
+        local_open = LocalSFTP.open
+
+        def open_remote(sftp, path, mode='r'):
+            # As paramiko's SFTPFile.prefetch, which requests the data from the current position up to the file size
+            remote_file = local_open(sftp, path, mode)
+            remote_file.prefetch = lambda file_size: prefetched.append((remote_file.tell(), file_size))
+            return remote_file
+
+        with mock.patch.object(LocalSFTP, 'open', open_remote):
+            self.assertTrue(artifacts.transfer_all())
+        self.assertEqual(prefetched, [(700000, len(DATA))])
+        self.assertEqual((self.run_dir / 'samples.csv').read_bytes(), DATA)
+
+    def test_corrupt_partial_file_retried(self):
+        artifacts = ArtifactTransfer(self.run_dir, attempts=2)
+        artifacts.fetch('TEST', str(self.remote_file), 'samples.csv')
+        (self.run_dir / 'samples.csv.part').write_bytes(b'\0' * 1000)
+
+        self.assertTrue(artifacts.transfer_all())
+        self.assertEqual((self.run_dir / 'samples.csv').read_bytes(), DATA)
+
+    def test_missing_file(self):
+        artifacts = ArtifactTransfer(self.run_dir, attempts=1)
+        artifacts.fetch('TEST', str(self.remote_dir / 'missing.csv'))
+        self.assertFalse(artifacts.transfer_all())
+
+        artifact = ArtifactTransfer.load(self.run_dir).pending[0]
+        self.assertEqual(artifact.status, Artifact.FAILED)
+        self.assertIsNotNone(artifact.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ExperimentOrchestrator.Experiment.Run.ClockSync import ClockOffset, ClockSync, LocalClock
+
+
+class TestClockSync(unittest.TestCase):
+    def setUp(self):
+        self.run_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.run_dir)
+
+    def test_estimate_offset(self):
+        clock = LocalClock(skew_in_s=0.25)
+        offset = ClockOffset.estimate(clock, probes=8)
+        clock.close()
+        self.assertAlmostEqual(offset.offset, 0.25, delta=offset.delay / 2 + 0.001)
+
+    def test_offset_and_drift_applied(self):
+        # A remote clock that is 40 ms behind, and drifts by 1000 ppm (i.e. 1 ms per second)
+        clock_sync = ClockSync({'remote': lambda: LocalClock(skew_in_s=-0.04, drift_ppm=1000)})
+        clock_sync.measure('start')
+        clock_sync.offsets['remote']['end'] = ClockOffset(**clock_sync.offsets['remote']['start'].to_dict())
+        clock_sync.offsets['remote']['end'].local_time += 10
+        clock_sync.offsets['remote']['end'].offset += 0.01
+        clock_sync.close()
+        clock_sync.save(self.run_dir)
+
+        loaded = ClockSync.load(self.run_dir)
+        self.assertAlmostEqual(loaded.drift('remote'), 0.001)
+        run_data = loaded.get_run_data()
+        self.assertAlmostEqual(run_data['clock_sync__remote__offset_ms'], -40, delta=2)
+        self.assertAlmostEqual(run_data['clock_sync__remote__drift_ppm'], 1000)
+
+        # The remote time of the start estimate maps to its local time, and 10.01 s later (remote) to 10 s later
+        start = loaded.offsets['remote']['start']
+        remote_start = start.local_time + start.wall_clock_offset + start.offset
+        local = loaded.to_local('remote', np.array([remote_start, remote_start + 10.01]))
+        self.assertTrue(np.allclose(local, [start.local_time, start.local_time + 10]))
+
+
+if __name__ == '__main__':
+    unittest.main()
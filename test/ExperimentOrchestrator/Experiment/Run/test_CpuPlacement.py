@@ -0,0 +1,61 @@
+import os
+import unittest
+import subprocess
+from unittest import mock
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Run.CpuPlacement import CpuPlacement, format_cpus
+from test.ExperimentOrchestrator.Experiment.test_ExperimentController import FakeAffinity
+
+
+class TestCpuPlacement(unittest.TestCase):
+    def test_format_cpus(self):
+        self.assertEqual(format_cpus([6, 0, 1, 2, 3, 8, 9]), '0-3,6,8-9')
+
+    def test_overlapping_cpus(self):
+        with self.assertRaises(BaseError):
+            CpuPlacement([0, 1], [1, 2])
+
+    def test_unavailable_cpus(self):
+        with self.assertRaises(BaseError):
+            CpuPlacement([max(os.sched_getaffinity(0)) + 1])
+
+    @unittest.skipIf(len(os.sched_getaffinity(0)) < 2, "requires at least two cpus")
+    def test_pin_and_verify(self):
+        measured_cpu = max(os.sched_getaffinity(0))
+        placement = CpuPlacement([measured_cpu])
+        self.assertNotIn(measured_cpu, placement.housekeeping_cpus)
+
+        original_affinity = os.sched_getaffinity(0)
+        target = subprocess.Popen(['sleep', '30'])
+        try:
+            self.assertFalse(placement.verify())  # neither the runner nor a target are pinned yet
+
+            placement.pin_housekeeping()
+            placement.pin_target(target.pid)
+            self.assertEqual(os.sched_getaffinity(target.pid), {measured_cpu})
+            self.assertTrue(placement.verify())
+            self.assertEqual(placement.get_run_data()['cpu_placement__measured_cpus'], str(measured_cpu))
+        finally:
+            target.kill()
+            target.wait()
+            os.sched_setaffinity(0, original_affinity)
+
+    def test_unpin(self):
+        affinity = FakeAffinity()
+        with mock.patch.object(os, 'sched_getaffinity', affinity.get), \
+                mock.patch.object(os, 'sched_setaffinity', affinity.set):
+            placement = CpuPlacement([3])
+            placement.pin_housekeeping()
+            target = subprocess.Popen(['sleep', '30'])
+            try:
+                affinity.other_cpus[target.pid] = set(affinity.own_cpus)  # inherited from the runner
+                placement.unpin_target(target.pid)
+                self.assertEqual(affinity.get(target.pid), {0, 1, 2, 3})
+                self.assertTrue(placement.verify())
+            finally:
+                target.kill()
+                target.wait()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Run.MeasurementTimeline import MeasurementTimeline
+
+
+def stream(times, **columns):
+    samples = np.zeros(len(times), dtype=[('time', '<f8')] + [(name, '<f4') for name in columns])
+    samples['time'] = times
+    for name, values in columns.items():
+        samples[name] = values
+    return samples
+
+
+class TestMeasurementTimeline(unittest.TestCase):
+    def setUp(self):
+        self.run_dir = Path(tempfile.mkdtemp())
+        self.timeline = MeasurementTimeline(self.run_dir)
+        self.timeline.mark_start()
+        self.timeline.mark_stop()
+        # A window of 2s, starting at 100 on the monotonic clock
+        self.timeline.start, self.timeline.stop = 100.0, 102.0
+
+    def tearDown(self):
+        shutil.rmtree(self.run_dir)
+
+    def test_align_streams(self):
+        # A 1 Hz power meter that started before the window, and a 2 Hz sampler with another clock
+        self.timeline.add_stream('meter', stream([99.0, 100.0, 101.0, 102.0, 103.0], watts=[0, 10, 20, 30, 40]))
+        self.timeline.add_stream('ps', stream([0.5, 1.0, 1.5], cpu=[50, 60, 70]), offset_in_s=100.0)
+
+        aligned = self.timeline.align(interval_in_s=0.5)
+        self.assertEqual(aligned.dtype.names, ('time', 'meter__watts', 'ps__cpu'))
+        self.assertTrue(np.allclose(aligned['time'], [0, 0.5, 1, 1.5, 2]))
+        self.assertTrue(np.allclose(aligned['meter__watts'], [10, 15, 20, 25, 30]))
+        self.assertTrue(np.allclose(aligned['ps__cpu'], [np.nan, 50, 60, 70, np.nan], equal_nan=True))
+
+        previous = self.timeline.align(interval_in_s=0.5, method='previous')
+        self.assertTrue(np.allclose(previous['meter__watts'], [10, 10, 20, 20, 30]))
+
+        aggregates = self.timeline.aggregate()
+        self.assertEqual(aggregates['meter__watts__mean'], 20)  # the samples outside the window are trimmed
+        self.assertEqual(aggregates['ps__cpu__max'], 70)
+
+    def test_saved(self):
+        self.timeline.add_stream('meter', stream([100.0, 102.0], watts=[1, 2]))
+        self.timeline.save(interval_in_s=1)
+        aligned = np.load(self.run_dir / MeasurementTimeline.ALIGNED_FILE)
+        self.assertTrue(np.allclose(aligned['meter__watts'], [1, 1.5, 2]))
+
+        # The recorded window is available when reprocessing
+        self.assertIsNotNone(MeasurementTimeline.load(self.run_dir).duration)
+        self.assertIsNone(MeasurementTimeline.load(self.run_dir / 'does-not-exist'))
+
+    def test_missing_time_field(self):
+        with self.assertRaises(BaseError):
+            self.timeline.add_stream('meter', np.zeros(2, dtype=[('t', '<f8')]))
+
+
+if __name__ == '__main__':
+    unittest.main()
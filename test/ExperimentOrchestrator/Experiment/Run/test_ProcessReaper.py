@@ -0,0 +1,37 @@
+import time
+import unittest
+import subprocess
+
+import psutil
+
+from ExperimentOrchestrator.Experiment.Run.ProcessReaper import ProcessReaper
+
+
+class TestProcessReaper(unittest.TestCase):
+    def setUp(self):
+        self.preexisting = subprocess.Popen(['sleep', '30'])
+        self.reaper = ProcessReaper()
+        self.reaper.snapshot()
+
+    def tearDown(self):
+        self.preexisting.kill()
+        self.preexisting.wait()
+
+    def test_reap_leftovers(self):
+        child = subprocess.Popen(['sleep', '30'], start_new_session=True)
+        subprocess.run(['sh', '-c', 'sleep 31 & echo $! > /dev/null'])  # orphans its child
+        time.sleep(0.2)
+
+        leftovers = self.reaper.find_leftovers()
+        self.assertIn(child.pid, [process.pid for process in leftovers])
+        if ProcessReaper.become_child_subreaper():
+            self.assertIn(['sleep', '31'], [process.cmdline() for process in leftovers])
+
+        self.reaper.reap()
+        self.assertIsNotNone(child.poll())
+        self.assertEqual(self.reaper.find_leftovers(), [])
+        self.assertTrue(psutil.pid_exists(self.preexisting.pid) and self.preexisting.poll() is None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import json
+import time
+import shutil
+import socket
+import tempfile
+import unittest
+import threading
+import subprocess
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConnectionHandler import ConnectionHandler
+from ExperimentOrchestrator.Experiment.Run.Readiness import (CommandProbe, FileProbe, HttpProbe, OutputProbe,
+                                                             ProcessProbe, Probe, Readiness, ReadinessTimeoutError,
+                                                             TcpProbe)
+
+
+class ReadyAfter(Probe):
+    """Ready on the n-th check, raises before."""
+
+    def __init__(self, checks: int):
+        self.checks = checks
+        self.times = []
+
+    def check(self) -> bool:
+        self.times.append(time.monotonic())
+        if len(self.times) < self.checks:
+            raise ConnectionRefusedError("not yet")
+        return True
+
+    def describe(self) -> str:
+        return "ready after"
+
+
+class HealthHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200 if self.path == '/health' else 503)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestReadiness(unittest.TestCase):
+    def setUp(self):
+        self.run_dir = Path(tempfile.mkdtemp())
+        self.readiness = Readiness(self.run_dir)
+
+    def tearDown(self):
+        ConnectionHandler.close_all()
+        shutil.rmtree(self.run_dir)
+
+    def test_backoff(self):
+        probe = ReadyAfter(4)
+        time_to_ready = self.readiness.wait('service', probe, interval_in_s=0.05, backoff=2, max_interval_in_s=0.15)
+        intervals = [later - earlier for earlier, later in zip(probe.times, probe.times[1:])]
+
+        self.assertEqual(len(intervals), 3)
+        for interval, expected in zip(intervals, [0.05, 0.1, 0.15]):
+            self.assertAlmostEqual(interval, expected, delta=0.04)
+        self.assertAlmostEqual(time_to_ready, sum(intervals), delta=0.05)
+
+        self.assertEqual(self.readiness.get_run_data(), {'readiness__service__time_to_ready_s': round(time_to_ready, 3)})
+        with open(self.run_dir / Readiness.READINESS_FILE) as f:
+            self.assertEqual(json.load(f)['service']['checks'], 4)
+
+    def test_deadline(self):
+        start = time.monotonic()
+        with self.assertRaises(ReadinessTimeoutError) as context:
+            self.readiness.wait('service', ReadyAfter(1000), interval_in_s=0.05, deadline_in_s=0.3)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertIn('ConnectionRefusedError', str(context.exception))
+        self.assertEqual(self.readiness.get_run_data(), {'readiness__service__time_to_ready_s': None})
+
+    def test_command_probes(self):
+        self.assertTrue(CommandProbe('true').check())
+        self.assertFalse(CommandProbe('false').check())
+        self.assertTrue(OutputProbe('echo 68', 68).check())
+        self.assertFalse(OutputProbe('echo 67', 68).check())
+        self.assertTrue(OutputProbe('echo 0.5', 1, comparison='<').check())
+        with self.assertRaises(BaseError):
+            OutputProbe('echo 1', 1, comparison='~')
+
+    def test_network_probes(self):
+        server = HTTPServer(('127.0.0.1', 0), HealthHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        try:
+            self.assertTrue(TcpProbe('127.0.0.1', port).check())
+            self.assertTrue(HttpProbe(f'http://127.0.0.1:{port}/health').check())
+            self.assertGreaterEqual(self.readiness.wait('web', ReadyAfter(1), HttpProbe(f'http://127.0.0.1:{port}/health')), 0)
+            with self.assertRaises(Exception):
+                HttpProbe(f'http://127.0.0.1:{port}/other').check()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        with socket.socket() as unused:
+            unused.bind(('127.0.0.1', 0))
+            with self.assertRaises(OSError):
+                TcpProbe('127.0.0.1', unused.getsockname()[1]).check()
+
+    def test_process_and_file_probes(self):
+        process = subprocess.Popen(['sleep', '5'])
+        try:
+            self.assertTrue(ProcessProbe(pid=process.pid).check())
+            self.assertFalse(ProcessProbe(pid=process.pid, min_cpu_time_in_s=10).check())
+        finally:
+            process.kill()
+            process.wait()
+        with self.assertRaises(Exception):
+            ProcessProbe(pid=process.pid).check()
+
+        path = self.run_dir / 'ready'
+        with self.assertRaises(OSError):
+            FileProbe(str(path)).check()
+        path.write_text('ok')
+        self.assertTrue(FileProbe(str(path)).check())
+        self.assertFalse(FileProbe(str(path), min_size=10).check())
+
+
+if __name__ == '__main__':
+    unittest.main()
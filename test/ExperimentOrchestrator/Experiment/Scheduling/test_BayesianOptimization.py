@@ -0,0 +1,58 @@
+import unittest
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.Scheduling.BayesianOptimization import BayesianOptimization
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+def run_experiment(scheduler, run_table_model, measure):
+    # Mimics the loop of the ExperimentController, which performs the baseline runs itself
+    run_table = run_table_model.generate_experiment_run_table()
+    scheduler.setup(run_table_model, run_table)
+    while True:
+        candidates = [variation for variation in run_table if variation['__done'] == RunProgress.TODO
+                      and not BaselineModel.is_baseline_run(variation)]
+        for variation in scheduler.dismiss(candidates):
+            variation['__done'] = RunProgress.SKIPPED
+            candidates.remove(variation)
+        variation = scheduler.next_variation(candidates) if candidates else None
+        if variation is None:
+            return run_table
+        variation['objective'] = measure(variation)
+        variation['__done'] = RunProgress.DONE
+        scheduler.observe(variation)
+
+
+class TestBayesianOptimization(unittest.TestCase):
+    def setUp(self):
+        self.run_table_model = RunTableModel(
+            factors=[FactorModel("x", list(range(15))), FactorModel("y", list(range(15))), FactorModel("c", ['a', 'b'])],
+            data_columns=['objective']
+        )
+
+    def test_finds_near_minimum_in_fraction_of_runs(self):
+        def measure(variation):
+            return (variation['x'] - 11) ** 2 + (variation['y'] - 3) ** 2 + (5 if variation['c'] == 'a' else 0)
+
+        run_table = run_experiment(BayesianOptimization('objective', max_runs=60), self.run_table_model, measure)
+        done = [variation for variation in run_table if variation['__done'] == RunProgress.DONE]
+        self.assertLessEqual(len(done), 60)  # out of 450
+        self.assertLessEqual(min(measure(variation) for variation in done), 1)
+
+    def test_maximize_with_budget(self):
+        run_table = run_experiment(BayesianOptimization('objective', minimize=False, max_runs=10, min_expected_improvement=0),
+                                   self.run_table_model, lambda variation: variation['x'])
+        done = [variation for variation in run_table if variation['__done'] == RunProgress.DONE]
+        self.assertEqual(len(done), 10)
+        self.assertGreaterEqual(max(variation['x'] for variation in done), 12)
+
+    def test_objective_must_be_data_column(self):
+        with self.assertRaises(BaseError):
+            BayesianOptimization('energy').setup(self.run_table_model, self.run_table_model.generate_experiment_run_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
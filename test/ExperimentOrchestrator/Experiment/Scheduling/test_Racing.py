@@ -0,0 +1,58 @@
+import random
+import unittest
+from collections import Counter
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ExperimentOrchestrator.Experiment.Scheduling.Racing import Racing, average_ranks, friedman_dominated
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from test.ExperimentOrchestrator.Experiment.Scheduling.test_BayesianOptimization import run_experiment
+
+
+class TestFriedmanTest(unittest.TestCase):
+    def test_average_ranks(self):
+        self.assertEqual(average_ranks([3.0, 1.0, 3.0, 2.0]), [3.5, 1.0, 3.5, 2.0])
+
+    def test_dominated(self):
+        blocks = [[1.0, 2.0, 3.0, 10.0 + i] if i % 2 else [2.0, 1.0, 3.0, 10.0 + i] for i in range(6)]
+        self.assertEqual(friedman_dominated(blocks, 0.95), [2, 3])
+
+    def test_no_difference(self):
+        rng = random.Random(0)
+        blocks = [[rng.gauss(0, 1) for _ in range(4)] for _ in range(6)]
+        self.assertEqual(friedman_dominated(blocks, 0.95), [])
+
+
+class TestRacing(unittest.TestCase):
+    def test_dominated_treatments_skipped(self):
+        rng = random.Random(1)
+        run_table_model = RunTableModel(factors=[FactorModel("alg", ['fast', 'medium', 'slow', 'slowest'])],
+                                        data_columns=['objective'], repetitions=20)
+        means = {'fast': 0, 'medium': 0.2, 'slow': 5, 'slowest': 10}
+        run_table = run_experiment(Racing('objective'), run_table_model,
+                                   lambda variation: means[variation['alg']] + rng.gauss(0, 1))
+
+        done = Counter(variation['alg'] for variation in run_table if variation['__done'] == RunProgress.DONE)
+        skipped = Counter(variation['alg'] for variation in run_table if variation['__done'] == RunProgress.SKIPPED)
+        self.assertEqual(done['slow'], 5)
+        self.assertEqual(done['slowest'], 5)
+        self.assertEqual(skipped['slowest'], 15)
+        self.assertGreaterEqual(done['fast'], done['medium'])
+
+    def test_ends_with_single_treatment_among_baseline_runs(self):
+        rng = random.Random(1)
+        run_table_model = RunTableModel(factors=[FactorModel("alg", ['fast', 'slowest'])], data_columns=['objective'],
+                                        repetitions=20, baseline=BaselineModel(['objective'], every=10))
+        means = {'fast': 0, 'slowest': 10}
+        run_table = run_experiment(Racing('objective'), run_table_model,
+                                   lambda variation: means[variation['alg']] + rng.gauss(0, 1))
+
+        # Once slowest is eliminated, fast is the only treatment level, which is not raced any further
+        done = Counter(variation['alg'] for variation in run_table if variation['__done'] == RunProgress.DONE)
+        self.assertEqual(done['fast'], done['slowest'])
+        self.assertLess(done['fast'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from collections import Counter
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ExperimentOrchestrator.Experiment.Scheduling.SuccessiveHalving import SuccessiveHalving
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+from test.ExperimentOrchestrator.Experiment.Scheduling.test_BayesianOptimization import run_experiment
+
+
+class TestSuccessiveHalving(unittest.TestCase):
+    def test_repetitions_spent_on_best_treatments(self):
+        run_table_model = RunTableModel(factors=[FactorModel("alg", [f'alg{i}' for i in range(9)])],
+                                        data_columns=['objective'], repetitions=9)
+        run_table = run_experiment(SuccessiveHalving('objective', eta=3), run_table_model,
+                                   lambda variation: int(variation['alg'][3:]))
+
+        repetitions = Counter(variation['alg'] for variation in run_table if variation['__done'] == RunProgress.DONE)
+        self.assertEqual(repetitions['alg0'], 9)
+        self.assertEqual(repetitions['alg1'], 3)
+        self.assertEqual(repetitions['alg2'], 3)
+        self.assertEqual(sum(repetitions.values()), 9 + 3 * 2 + 6)
+
+    def test_baseline_runs_not_a_treatment(self):
+        run_table_model = RunTableModel(factors=[FactorModel("alg", [f'alg{i}' for i in range(9)])],
+                                        data_columns=['objective'], repetitions=9,
+                                        baseline=BaselineModel(['objective'], every=20))
+        run_table = run_experiment(SuccessiveHalving('objective', eta=3), run_table_model,
+                                   lambda variation: int(variation['alg'][3:]))
+
+        # The best third of the 9 treatment levels remains after the first rung
+        repetitions = Counter(variation['alg'] for variation in run_table if variation['__done'] == RunProgress.DONE)
+        self.assertEqual(repetitions['alg3'], 1)
+        self.assertEqual(sum(repetitions.values()), 9 + 3 * 2 + 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import subprocess
+from unittest import mock
+from pathlib import Path
+
+import psutil
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from ConnectionHandler import ConnectionHandler
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExperimentOrchestrator.Experiment.ExperimentController import ExperimentController
+from ExperimentOrchestrator.Experiment.RollingBaseline import RollingBaseline
+from ExperimentOrchestrator.Experiment.Run.ArtifactTransfer import ArtifactTransfer
+from ProgressManager.Cache.ResultCache import ResultCache
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class SizeConfig(RunnerConfig):
+    time_between_runs_in_ms = 0
+
+    def __init__(self, experiment_path: Path, sizes: list):
+        super().__init__()
+        self.experiment_path = experiment_path
+        self.sizes = sizes
+
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel("size", self.sizes)], data_columns=['energy'])
+        return self.run_table_model
+
+
+class PlacementConfig(SizeConfig):
+    measured_cpus = [3]
+
+    def start_run(self, context):
+        self.target = subprocess.Popen(['sleep', '30'])
+        context.cpu_placement.pin_target(self.target.pid)
+
+    def stop_run(self, context):
+        self.target.kill()
+        self.target.wait()
+
+
+class BaselineConfig(SizeConfig):
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel("size", self.sizes)], data_columns=['energy'],
+                                             baseline=BaselineModel(['energy'], every=1, window=2))
+        return self.run_table_model
+
+    def populate_run_data(self, context):
+        return {'energy': 1.0 if context.is_baseline else 10.0 * context.run_variation['size']}
+
+
+class ArtifactConfig(SizeConfig):
+    def start_run(self, context):
+        context.artifacts.fetch('TEST', str(self.experiment_path.parent / 'remote' / 'samples.csv'), 'samples.csv')
+
+
+class FakeAffinity:
+    """The cpu affinity of a (simulated) 4-cpu machine. As the affinity of the current process is kept in its memory,
+    forked (run) processes inherit it, as they would the actual affinity."""
+
+    def __init__(self):
+        self.own_cpus = {0, 1, 2, 3}
+        self.other_cpus = dict()
+
+    @staticmethod
+    def is_own(pid: int) -> bool:
+        return pid == 0 or pid in {thread.id for thread in psutil.Process().threads()}
+
+    def get(self, pid: int):
+        return set(self.own_cpus) if FakeAffinity.is_own(pid) else set(self.other_cpus.get(pid, {0, 1, 2, 3}))
+
+    def set(self, pid: int, cpus):
+        if FakeAffinity.is_own(pid):
+            self.own_cpus = set(cpus)
+        else:
+            self.other_cpus[pid] = set(cpus)
+
+
+class TestExperimentController(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp()) / 'experiment'
+
+    def tearDown(self):
+        EventSubscriptionController._EventSubscriptionController__call_back_register.clear()
+        shutil.rmtree(self.experiment_path.parent)
+
+    def controller(self, sizes: list) -> ExperimentController:
+        return ExperimentController(SizeConfig(self.experiment_path, sizes), Metadata(b'md5sum'))
+
+    def test_resume_after_config_change(self):
+        run_table = self.controller([1, 2, 3]).run_table
+        done_run = next(variation for variation in run_table if variation['size'] == 1)
+        done_run.update({'energy': 42.0, '__done': RunProgress.DONE})
+        CSVOutputManager(self.experiment_path).write_run_table(run_table)
+
+        # Treatment level 2 is removed, 4 is added
+        controller = self.controller([1, 3, 4])
+        self.assertTrue(controller.restarted)
+        merged = {variation['size']: variation for variation in controller.run_table}
+        self.assertEqual(sorted(merged), [1, 3, 4])
+        self.assertEqual((merged[1]['__done'], merged[1]['energy'], merged[1]['__run_id']),
+                         (RunProgress.DONE, '42.0', done_run['__run_id']))
+        self.assertEqual((merged[3]['__done'], merged[4]['__done']), (RunProgress.TODO, RunProgress.TODO))
+        self.assertEqual(controller.run_table[-1]['size'], 4)  # the new run is appended
+
+        stored = CSVOutputManager(self.experiment_path).read_run_table()
+        self.assertEqual([row['__run_id'] for row in stored], [variation['__run_id'] for variation in controller.run_table])
+
+    def test_run_with_cpu_placement(self):
+        # The controller pins itself to the housekeeping cpus before the runs are started
+        affinity = FakeAffinity()
+        with mock.patch.object(os, 'sched_getaffinity', affinity.get), \
+                mock.patch.object(os, 'sched_setaffinity', affinity.set):
+            controller = ExperimentController(PlacementConfig(self.experiment_path, [1]), Metadata(b'md5sum'))
+            self.assertEqual(affinity.own_cpus, {0, 1, 2})
+            controller.do_experiment()
+
+        run = CSVOutputManager(self.experiment_path).read_run_table()[0]
+        self.assertEqual(run['__done'], RunProgress.DONE)
+        self.assertEqual((run['cpu_placement__housekeeping_cpus'], run['cpu_placement__measured_cpus'],
+                          run['cpu_placement__verified']), ('0-2', 3, 'True'))
+
+    def test_baseline_references_stored(self):
+        ExperimentController(BaselineConfig(self.experiment_path, [1, 2]), Metadata(b'md5sum')).do_experiment()
+
+        # baseline_0, size 1, baseline_1, size 2
+        run_table = CSVOutputManager(self.experiment_path).read_run_table()
+        self.assertTrue(all(row['__done'] == RunProgress.DONE for row in run_table))
+        self.assertEqual([float(row['energy__baseline_corrected']) for row in run_table[1::2]], [9.0, 19.0])
+        self.assertEqual([RollingBaseline.load_references(self.experiment_path / row['__run_id'])
+                          for row in run_table[1::2]],
+                         [{'energy': ['baseline_0']}, {'energy': ['baseline_0', 'baseline_1']}])
+
+    def test_run_cached_after_artifact_transfer(self):
+        remote_dir = self.experiment_path.parent / 'remote'
+        remote_dir.mkdir()
+        (remote_dir / 'samples.csv').write_bytes(b'1,2\n' * 1000)
+        config = ArtifactConfig(self.experiment_path, [1])
+        config.result_cache_path = self.experiment_path.parent / 'cache'
+
+        transfer = ArtifactTransfer.transfer
+
+        def transfer_slowly(artifacts, artifact):
+            time.sleep(0.5)
+            transfer(artifacts, artifact)
+
+        with mock.patch.dict(os.environ, {'TEST_HOST': ConnectionHandler.LOCAL_HOST}), \
+                mock.patch.object(ArtifactTransfer, 'transfer', transfer_slowly):
+            ExperimentController(config, Metadata(b'md5sum')).do_experiment()
+
+        entry_dir, = [entry_dir for entry_dir in config.result_cache_path.iterdir()]
+        cached_artifacts = entry_dir / ResultCache.ARTIFACTS_DIR
+        self.assertEqual((cached_artifacts / 'samples.csv').read_bytes(), b'1,2\n' * 1000)
+        self.assertEqual(ArtifactTransfer.load(cached_artifacts).pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
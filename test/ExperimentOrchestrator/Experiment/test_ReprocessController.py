@@ -0,0 +1,119 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.Metadata import Metadata
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.Config.RunnerConfig import RunnerConfig
+from EventManager.EventSubscriptionController import EventSubscriptionController
+from ExperimentOrchestrator.Experiment.ReprocessController import ReprocessController
+from ExperimentOrchestrator.Experiment.RollingBaseline import RollingBaseline
+from ProgressManager.Output.CSVOutputManager import CSVOutputManager
+from ProgressManager.Output.JSONOutputManager import JSONOutputManager
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class ReprocessConfig(RunnerConfig):
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel("size", [1, 2, 3, 4])], data_columns=['energy'])
+        return self.run_table_model
+
+    def populate_run_data(self, context):
+        # The raw data stored during the run, the factors are the generated (int) treatment levels again
+        energy = float((context.run_dir / 'raw.txt').read_text()) * context.run_variation['size']
+        return {'energy': energy, 'not_a_data_column': 1}
+
+
+class BaselineReprocessConfig(RunnerConfig):
+    def create_run_table_model(self) -> RunTableModel:
+        self.run_table_model = RunTableModel(factors=[FactorModel("size", [1, 2])], data_columns=['energy'],
+                                             baseline=BaselineModel(['energy'], every=1, window=1))
+        return self.run_table_model
+
+    def populate_run_data(self, context):
+        energy = float((context.run_dir / 'raw.txt').read_text())
+        return {'energy': energy if context.is_baseline else energy * context.run_variation['size']}
+
+
+class TestReprocessController(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.config = ReprocessConfig()
+        self.config.experiment_path = self.experiment_path
+
+        run_table = self.config.create_run_table_model().generate_experiment_run_table()
+        for variation in run_table:
+            run_dir = self.experiment_path / variation['__run_id']
+            run_dir.mkdir()
+            (run_dir / 'raw.txt').write_text('2.5')
+            variation['energy'] = 0
+            variation['__done'] = RunProgress.DONE
+        run_table[-1]['__done'] = RunProgress.TODO
+        CSVOutputManager(self.experiment_path).write_run_table(run_table)
+        JSONOutputManager(self.experiment_path).write_metadata(Metadata(b'performed'))
+
+    def tearDown(self):
+        EventSubscriptionController._EventSubscriptionController__call_back_register.clear()
+        shutil.rmtree(self.experiment_path)
+
+    def reprocess(self, processes: int, update_md5sum: bool = False):
+        ReprocessController(self.config, Metadata(b'changed'), processes, update_md5sum).do_reprocess()
+        return CSVOutputManager(self.experiment_path).read_run_table()
+
+    def test_recomputed_from_raw_data(self):
+        run_table = self.reprocess(processes=2)
+
+        self.assertEqual([row['energy'] for row in run_table], ['2.5', '5.0', '7.5', 0])  # the TODO run is kept
+        self.assertNotIn('not_a_data_column', run_table[0])
+        self.assertEqual(JSONOutputManager(self.experiment_path).read_metadata().md5sum, b'performed')
+
+    def test_parallel_and_serial_identical(self):
+        parallel = self.reprocess(processes=4)
+        serial = self.reprocess(processes=1)
+        self.assertEqual(parallel, serial)
+
+    def test_update_md5sum(self):
+        self.reprocess(processes=1, update_md5sum=True)
+        self.assertEqual(JSONOutputManager(self.experiment_path).read_metadata().md5sum, b'changed')
+
+
+class TestReprocessBaseline(unittest.TestCase):
+    def setUp(self):
+        self.experiment_path = Path(tempfile.mkdtemp())
+        self.config = BaselineReprocessConfig()
+        self.config.experiment_path = self.experiment_path
+
+        # baseline_0, size 1, baseline_1, size 2
+        self.run_table = self.config.create_run_table_model().generate_experiment_run_table()
+        for variation, raw in zip(self.run_table, ['1.0', '10', '3.0', '10']):
+            run_dir = self.experiment_path / variation['__run_id']
+            run_dir.mkdir()
+            (run_dir / 'raw.txt').write_text(raw)
+            variation['__done'] = RunProgress.DONE
+        CSVOutputManager(self.experiment_path).write_run_table(self.run_table)
+        JSONOutputManager(self.experiment_path).write_metadata(Metadata(b'performed'))
+
+    def tearDown(self):
+        EventSubscriptionController._EventSubscriptionController__call_back_register.clear()
+        shutil.rmtree(self.experiment_path)
+
+    def test_corrected_with_referenced_baseline_runs(self):
+        # E.g. an adaptive scheduler performed size 2 before baseline_1, i.e. against baseline_0
+        with open(self.experiment_path / self.run_table[3]['__run_id'] / RollingBaseline.REFERENCES_FILE, 'w') as f:
+            json.dump({'energy': ['baseline_0']}, f)
+
+        ReprocessController(self.config, Metadata(b'performed'), 1).do_reprocess()
+        run_table = CSVOutputManager(self.experiment_path).read_run_table()
+
+        self.assertEqual([row['energy'] for row in run_table], ['1.0', '10.0', '3.0', '20.0'])
+        self.assertEqual(float(run_table[3]['energy__baseline_corrected']), 19.0)
+        # Without stored references, the stored order is used
+        self.assertEqual(float(run_table[1]['energy__baseline_corrected']), 9.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ConfigValidator.Config.Models.BaselineModel import BaselineModel
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ExperimentOrchestrator.Experiment.RollingBaseline import RollingBaseline
+
+
+class TestBaselineRunTable(unittest.TestCase):
+    def test_interleaved_baseline_runs(self):
+        run_table_model = RunTableModel(factors=[FactorModel("alg", ['a', 'b', 'c'])], data_columns=['energy'],
+                                        repetitions=2, baseline=BaselineModel(['energy'], every=4))
+        run_table = run_table_model.generate_experiment_run_table()
+
+        self.assertEqual([BaselineModel.is_baseline_run(variation) for variation in run_table],
+                         [True] + [False] * 4 + [True] + [False] * 2)
+        self.assertEqual([variation['__run_id'] for variation in run_table if BaselineModel.is_baseline_run(variation)],
+                         ['baseline_0', 'baseline_1'])
+        self.assertEqual(run_table[0]['alg'], '')
+        self.assertEqual(run_table_model.get_data_columns(), ['energy', 'energy__baseline_corrected'])
+        self.assertEqual(list(run_table[0].keys()), list(run_table[1].keys()))
+
+    def test_unknown_data_column(self):
+        with self.assertRaises(BaseError):
+            RunTableModel(factors=[FactorModel("alg", ['a'])], data_columns=['energy'],
+                          baseline=BaselineModel(['power'])).generate_experiment_run_table()
+
+
+class TestRollingBaseline(unittest.TestCase):
+    def setUp(self):
+        self.rolling_baseline = RollingBaseline(BaselineModel(['energy', 'time'], every=2, window=2))
+
+    def test_due(self):
+        self.assertTrue(self.rolling_baseline.is_due())
+        self.rolling_baseline.count_run({'__run_id': 'baseline_0'})
+        self.assertFalse(self.rolling_baseline.is_due())
+        self.rolling_baseline.count_run({'__run_id': 'run_0'})
+        self.rolling_baseline.count_run({'__run_id': 'run_1'})
+        self.assertTrue(self.rolling_baseline.is_due())
+
+    def test_correct_with_rolling_mean(self):
+        self.assertEqual(self.rolling_baseline.correct({'energy': 10, 'time': 1}),
+                         {'energy__baseline_corrected': ' ', 'time__baseline_corrected': ' '})
+
+        for i, energy in enumerate([1.0, 2.0, 4.0]):  # the window keeps the two most recent baseline runs
+            self.rolling_baseline.observe({'__run_id': f'baseline_{i}', 'energy': energy, 'time': ' '})
+        self.assertAlmostEqual(self.rolling_baseline.estimate('energy'), 3.0)
+        self.assertEqual(self.rolling_baseline.references(), {'energy': ['baseline_1', 'baseline_2'], 'time': []})
+
+        corrected = self.rolling_baseline.correct({'energy': '10', 'time': 1})
+        self.assertAlmostEqual(corrected['energy__baseline_corrected'], 7.0)
+        self.assertEqual(corrected['time__baseline_corrected'], ' ')
+
+    def test_restore_references(self):
+        with tempfile.TemporaryDirectory() as run_dir:
+            for i, energy in enumerate([1.0, 2.0, 4.0]):
+                self.rolling_baseline.observe({'__run_id': f'baseline_{i}', 'energy': energy, 'time': 1.0})
+            self.rolling_baseline.save_references(Path(run_dir))
+            references = RollingBaseline.load_references(Path(run_dir))
+
+        # E.g. reprocessed values of the baseline runs, of which baseline_0 is not referenced
+        baseline_runs = {'baseline_0': {'energy': '100', 'time': '1'}, 'baseline_1': {'energy': '3', 'time': ' '},
+                         'baseline_2': {'energy': '5', 'time': '2'}}
+        rolling_baseline = RollingBaseline(BaselineModel(['energy', 'time'], every=2, window=2))
+        rolling_baseline.restore(references, baseline_runs)
+        self.assertAlmostEqual(rolling_baseline.estimate('energy'), 4.0)
+        self.assertAlmostEqual(rolling_baseline.estimate('time'), 2.0)  # baseline_1 is no longer populated
+
+    def test_no_references(self):
+        with tempfile.TemporaryDirectory() as run_dir:
+            self.assertIsNone(RollingBaseline.load_references(Path(run_dir)))
+
+
+if __name__ == '__main__':
+    unittest.main()
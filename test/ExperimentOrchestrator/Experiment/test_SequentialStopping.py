@@ -0,0 +1,56 @@
+import unittest
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RepetitionsModel import RepetitionsModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ExperimentOrchestrator.Experiment.SequentialStopping import SequentialStopping
+
+
+class TestSequentialStopping(unittest.TestCase):
+    def setUp(self):
+        self.run_table_model = RunTableModel(factors=[FactorModel("alg", ['a', 'b'])], data_columns=['energy'],
+                                             repetitions=RepetitionsModel(2, 5, ['energy'], max_relative_ci_width=0.1))
+        self.run_table = self.run_table_model.generate_experiment_run_table()
+        self.sequential_stopping = SequentialStopping(self.run_table_model)
+        self.variation = next(variation for variation in self.run_table if variation['alg'] == 'a')
+
+    def observe(self, *energies):
+        for energy in energies:
+            self.sequential_stopping.observe({**self.variation, 'energy': energy})
+
+    def test_continue_and_stop(self):
+        # mean 10.05, sd 0.0707: the 95% CI (t = 12.706, 1 dof) is 12.6% of the mean
+        self.observe(10.0, 10.1)
+        self.assertFalse(self.sequential_stopping.is_converged(self.variation))
+
+        # mean 10.033, sd 0.0577: the 95% CI (t = 4.303, 2 dof) is 2.9% of the mean
+        self.observe(10.0)
+        self.assertTrue(self.sequential_stopping.is_converged(self.variation))
+
+    def test_unpopulated_values_ignored(self):
+        self.observe(10.0, ' ', 10.0)
+        self.assertTrue(self.sequential_stopping.is_converged(self.variation))
+        self.assertFalse(self.sequential_stopping.is_converged(
+            next(variation for variation in self.run_table if variation['alg'] == 'b')))
+
+    def test_min_repetitions(self):
+        run_table_model = RunTableModel(factors=[FactorModel("alg", ['a'])], data_columns=['energy'],
+                                        repetitions=RepetitionsModel(3, 5, ['energy']))
+        sequential_stopping = SequentialStopping(run_table_model)
+        variation = run_table_model.generate_experiment_run_table()[0]
+        for _ in range(2):
+            sequential_stopping.observe({**variation, 'energy': 10.0})
+        self.assertFalse(sequential_stopping.is_converged(variation))  # no variance, but fewer than 3 repetitions
+        sequential_stopping.observe({**variation, 'energy': 10.0})
+        self.assertTrue(sequential_stopping.is_converged(variation))
+
+    def test_max_repetitions(self):
+        # At most max_repetitions runs are scheduled per treatment, which are skipped once it has converged
+        runs_of_a = [variation for variation in self.run_table if variation['alg'] == 'a']
+        self.assertEqual(len(runs_of_a), 5)
+        self.assertEqual(self.sequential_stopping.get_remaining_variations(self.variation, self.run_table),
+                         [variation for variation in runs_of_a if variation is not self.variation])
+
+
+if __name__ == '__main__':
+    unittest.main()
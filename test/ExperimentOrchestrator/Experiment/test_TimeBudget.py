@@ -0,0 +1,38 @@
+import unittest
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ConfigValidator.Config.Models.RunTableModel import RunTableModel
+from ExperimentOrchestrator.Experiment.TimeBudget import TimeBudget
+from ProgressManager.RunTable.Models.RunProgress import RunProgress
+
+
+class TestTimeBudget(unittest.TestCase):
+    def setUp(self):
+        self.run_table = RunTableModel(factors=[FactorModel("alg", ['a', 'b', 'c'])],
+                                       repetitions=3).generate_experiment_run_table()
+
+    def create_time_budget(self, budget_in_ms):
+        time_budget = TimeBudget(budget_in_ms, 500, ['alg'])
+        time_budget.start()
+        time_budget.record_run(1.0)
+        time_budget.record_run(1.0)
+        return time_budget
+
+    def candidates(self):
+        return [variation for variation in self.run_table if variation['__done'] == RunProgress.TODO]
+
+    def test_estimate_includes_cooldown(self):
+        self.assertAlmostEqual(self.create_time_budget(10000).estimate_run(), 1.5)
+
+    def test_complete_round_must_fit(self):
+        self.assertEqual(len(self.create_time_budget(5000).select_candidates(self.candidates(), self.run_table)), 9)
+        self.assertEqual(self.create_time_budget(4000).select_candidates(self.candidates(), self.run_table), [])
+
+    def test_round_is_completed_first(self):
+        self.run_table[0]['__done'] = RunProgress.DONE  # the first repetition of 'a'
+        selected = self.create_time_budget(2000).select_candidates(self.candidates(), self.run_table)
+        self.assertEqual(set(variation['alg'] for variation in selected), {'b', 'c'})
+
+
+if __name__ == '__main__':
+    unittest.main()
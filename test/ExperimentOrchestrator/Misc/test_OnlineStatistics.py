@@ -0,0 +1,49 @@
+import unittest
+
+import math
+import statistics
+
+from ExperimentOrchestrator.Misc.OnlineStatistics import WelfordAccumulator, t_critical_value, chi2_critical_value
+
+
+class TestTCriticalValue(unittest.TestCase):
+    def test_known_values(self):
+        # Two-sided 95% critical values of Student's t-distribution
+        for dof, expected in [(1, 12.706), (2, 4.303), (3, 3.182), (5, 2.571), (10, 2.228), (30, 2.042)]:
+            self.assertAlmostEqual(t_critical_value(0.95, dof), expected, places=2)
+
+    def test_small_dof(self):
+        # Two-sided 99% critical values, which an expansion around the normal quantile underestimates
+        for dof, expected in [(3, 5.841), (4, 4.604), (5, 4.032), (10, 3.169)]:
+            self.assertAlmostEqual(t_critical_value(0.99, dof), expected, places=3)
+        self.assertAlmostEqual(t_critical_value(0.999, 3), 12.924, places=3)
+        self.assertAlmostEqual(t_critical_value(0.95, 120), 1.980, places=3)
+
+
+class TestChi2CriticalValue(unittest.TestCase):
+    def test_known_values(self):
+        # Upper 95% critical values of the chi-squared distribution
+        for dof, expected in [(1, 3.841), (2, 5.991), (3, 7.815), (5, 11.070), (10, 18.307), (30, 43.773)]:
+            self.assertAlmostEqual(chi2_critical_value(0.95, dof), expected, delta=expected * 0.01)
+
+
+class TestWelfordAccumulator(unittest.TestCase):
+    def test_matches_two_pass_statistics(self):
+        values = [1e9 + x for x in [4.0, 7.0, 13.0, 16.0]]
+        accumulator = WelfordAccumulator()
+        for value in values:
+            accumulator.update(value)
+
+        self.assertEqual(accumulator.count, len(values))
+        self.assertAlmostEqual(accumulator.mean, statistics.mean(values))
+        self.assertAlmostEqual(accumulator.variance, statistics.variance(values))
+
+    def test_single_value(self):
+        accumulator = WelfordAccumulator()
+        accumulator.update(3.0)
+        self.assertTrue(math.isnan(accumulator.variance))
+        self.assertEqual(accumulator.ci_half_width(0.95), math.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
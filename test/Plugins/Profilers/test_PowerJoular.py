@@ -0,0 +1,102 @@
+import os
+import sys
+import stat
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.Profilers.PowerJoular import PowerJoular, CsvTail, DataColumns, window_weights
+
+# Writes a row with a CPU power of 10 W per 0.1s, each split over two writes, until interrupted, then takes 0.3s
+# to shut down
+FAKE_POWERJOULAR = f'''#!{sys.executable}
+import sys, time
+args = sys.argv[1:]
+path = args[args.index('-f') + 1]
+if '-p' in args:
+    path = f"{{path}}-{{args[args.index('-p') + 1]}}.csv"
+with open(path, 'a') as f:
+    f.write('Date,CPU Utilization,CPU Power\\n')
+    try:
+        while True:
+            time.sleep(0.1)
+            f.write('2024-01-01 12:00:00,0.5,1'); f.flush()
+            time.sleep(0.01)
+            f.write('0\\n'); f.flush()
+    except KeyboardInterrupt:
+        time.sleep(0.3)
+'''
+
+
+class TestPowerJoular(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.powerjoular_path = self.tmpdir / 'powerjoular'
+        self.powerjoular_path.write_text(FAKE_POWERJOULAR)
+        os.chmod(self.powerjoular_path, stat.S_IRWXU)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_window_weights(self):
+        # Rows with the power over the preceding second, a measurement from 10.5 until 12.25
+        weights = window_weights(np.array([10.0, 11.0, 12.0, 13.0, 14.0]), 1.0, 10.5, 12.25)
+        self.assertTrue(np.allclose(weights, [0, 0.5, 1, 0.25, 0]))
+
+    def test_tail_partial_lines(self):
+        path = self.tmpdir / 'tail.csv'
+        tail = CsvTail(path)
+        self.assertEqual(tail.read_lines(), [])  # not yet created
+        with open(path, 'w') as f:
+            f.write('a,1\nb,'); f.flush()
+            self.assertEqual(tail.read_lines(), ['a,1'])
+            f.write('2\n'); f.flush()
+            self.assertEqual(tail.read_lines(), ['b,2'])
+        tail.close()
+
+    def test_measure_process(self):
+        profiler = PowerJoular(self.tmpdir, os.getpid(), str(self.powerjoular_path),
+                               sampling_interval_in_s=0.1, poll_interval_in_s=0.02)
+        profiler.start()
+        time.sleep(0.6)
+        samples = profiler.stop()
+
+        self.assertTrue(profiler.csv_file.exists())
+        self.assertGreater(len(samples), 3)
+        self.assertTrue(np.all(samples['cpu_power'] == 10))
+        self.assertTrue(np.all(np.isnan(samples['gpu_power'])))
+
+        aggregates = PowerJoular.aggregate(PowerJoular.load(self.tmpdir / PowerJoular.SAMPLES_FILE))
+        self.assertAlmostEqual(aggregates[DataColumns.AVG_POWER.name], 10, places=3)
+        self.assertAlmostEqual(aggregates[DataColumns.AVG_CPU_UTILIZATION.name], 0.5)
+        # At most the 0.6s of the measurement is counted, not the time powerjoular took to stop, and at least the
+        # intervals of the rows written before the stop (but the last partial one)
+        self.assertLessEqual(np.sum(samples['weight']), 0.6 + 0.01)
+        self.assertGreaterEqual(np.sum(samples['weight']), 0.6 - 0.2)
+        self.assertAlmostEqual(aggregates[DataColumns.ENERGY.name], 10 * np.sum(samples['weight']), places=2)
+        self.assertNotIn(DataColumns.GPU_ENERGY.name, aggregates)
+
+    def test_rows_read_at_stop(self):
+        # The csv file is not polled during the measurement, all rows are read when it stops
+        profiler = PowerJoular(self.tmpdir, os.getpid(), str(self.powerjoular_path),
+                               sampling_interval_in_s=0.1, poll_interval_in_s=60)
+        profiler.start()
+        time.sleep(0.6)
+        samples = profiler.stop()
+
+        # The rows are read before powerjoular shuts down, such that they lie within the measurement
+        self.assertGreaterEqual(len(samples), 4)
+        self.assertTrue(np.allclose(samples['weight'], 0.1))
+
+    def test_missing_powerjoular(self):
+        with self.assertRaises(BaseError):
+            PowerJoular(self.tmpdir, powerjoular_path=str(self.tmpdir / 'does-not-exist')).start()
+
+
+if __name__ == '__main__':
+    unittest.main()
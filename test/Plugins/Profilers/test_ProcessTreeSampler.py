@@ -0,0 +1,65 @@
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.Profilers.ProcessTreeSampler import ProcessTree, ProcessTreeSampler, DataColumns, SAMPLE_DTYPE
+
+BUSY_CHILD = 'import time\nt = time.time()\nwhile time.time() - t < 0.5: pass\ntime.sleep(5)'
+
+
+class TestProcessTreeSampler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        # A process tree of a shell with two children
+        self.target = subprocess.Popen(['sh', '-c', f'sleep 5 & {sys.executable} -c "{BUSY_CHILD}"; wait'])
+        time.sleep(0.2)
+
+    def tearDown(self):
+        subprocess.run(['pkill', '-P', str(self.target.pid)])
+        self.target.kill()
+        self.target.wait()
+        shutil.rmtree(self.tmpdir)
+
+    def test_descendants_sampled(self):
+        tree = ProcessTree(self.target.pid)
+        samples = np.zeros(2, dtype=SAMPLE_DTYPE)
+        tree.sample(samples[0])
+        time.sleep(0.1)
+        tree.sample(samples[1])
+        tree.close()
+
+        self.assertEqual(list(samples['processes']), [3, 3])
+        self.assertEqual(samples[0]['cpu_percent'], 0)  # the first sample establishes the counters
+        self.assertGreater(samples[1]['cpu_percent'], 0)
+        self.assertGreater(samples[1]['rss_bytes'], 0)
+
+    def test_samples_flushed(self):
+        samples_file = self.tmpdir / ProcessTreeSampler.SAMPLES_FILE
+        sampler = ProcessTreeSampler(self.target.pid, samples_file, interval_in_s=0.02, buffer_size=4)
+        sampler.start()
+        time.sleep(0.5)
+        samples = sampler.stop()
+
+        # More samples than fit the buffer, in time order
+        self.assertGreater(len(samples), 4)
+        self.assertEqual(samples_file.stat().st_size, len(samples) * SAMPLE_DTYPE.itemsize)
+        self.assertTrue(np.all(np.diff(samples['time']) > 0))
+
+        aggregates = ProcessTreeSampler.aggregate(samples)
+        self.assertEqual(aggregates[DataColumns.MAX_PROCESSES.name], 3)
+        self.assertGreater(aggregates[DataColumns.AVG_CPU.name], 0)
+
+    def test_unknown_process(self):
+        with self.assertRaises(BaseError):
+            ProcessTreeSampler(2 ** 22 + 1, self.tmpdir / ProcessTreeSampler.SAMPLES_FILE)
+
+
+if __name__ == '__main__':
+    unittest.main()
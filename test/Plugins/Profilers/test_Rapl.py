@@ -0,0 +1,103 @@
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.Profilers.Rapl import Rapl, DataColumns
+
+MAX_ENERGY_RANGE_UJ = 1000000
+
+
+class TestRapl(unittest.TestCase):
+    def setUp(self):
+        # A fake powercap sysfs tree: two sockets, each with a dram subzone
+        self.powercap = Path(tempfile.mkdtemp())
+        (self.powercap / 'intel-rapl').mkdir()  # the control type, without an energy counter
+        for zone, name in [('intel-rapl:0', 'package-0'), ('intel-rapl:0:0', 'dram'),
+                           ('intel-rapl:1', 'package-1'), ('intel-rapl:1:0', 'dram')]:
+            (self.powercap / zone).mkdir()
+            (self.powercap / zone / 'name').write_text(f'{name}\n')
+            (self.powercap / zone / 'max_energy_range_uj').write_text(f'{MAX_ENERGY_RANGE_UJ - 1}\n')
+            self.set_energy(zone, 0)
+
+    def tearDown(self):
+        shutil.rmtree(self.powercap)
+
+    def set_energy(self, zone, energy_uj):
+        (self.powercap / zone / 'energy_uj').write_text(f'{energy_uj % MAX_ENERGY_RANGE_UJ}\n')
+
+    def test_zones(self):
+        zones = Rapl.discover_zones(self.powercap)
+        self.assertEqual([(zone.name, zone.domain) for zone in zones],
+                         [('package-0', 'package'), ('package-0/dram', 'dram'),
+                          ('package-1', 'package'), ('package-1/dram', 'dram')])
+        self.assertEqual(DataColumns.DRAM_ENERGY.name, 'rapl__dram_energy')
+
+    def test_mmio_zone_excluded(self):
+        # The MMIO interface of the same package domain, a separate control type
+        (self.powercap / 'intel-rapl-mmio').mkdir()
+        (self.powercap / 'intel-rapl-mmio:0').mkdir()
+        (self.powercap / 'intel-rapl-mmio:0' / 'name').write_text('package-0\n')
+        (self.powercap / 'intel-rapl-mmio:0' / 'max_energy_range_uj').write_text(f'{MAX_ENERGY_RANGE_UJ - 1}\n')
+        self.set_energy('intel-rapl-mmio:0', 0)
+
+        rapl = Rapl(self.powercap, sampling_interval_in_s=3600)
+        self.assertEqual([zone.name for zone in rapl.zones],
+                         ['package-0', 'package-0/dram', 'package-1', 'package-1/dram'])
+        rapl.start()
+        self.set_energy('intel-rapl:0', 200000)
+        self.set_energy('intel-rapl-mmio:0', 200000)
+        self.assertAlmostEqual(rapl.stop()['package-0'], 0.2)
+        self.assertEqual(rapl.samples().dtype.names, ('time', 'package-0', 'package-0/dram', 'package-1', 'package-1/dram'))
+
+        run_dir = Path(tempfile.mkdtemp(dir=self.powercap))
+        rapl.save(run_dir)
+        self.assertAlmostEqual(Rapl.load_energy(run_dir)['package'], 0.2)
+
+    def test_energy_with_wraparound(self):
+        self.set_energy('intel-rapl:0', 900000)
+        rapl = Rapl(self.powercap)
+        rapl.start()
+        self.set_energy('intel-rapl:0', 900000 + 300000)  # wrapped around
+        self.set_energy('intel-rapl:0:0', 50000)
+        energy = rapl.stop()
+
+        self.assertAlmostEqual(energy['package-0'], 0.3)
+        self.assertAlmostEqual(energy['package-0/dram'], 0.05)
+        self.assertEqual(energy['package-1'], 0)
+
+    def test_sampling_handles_repeated_wraparound(self):
+        rapl = Rapl(self.powercap, sampling_interval_in_s=3600)  # samples are taken explicitly
+        rapl.start()
+        for energy_uj in [800000, 1600000, 2400000]:
+            self.set_energy('intel-rapl:1', energy_uj)
+            rapl.sample()
+        self.assertAlmostEqual(rapl.stop()['package-1'], 2.4)
+
+        samples = rapl.samples()
+        self.assertEqual(len(samples), 5)
+        self.assertTrue(np.allclose(samples['package-1'], [0, 0.8, 1.6, 2.4, 2.4]))
+
+        run_dir = Path(tempfile.mkdtemp(dir=self.powercap))
+        rapl.save(run_dir)
+        self.assertAlmostEqual(Rapl.load_energy(run_dir)['package'], 2.4)
+        self.assertTrue((run_dir / Rapl.SAMPLES_FILE).exists())
+
+    def test_sampling_thread(self):
+        rapl = Rapl(self.powercap, sampling_interval_in_s=0.01)
+        rapl.start()
+        time.sleep(0.2)
+        rapl.stop()
+        self.assertGreater(len(rapl.samples()), 3)
+
+    def test_no_zones(self):
+        with self.assertRaises(BaseError):
+            Rapl(self.powercap / 'intel-rapl')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import sys
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.Profilers.SubprocessProfiler import SubprocessProfiler
+
+COLUMNS = [('seq', '<u4'), ('value', '<f4')]
+
+
+def parse(line: str):
+    if line.startswith('#'):
+        return None
+    seq, value = line.split()
+    return int(seq), float(value)
+
+
+class TestSubprocessProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.samples_file = self.tmpdir / SubprocessProfiler.samples_file('test')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_chatty_profiler(self):
+        # Far more output than fits in a pipe, which must be drained while the profiler runs
+        done_file = self.tmpdir / 'done'
+        script = (f'import time\nfor i in range(100000): print(i, i / 2)\nprint("# done", flush=True)\n'
+                  f'open("{done_file}", "w").close()\ntime.sleep(60)')
+        profiler = SubprocessProfiler([sys.executable, '-c', script], parse, COLUMNS, self.samples_file,
+                                      stderr_file=self.tmpdir / 'test.stderr', buffer_size=1000)
+        profiler.start()
+        deadline = time.monotonic() + 30
+        while not done_file.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        samples = profiler.stop()
+
+        self.assertEqual(samples.dtype, SubprocessProfiler.samples_dtype(COLUMNS))
+        self.assertEqual(len(samples), 100000)
+        self.assertTrue(np.array_equal(samples['seq'], np.arange(100000)))
+        self.assertEqual(samples['value'][-1], 49999.5)
+        self.assertTrue(np.all(np.diff(samples['time']) >= 0))
+
+    def test_signal_process_group(self):
+        # A wrapper script, whose `sleep` child would keep stdout open when only the shell is signalled
+        profiler = SubprocessProfiler('while true; do echo 1 2; echo garbage; sleep 1; done', parse, COLUMNS,
+                                      self.samples_file, stop_signal=None, stop_timeout_in_s=0.1)
+        profiler.start()
+        time.sleep(0.2)
+        start = time.monotonic()
+        samples = profiler.stop()
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(len(samples), 1)
+        self.assertEqual(profiler.skipped_lines, 1)
+
+    def test_parser_error(self):
+        units = {'mW': 0.001, 'W': 1}
+
+        def parse_power(line: str):
+            seq, value, unit = line.split()
+            return int(seq), float(value) * units[unit]  # a KeyError for an unknown unit
+
+        profiler = SubprocessProfiler('echo 1 500 mW; echo 2 3 kW; echo 3 2 W', parse_power, COLUMNS, self.samples_file,
+                                      stop_signal=None)
+        profiler.start()
+        samples = profiler.stop()
+
+        self.assertEqual(samples['seq'].tolist(), [1, 3])
+        self.assertEqual(profiler.skipped_lines, 1)
+
+    def test_deadline(self):
+        profiler = SubprocessProfiler('echo 1 2; sleep 60', parse, COLUMNS, self.samples_file, deadline_in_s=0.2)
+        profiler.start()
+        time.sleep(0.5)
+        self.assertIsNotNone(profiler.exit_code)  # stopped by the deadline, before the measurement stopped
+        self.assertEqual(len(profiler.stop()), 1)
+
+    def test_unknown_command(self):
+        with self.assertRaises(BaseError):
+            SubprocessProfiler(['does-not-exist'], parse, COLUMNS, self.samples_file).start()
+
+
+if __name__ == '__main__':
+    unittest.main()
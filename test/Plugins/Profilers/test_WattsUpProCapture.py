@@ -0,0 +1,74 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.Profilers.WattsUpProCapture import WattsUpProCapture, DataColumns, parse_sample
+
+
+class FakeMeter:
+    """A pseudo-terminal, of which the slave side acts as the serial port of a meter."""
+
+    def __init__(self):
+        self.master_fd, self.slave_fd = os.openpty()
+        self.port = os.ttyname(self.slave_fd)
+
+    def send(self, data: bytes):
+        os.write(self.master_fd, data)
+
+    def received(self) -> bytes:
+        return os.read(self.master_fd, 1024)
+
+    def close(self):
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+
+class TestWattsUpProCapture(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.meters = {'gl2': FakeMeter(), 'gl3': FakeMeter()}
+
+    def tearDown(self):
+        for meter in self.meters.values():
+            meter.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_sample(self):
+        self.assertEqual(parse_sample(b'#d,-,18,1234,2301,532,_,_;\r'), (123.4, 230.1, 0.532))
+        self.assertIsNone(parse_sample(b'#l,-,1;\r'))
+
+    def test_multiple_meters(self):
+        capture = WattsUpProCapture({name: meter.port for name, meter in self.meters.items()},
+                                    self.tmpdir / WattsUpProCapture.SAMPLES_FILE, interval=1, buffer_size=2)
+        capture.start()
+        self.assertEqual(self.meters['gl2'].received(), b'#L,W,3,E,,1;')
+
+        for watts in [100, 200, 300]:
+            self.meters['gl2'].send(b'#d,-,18,%d,2300,500,_;\r\n' % (watts * 10))
+            self.meters['gl3'].send(b'#d,-,18,500,23')  # a line split over two reads
+            time.sleep(0.05)
+            self.meters['gl3'].send(b'00,200,_;\r\n')
+            time.sleep(0.05)
+        samples = capture.stop()
+
+        self.assertEqual(len(samples), 6)  # more than fit the buffer
+        self.assertEqual(list(samples[samples['meter'] == 0]['watts']), [100, 200, 300])
+        self.assertEqual(list(samples[samples['meter'] == 1]['watts']), [50, 50, 50])
+
+        aggregates = WattsUpProCapture.aggregate(samples, self.meters)
+        self.assertEqual(aggregates[DataColumns.SAMPLES.column('gl2')], 3)
+        self.assertAlmostEqual(aggregates[DataColumns.AVG_POWER.column('gl2')], 200)
+        # About 0.1s between the samples, at 150 and 250 W
+        self.assertAlmostEqual(aggregates[DataColumns.ENERGY.column('gl2')], 40, delta=10)
+
+    def test_missing_port(self):
+        with self.assertRaises(BaseError):
+            WattsUpProCapture({'gl2': '/dev/does-not-exist'}, self.tmpdir / WattsUpProCapture.SAMPLES_FILE).start()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import subprocess
+from pathlib import Path
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from Plugins.CgroupV2 import CgroupV2, ResourceFactors, remove_run_cgroup
+
+
+class TestCgroupV2(unittest.TestCase):
+    def setUp(self):
+        # A fake cgroupfs hierarchy: the interface files are regular files
+        self.root = Path(tempfile.mkdtemp())
+        self.base_path = self.root / 'experiment-runner'
+        self.base_path.mkdir()
+        (self.root / 'cgroup.controllers').write_text('cpu io memory pids\n')
+        (self.root / 'cgroup.subtree_control').write_text('cpu memory\n')
+        (self.base_path / 'cgroup.controllers').write_text('cpu memory\n')
+        (self.base_path / 'cgroup.subtree_control').write_text('')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_factor_names(self):
+        self.assertEqual(ResourceFactors.CPU_QUOTA.name, 'cgroup__cpu_quota')
+
+    def test_limits_applied(self):
+        cgroup = CgroupV2(self.base_path).create_run_cgroup('run_1', {
+            ResourceFactors.CPU_QUOTA: 0.5,
+            ResourceFactors.MEMORY_MAX: '512M'
+        })
+        self.assertEqual(cgroup.path, self.base_path / 'run_1')
+        self.assertEqual((cgroup.path / 'cpu.max').read_text(), '50000 100000')
+        self.assertEqual((cgroup.path / 'memory.max').read_text(), '512M')
+        self.assertIn('memory', (self.base_path / 'cgroup.subtree_control').read_text())
+
+    def test_limit_files(self):
+        self.assertEqual(CgroupV2.limit_files(ResourceFactors.CPU_QUOTA, 'max'), {'cpu.max': ['max 100000']})
+        self.assertEqual(CgroupV2.limit_files(ResourceFactors.CPUSET, [0, 2]), {'cpuset.cpus': ['0,2']})
+        self.assertEqual(CgroupV2.limit_files(ResourceFactors.IO_MAX, ['8:0 rbps=1', '8:16 wbps=2']),
+                         {'io.max': ['8:0 rbps=1', '8:16 wbps=2']})
+
+    def test_unavailable_controller(self):
+        with self.assertRaises(BaseError):
+            CgroupV2(self.base_path).create_run_cgroup('run_1', {ResourceFactors.CPUSET: '0-1'})
+
+    def test_remove_kills_processes(self):
+        cgroup = CgroupV2(self.base_path).create_run_cgroup('run_1', {ResourceFactors.CPU_QUOTA: 1})
+        target = subprocess.Popen(['sleep', '30'], preexec_fn=cgroup.add_self)
+        self.assertEqual(cgroup.pids(), [target.pid])
+
+        cgroup.remove(timeout_in_s=0.1)
+        self.assertEqual(target.wait(timeout=5), -9)
+
+    def test_removed_when_stop_run_fails(self):
+        class Config:
+            @remove_run_cgroup
+            def stop_run(self, context):
+                raise RuntimeError("stop_run failed")
+
+        config = Config()
+        config.cgroup = mock.Mock()
+        with self.assertRaises(RuntimeError):
+            config.stop_run(None)
+        config.cgroup.remove.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
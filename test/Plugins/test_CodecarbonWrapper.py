@@ -1,5 +1,6 @@
 import unittest
 
+import csv
 import shutil
 import tempfile
 import re
@@ -115,5 +116,48 @@ class TestEmissionTrackerCombined(unittest.TestCase):
         print(run_data)
 
 
+class TestEmissionTrackerReuse(unittest.TestCase):
+    tmpdir: AnyStr = tempfile.mkdtemp()
+
+    @CodecarbonWrapper.emission_tracker(
+        data_columns=[CCDataCols.ENERGY_CONSUMED],
+        country_iso_code="NLD",
+        output_dir=tmpdir
+    )
+    class EmissionTrackerConfig(RunnerConfig):
+        def interact(self, context: RunnerContext):
+            re.search(r'^(a|a?)+b$', "a" * 20)  # ReDoS to consume some cpu
+
+    def setUp(self) -> None:
+        self.runner_config = self.__class__.EmissionTrackerConfig()
+        self.runner_config.create_run_table_model()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(TestEmissionTrackerReuse.tmpdir)
+
+    def test_one_tracker_per_experiment(self):
+        self.runner_config.before_experiment()
+        tracker = self.runner_config.__emission_tracker__
+
+        for run_nr in range(2):
+            run_dir = Path(tempfile.mkdtemp(dir=TestEmissionTrackerReuse.tmpdir))
+            context = RunnerContext({'__run_id': f'run_{run_nr}'}, run_nr, run_dir)
+            self.runner_config.start_measurement(context)
+            self.runner_config.interact(context)
+            self.runner_config.stop_measurement(context)
+            run_data = self.runner_config.populate_run_data(context)
+            self.assertTrue(run_data[CCDataCols.ENERGY_CONSUMED.name] > 0)
+            self.assertIs(self.runner_config.__emission_tracker__, tracker)
+            self.assertTrue((context.run_dir / CodecarbonWrapper.EMISSIONS_FILE).is_file())
+
+        # The output_dir holds the emissions of all runs
+        with open(Path(TestEmissionTrackerReuse.tmpdir) / CodecarbonWrapper.EMISSIONS_FILE) as csvfile:
+            self.assertEqual(len(list(csv.DictReader(csvfile))), 2)
+
+        # Reprocessed (by a process that did not measure the run) from the copy in the run dir
+        reprocessing_config = self.__class__.EmissionTrackerConfig()
+        reprocessing_config.create_run_table_model()
+        self.assertEqual(reprocessing_config.populate_run_data(context), run_data)
+
 if __name__ == '__main__':
     unittest.main()
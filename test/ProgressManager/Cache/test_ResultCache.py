@@ -0,0 +1,62 @@
+import unittest
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from ConfigValidator.Config.Models.FactorModel import FactorModel
+from ProgressManager.Cache.ResultCache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.factors = [FactorModel("example_factor1", [1, 2]), FactorModel("example_factor2", [True, False])]
+        self.cache = ResultCache(self.tmpdir / 'cache', 1, b'md5sum', self.factors)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def __make_run_dir(self, name, content):
+        run_dir = self.tmpdir / name
+        run_dir.mkdir()
+        with open(run_dir / 'raw_data.csv', 'w') as f:
+            f.write(content)
+        return run_dir
+
+    def test_hit_and_miss(self):
+        variation = {'__run_id': 'run_0', 'example_factor1': 1, 'example_factor2': True}
+        self.assertIsNone(self.cache.get(variation, self.tmpdir / 'run_miss'))
+
+        self.cache.put(variation, {'avg_cpu': 13}, self.__make_run_dir('run_0', 'cpu\n13\n'))
+
+        reused_run_dir = self.tmpdir / 'reused' / 'run_0'
+        self.assertEqual(self.cache.get(variation, reused_run_dir), {'avg_cpu': 13})
+        self.assertTrue((reused_run_dir / 'raw_data.csv').is_file())
+
+        other_variation = {'__run_id': 'run_1', 'example_factor1': 2, 'example_factor2': True}
+        self.assertIsNone(self.cache.get(other_variation, self.tmpdir / 'run_1'))
+
+        other_config_cache = ResultCache(self.tmpdir / 'cache', 1, b'other_md5sum', self.factors)
+        self.assertIsNone(other_config_cache.get(variation, self.tmpdir / 'run_other'))
+
+    def test_lru_eviction(self):
+        old = {'__run_id': 'run_0', 'example_factor1': 1, 'example_factor2': True}
+        recent = {'__run_id': 'run_1', 'example_factor1': 2, 'example_factor2': True}
+        self.cache.put(old, {'avg_cpu': 1}, self.__make_run_dir('run_0', 'x' * 400 * 1024))
+        self.cache.put(recent, {'avg_cpu': 2}, self.__make_run_dir('run_1', 'x' * 400 * 1024))
+
+        old_entry = self.tmpdir / 'cache' / self.cache.calc_key(old) / ResultCache.ENTRY_FILE
+        os.utime(old_entry, (0, 0))
+
+        newest = {'__run_id': 'run_2', 'example_factor1': 1, 'example_factor2': False}
+        self.cache.put(newest, {'avg_cpu': 3}, self.__make_run_dir('run_2', 'x' * 400 * 1024))
+
+        self.assertIsNone(self.cache.get(old, self.tmpdir / 'reused_0'))
+        self.assertIsNotNone(self.cache.get(recent, self.tmpdir / 'reused_1'))
+        self.assertIsNotNone(self.cache.get(newest, self.tmpdir / 'reused_2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import time
+import threading
+import unittest
+import multiprocessing
+from unittest import mock
+
+from ConfigValidator.CustomErrors.BaseError import BaseError
+from ConnectionHandler import ConcurrentResults, ConnectionHandler, ConnectionLostError, ConnectionPool, LocalBackend
+
+
+class LostConnection:
+    """A connection that appears alive, but is lost once a command is run over it."""
+
+    def __init__(self):
+        self.closed = False
+
+    def is_alive(self):
+        return not self.closed
+
+    def run(self, command, timeout_in_s=None, barrier=None):
+        raise ConnectionLostError("lost")
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionHandler(unittest.TestCase):
+    def setUp(self):
+        os.environ['TEST_HOST'] = ConnectionHandler.LOCAL_HOST
+
+    def tearDown(self):
+        ConnectionHandler.close_all()
+        del os.environ['TEST_HOST']
+
+    def test_command_result(self):
+        result = ConnectionHandler('TEST').run('echo out; echo err >&2; exit 3')
+        self.assertEqual((result.stdout, result.stderr, result.exit_status), ('out\n', 'err\n', 3))
+        self.assertFalse(result.ok)
+        self.assertEqual(ConnectionHandler('TEST').execute_remote_command('true', 'succeeds'), 1)
+        self.assertEqual(ConnectionHandler('TEST').execute_remote_command('false', 'fails'), 0)
+
+    def test_timeout(self):
+        with self.assertRaises(BaseError):
+            ConnectionHandler('TEST', timeout_in_s=0.1).run('sleep 5')
+
+    def test_connection_shared(self):
+        first = ConnectionHandler.pool.get('TEST', lambda: LocalBackend('TEST'))
+        self.assertIs(ConnectionHandler.pool.get('TEST', lambda: LocalBackend('TEST')), first)
+
+        # Not in a forked (run) process
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        child = ctx.Process(target=lambda: queue.put(ConnectionHandler.pool.get('TEST', lambda: None) is None))
+        child.start()
+        child.join()
+        self.assertTrue(queue.get())
+
+    def test_reconnect(self):
+        lost = LostConnection()
+        pool = ConnectionPool()
+        pool.get('TEST', lambda: lost)
+        lost.closed = True
+        self.assertIsInstance(pool.get('TEST', lambda: LocalBackend('TEST')), LocalBackend)
+
+        # A command that could not be started is retried over a new connection
+        lost = ConnectionHandler.pool.get('TEST', LostConnection)
+        self.assertEqual(ConnectionHandler('TEST').run('echo retried').stdout, 'retried\n')
+        self.assertTrue(lost.closed)
+
+    def test_connect_per_host(self):
+        pool = ConnectionPool()
+        connecting, connected = threading.Event(), threading.Event()
+        connects = []
+
+        def connect_slowly():
+            connects.append('SLOW')
+            connecting.set()
+            connected.wait(10)
+            return LocalBackend('SLOW')
+
+        slow_users = [threading.Thread(target=pool.get, args=('SLOW', connect_slowly)) for _ in range(2)]
+        for slow_user in slow_users:
+            slow_user.start()
+        connecting.wait(10)
+
+        # Another host is not held up by the slow connection
+        start = time.monotonic()
+        pool.get('FAST', lambda: LocalBackend('FAST'))
+        self.assertLess(time.monotonic() - start, 1)
+
+        # The users of the same host wait for, and share, its connection
+        connected.set()
+        for slow_user in slow_users:
+            slow_user.join()
+        self.assertEqual(connects, ['SLOW'])
+
+    def test_run_concurrently(self):
+        start = time.monotonic()
+        results = ConnectionHandler.run_concurrently([('TEST', 'sleep 0.5; echo 1'), (ConnectionHandler.LOCAL_HOST, 'sleep 0.5; echo 2'),
+                                                      ('TEST', 'exit 1')])
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual([result.stdout for result in results], ['1\n', '2\n', ''])
+        self.assertFalse(results.ok)
+        self.assertEqual(results.failed, [results[2]])
+        self.assertLess(results.skew, 0.1)
+        self.assertGreaterEqual(results.duration, 0.5)
+
+        run_data = results.get_run_data('start')
+        self.assertEqual(list(run_data), ConcurrentResults.data_columns('start'))
+        self.assertEqual(run_data['start__skew_ms'], round(results.skew * 1e3, 3))
+
+    def test_run_concurrently_slow_connection(self):
+        connect = ConnectionHandler._ConnectionHandler__connect
+        slow_connecting = threading.Event()
+
+        def connect_slowly(handler):
+            if handler.host_name == 'SLOW':
+                slow_connecting.set()
+                time.sleep(1)
+            else:
+                slow_connecting.wait(10)  # connects while SLOW is connecting
+            return connect(handler)
+
+        start = time.monotonic()
+        with mock.patch.dict(os.environ, {'SLOW_HOST': ConnectionHandler.LOCAL_HOST}), \
+                mock.patch.object(ConnectionHandler, '_ConnectionHandler__connect', connect_slowly):
+            results = ConnectionHandler.run_concurrently([('SLOW', 'true'), ('TEST', 'true')], synchronized=False)
+
+        self.assertTrue(results.ok)
+        self.assertGreaterEqual(results[0].start_time - start, 1)
+        self.assertLess(results[1].start_time - start, 0.5)
+
+    def test_run_concurrently_unreachable_host(self):
+        # The host without credentials breaks the barrier, such that the other command is not issued
+        results = ConnectionHandler.run_concurrently([('TEST', 'echo issued'), ('UNKNOWN', 'true')], barrier_timeout_in_s=10)
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNone(results[1].exit_status)
+        self.assertIsNone(results.skew)
+        self.assertEqual(results.get_run_data('start'), {'start__skew_ms': None, 'start__duration_ms': None})
+
+    def test_clock(self):
+        clock = ConnectionHandler('TEST').open_clock()
+        self.assertGreater(clock.read(), 0)
+        clock.close()
+
+
+if __name__ == '__main__':
+    unittest.main()